@@ -1,5 +1,20 @@
 # =========================================CHUNK TO SERVER MAPPINGS FOR TEST CASES==========================================
 
+# The mappings and reappearance dependencies themselves live in compact binary files under TestCases/data
+# (see TestCases/scenarios.py). Accessing a name below, e.g. CTM.CTMmap5, loads only that scenario.
+
+from TestCases import scenarios
+
+
+def __getattr__(name):
+    if name in scenarios.SCENARIOS:
+        return scenarios.load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + scenarios.names())
+
 #=====================================Test Case 1==============================================
 
 ''' Trivial case with d = 1 duplication factor ref to research IMpossbility result case as d = 1 g =1 leads to simple system constraint in reapp dependencies
@@ -13,9 +28,9 @@ q = 10  # Queue size for each server
 
 '''
 
-CTMmap1 = {0: [1], 1: [2], 2: [6], 3: [0], 4: [3], 5: [5], 6: [1], 7: [8], 8: [2], 9: [5], 10: [7], 11: [6], 12: [2], 13: [7], 14: [6], 15: [1], 16: [4], 17: [3], 18: [0], 19: [2], 20: [3], 21: [3], 22: [1], 23: [4], 24: [3], 25: [1], 26: [4], 27: [8], 28: [0], 29: [1]}
-CTMmap2 = {0: [6], 1: [6], 2: [3], 3: [6], 4: [9], 5: [5], 6: [6], 7: [5], 8: [5], 9: [6], 10: [2], 11: [8], 12: [0], 13: [3], 14: [1], 15: [8], 16: [9], 17: [9], 18: [3], 19: [4], 20: [1], 21: [7], 22: [5], 23: [6], 24: [8], 25: [6], 26: [4], 27: [1], 28: [0], 29: [1]}
-CTMmap3 = {0: [0], 1: [3], 2: [4], 3: [7], 4: [4], 5: [8], 6: [8], 7: [8], 8: [1], 9: [0], 10: [1], 11: [6], 12: [5], 13: [3], 14: [1], 15: [4], 16: [3], 17: [5], 18: [7], 19: [3], 20: [1], 21: [1], 22: [6], 23: [1], 24: [5], 25: [2], 26: [2], 27: [2], 28: [2], 29: [3]}
+# CTMmap1 -> data/CTMmap1.bin (loaded on first access)
+# CTMmap2 -> data/CTMmap2.bin (loaded on first access)
+# CTMmap3 -> data/CTMmap3.bin (loaded on first access)
 
 #=========================================Test Case 2==========================================
 
@@ -27,14 +42,14 @@ g = 2  #
 
 Other params remain as it is    
 '''
-CTMmap4 = {0: [5, 7, 8, 3], 1: [1, 8, 5, 0], 2: [9, 6, 1, 2], 3: [7, 6, 5, 2], 4: [8, 6, 4, 3], 5: [8, 0, 4, 5], 6: [2, 3, 5, 6], 7: [9, 6, 7, 4], 8: [3, 9, 0, 7], 9: [5, 7, 0, 3], 10: [6, 5, 7, 0], 11: [6, 2, 3, 5], 12: [5, 2, 8, 3], 13: [6, 9, 8, 0], 14: [4, 8, 9, 5], 15: [8, 5, 1, 0], 16: [1, 5, 2, 9], 17: [7, 2, 6, 5], 18: [9, 2, 8, 7], 19: [8, 9, 3, 4], 20: [7, 4, 6, 1], 21: [5, 9, 4, 7], 22: [0, 4, 3, 6], 23: [6, 8, 9, 3], 24: [1, 2, 7, 6], 25: [9, 4, 5, 6], 26: [1, 9, 4, 2], 27: [9, 0, 3, 7], 28: [5, 2, 9, 6], 29: [3, 5, 0, 6], 30: [8, 9, 5, 1], 31: [9, 6, 2, 3], 32: [9, 1, 4, 7], 33: [9, 6, 1, 2], 34: [9, 3, 5, 8], 35: [8, 6, 9, 5], 36: [4, 8, 5, 7], 37: [8, 0, 6, 7], 38: [5, 7, 8, 0], 39: [3, 1, 5, 4], 40: [8, 0, 2, 1], 41: [4, 1, 3, 8], 42: [0, 3, 4, 9], 43: [9, 1, 0, 5], 44: [9, 4, 3, 6], 45: [7, 3, 8, 6], 46: [6, 3, 1, 5], 47: [2, 5, 7, 6], 48: [5, 0, 2, 9], 49: [3, 7, 0, 2], 50: [6, 8, 0, 2], 51: [6, 1, 9, 5], 52: [1, 7, 4, 2], 53: [7, 1, 2, 5], 54: [4, 0, 8, 9], 55: [1, 7, 4, 5], 56: [7, 6, 2, 9], 57: [5, 2, 9, 3], 58: [9, 7, 0, 3], 59: [8, 7, 4, 0], 60: [8, 3, 6, 5], 61: [3, 4, 8, 1], 62: [8, 4, 6, 0], 63: [1, 0, 2, 4], 64: [0, 5, 1, 3], 65: [6, 9, 8, 2], 66: [6, 1, 3, 0], 67: [9, 6, 0, 8], 68: [8, 9, 1, 0], 69: [6, 1, 9, 8], 70: [9, 6, 5, 8], 71: [8, 6, 1, 3], 72: [2, 5, 4, 0], 73: [2, 0, 7, 3], 74: [3, 0, 8, 6], 75: [6, 5, 3, 7], 76: [5, 9, 1, 4], 77: [2, 3, 9, 6], 78: [9, 5, 7, 8], 79: [0, 4, 6, 2], 80: [2, 3, 7, 8], 81: [4, 3, 0, 2], 82: [2, 5, 8, 6], 83: [9, 6, 8, 0], 84: [9, 2, 0, 3], 85: [6, 4, 5, 7], 86: [3, 8, 2, 4], 87: [8, 6, 1, 9], 88: [3, 7, 9, 6], 89: [5, 3, 8, 1], 90: [7, 5, 3, 8], 91: [6, 0, 1, 5], 92: [9, 6, 5, 3], 93: [8, 5, 3, 6], 94: [3, 6, 8, 2], 95: [2, 1, 5, 0], 96: [0, 5, 7, 2], 97: [8, 2, 4, 5], 98: [6, 1, 8, 9], 99: [0, 7, 9, 3]}
+# CTMmap4 -> data/CTMmap4.bin (loaded on first access)
 # server over view below
 #5: [0, 1, 3, 5, 6, 9, 10, 11, 12, 14, 15, 16, 17, 21, 25, 28, 29, 30, 34, 35, 36, 38, 39, 43, 46, 47, 48, 51, 53, 55, 57, 60, 64, 70, 72, 75, 76, 78, 82, 85, 89, 90, 91, 92, 93, 95, 96, 97]
 #6: [2, 3, 4, 6, 7, 10, 11, 13, 17, 20, 22, 23, 24, 25, 28, 29, 31, 33, 35, 37, 44, 45, 46, 47, 50, 51, 56, 60, 62, 65, 66, 67, 69, 70, 71, 74, 75, 77, 79, 82, 83, 85, 87, 88, 91, 92, 93, 94, 98]
 
 # taking  any m = 10 values as a reappearance dependency
 
-reap_dep_CTMmap4 = [0,1,3,5,6,2,3,4,6,7] # explicitly targetting to flood two servers
+# reap_dep_CTMmap4 -> data/reap_dep_CTMmap4.bin (loaded on first access)  # explicitly targetting to flood two servers
 # trying to replicate adversary behaviour
 
 
@@ -54,7 +69,7 @@ q = 8  # Queue size for each server log (m) = log (256)
 '''
 
 # large dataset for better comparison bw cuckoo vs 
-CTMmap5 = {0: [146, 177], 1: [205, 153], 2: [179, 146], 3: [234, 55], 4: [156, 169], 5: [96, 184], 6: [75, 137], 7: [24, 32], 8: [98, 83], 9: [238, 120], 10: [214, 250], 11: [30, 132], 12: [107, 47], 13: [48, 83], 14: [233, 4], 15: [156, 102], 16: [128, 53], 17: [40, 175], 18: [15, 249], 19: [83, 39], 20: [79, 87], 21: [137, 65], 22: [254, 71], 23: [66, 56], 24: [114, 195], 25: [178, 96], 26: [151, 208], 27: [19, 40], 28: [142, 235], 29: [164, 77], 30: [145, 75], 31: [37, 216], 32: [223, 176], 33: [243, 76], 34: [202, 60], 35: [129, 92], 36: [114, 154], 37: [34, 157], 38: [85, 145], 39: [200, 134], 40: [165, 192], 41: [126, 7], 42: [44, 165], 43: [2, 242], 44: [162, 184], 45: [10, 46], 46: [130, 46], 47: [156, 253], 48: [154, 15], 49: [46, 199], 50: [221, 102], 51: [115, 17], 52: [107, 92], 53: [239, 193], 54: [196, 136], 55: [108, 207], 56: [45, 207], 57: [199, 192], 58: [187, 9], 59: [208, 20], 60: [124, 73], 61: [103, 24], 62: [7, 16], 63: [209, 150], 64: [184, 103], 65: [227, 192], 66: [87, 237], 67: [229, 27], 68: [233, 48], 69: [143, 15], 70: [228, 26], 71: [2, 96], 72: [227, 116], 73: [113, 46], 74: [57, 143], 75: [165, 109], 76: [108, 161], 77: [38, 63], 78: [36, 17], 79: [80, 170], 80: [108, 160], 81: [178, 89], 82: [44, 22], 83: [28, 59], 84: [177, 143], 85: [149, 135], 86: [102, 215], 87: [177, 14], 88: [214, 135], 89: [106, 120], 90: [135, 194], 91: [253, 247], 92: [234, 75], 93: [108, 40], 94: [157, 19], 95: [201, 36], 96: [42, 64], 97: [117, 232], 98: [236, 39], 99: [95, 174], 100: [138, 15], 101: [87, 216], 102: [1, 190], 103: [239, 162], 104: [253, 94], 105: [17, 52], 106: [143, 106], 107: [155, 164], 108: [115, 120], 109: [75, 140], 110: [206, 234], 111: [85, 77], 112: [187, 177], 113: [89, 166], 114: [246, 58], 115: [103, 16], 116: [136, 26], 117: [236, 255], 118: [111, 196], 119: [2, 166], 120: [227, 172], 121: [198, 219], 122: [13, 103], 123: [165, 202], 124: [93, 182], 125: [59, 199], 126: [120, 234], 127: [156, 121], 128: [96, 100], 129: [143, 27], 130: [160, 63], 131: [157, 104], 132: [102, 61], 133: [177, 12], 134: [13, 224], 135: [203, 204], 136: [95, 158], 137: [106, 247], 138: [31, 141], 139: [188, 66], 140: [222, 85], 141: [160, 96], 142: [216, 120], 143: [57, 120], 144: [193, 93], 145: [154, 53], 146: [198, 201], 147: [228, 61], 148: [189, 30], 149: [46, 87], 150: [161, 107], 151: [218, 12], 152: [101, 113], 153: [30, 138], 154: [243, 92], 155: [177, 129], 156: [134, 125], 157: [203, 53], 158: [226, 190], 159: [164, 231], 160: [244, 38], 161: [136, 103], 162: [27, 102], 163: [205, 101], 164: [199, 170], 165: [110, 91], 166: [89, 188], 167: [158, 239], 168: [66, 89], 169: [237, 10], 170: [246, 178], 171: [5, 92], 172: [154, 16], 173: [5, 246], 174: [19, 20], 175: [98, 107], 176: [239, 164], 177: [119, 233], 178: [151, 20], 179: [40, 210], 180: [109, 244], 181: [247, 182], 182: [198, 75], 183: [110, 79], 184: [125, 38], 185: [55, 6], 186: [179, 146], 187: [86, 246], 188: [101, 218], 189: [172, 57], 190: [128, 181], 191: [172, 239], 192: [109, 203], 193: [121, 222], 194: [115, 97], 195: [139, 140], 196: [211, 160], 197: [246, 23], 198: [222, 177], 199: [64, 35], 200: [177, 3], 201: [188, 67], 202: [66, 228], 203: [15, 19], 204: [138, 240], 205: [99, 124], 206: [85, 151], 207: [40, 201], 208: [96, 9], 209: [245, 128], 210: [206, 23], 211: [182, 186], 212: [155, 78], 213: [13, 58], 214: [98, 87], 215: [38, 15], 216: [167, 216], 217: [132, 93], 218: [171, 27], 219: [49, 234], 220: [162, 170], 221: [218, 155], 222: [125, 196], 223: [217, 206], 224: [18, 15], 225: [233, 21], 226: [26, 132], 227: [61, 90], 228: [176, 226], 229: [38, 61], 230: [147, 143], 231: [201, 203], 232: [185, 254], 233: [8, 9], 234: [165, 32], 235: [71, 133], 236: [217, 127], 237: [243, 112], 238: [123, 22], 239: [78, 74], 240: [244, 190], 241: [38, 32], 242: [49, 218], 243: [210, 163], 244: [139, 59], 245: [70, 243], 246: [229, 27], 247: [222, 125], 248: [7, 93], 249: [19, 34], 250: [59, 158], 251: [244, 154], 252: [241, 214], 253: [205, 127], 254: [126, 52], 255: [32, 172], 256: [47, 25], 257: [205, 68], 258: [23, 203], 259: [191, 166], 260: [160, 113], 261: [89, 149], 262: [200, 47], 263: [10, 234], 264: [29, 189], 265: [62, 251], 266: [70, 180], 267: [118, 56], 268: [117, 181], 269: [88, 207], 270: [236, 96], 271: [115, 130], 272: [174, 162], 273: [119, 194], 274: [109, 67], 275: [155, 238], 276: [180, 138], 277: [14, 159], 278: [173, 254], 279: [161, 213], 280: [50, 32], 281: [219, 171], 282: [255, 26], 283: [191, 178], 284: [83, 146], 285: [165, 90], 286: [101, 211], 287: [227, 222], 288: [176, 134], 289: [13, 148], 290: [85, 102], 291: [169, 224], 292: [194, 147], 293: [92, 189], 294: [242, 132], 295: [64, 55], 296: [37, 104], 297: [134, 219], 298: [231, 5], 299: [158, 111], 300: [229, 44], 301: [214, 131], 302: [109, 8], 303: [68, 32], 304: [206, 9], 305: [170, 164], 306: [200, 23], 307: [16, 145], 308: [83, 99], 309: [165, 45], 310: [81, 3], 311: [129, 212], 312: [64, 34], 313: [124, 99], 314: [66, 125], 315: [210, 43], 316: [58, 247], 317: [102, 101], 318: [171, 250], 319: [174, 127], 320: [22, 96], 321: [105, 201], 322: [212, 169], 323: [45, 218], 324: [111, 116], 325: [141, 54], 326: [201, 204], 327: [221, 25], 328: [165, 89], 329: [86, 247], 330: [139, 20], 331: [129, 178], 332: [2, 201], 333: [39, 107], 334: [45, 133], 335: [58, 65], 336: [41, 165], 337: [127, 100], 338: [78, 97], 339: [25, 182], 340: [230, 156], 341: [222, 178], 342: [51, 96], 343: [111, 238], 344: [128, 37], 345: [143, 164], 346: [165, 191], 347: [214, 80], 348: [158, 121], 349: [227, 126], 350: [45, 187], 351: [53, 46], 352: [113, 251], 353: [130, 61], 354: [156, 23], 355: [86, 177], 356: [136, 201], 357: [43, 6], 358: [243, 235], 359: [187, 51], 360: [108, 158], 361: [165, 239], 362: [218, 71], 363: [228, 84], 364: [225, 62], 365: [81, 41], 366: [211, 71], 367: [85, 191], 368: [22, 205], 369: [110, 96], 370: [35, 124], 371: [84, 49], 372: [174, 82], 373: [151, 122], 374: [25, 63], 375: [96, 55], 376: [144, 6], 377: [65, 95], 378: [91, 210], 379: [174, 187], 380: [96, 251], 381: [108, 55], 382: [69, 152], 383: [219, 92], 384: [110, 89], 385: [255, 37], 386: [148, 149], 387: [96, 28], 388: [40, 77], 389: [52, 33], 390: [246, 4], 391: [248, 55], 392: [239, 212], 393: [254, 241], 394: [49, 120], 395: [223, 151], 396: [217, 187], 397: [0, 111], 398: [142, 164], 399: [85, 180], 400: [49, 92], 401: [42, 114], 402: [254, 123], 403: [247, 37], 404: [172, 75], 405: [154, 250], 406: [36, 141], 407: [3, 112], 408: [73, 192], 409: [58, 77], 410: [218, 77], 411: [60, 81], 412: [243, 74], 413: [96, 104], 414: [147, 99], 415: [3, 58], 416: [178, 1], 417: [239, 247], 418: [99, 170], 419: [86, 8], 420: [247, 169], 421: [126, 212], 422: [248, 203], 423: [27, 18], 424: [92, 147], 425: [207, 151], 426: [199, 156], 427: [9, 158], 428: [157, 248], 429: [135, 186], 430: [198, 156], 431: [146, 123], 432: [250, 80], 433: [106, 114], 434: [76, 235], 435: [44, 192], 436: [31, 218], 437: [81, 143], 438: [192, 59], 439: [24, 184], 440: [227, 60], 441: [100, 71], 442: [146, 119], 443: [9, 148], 444: [255, 246], 445: [64, 243], 446: [105, 193], 447: [77, 24], 448: [143, 114], 449: [229, 70], 450: [119, 180], 451: [23, 220], 452: [55, 172], 453: [231, 23], 454: [148, 91], 455: [40, 197], 456: [20, 0], 457: [137, 229], 458: [253, 104], 459: [40, 39], 460: [172, 114], 461: [231, 202], 462: [51, 225], 463: [243, 57], 464: [204, 240], 465: [251, 249], 466: [95, 94], 467: [76, 124], 468: [207, 33], 469: [13, 85], 470: [177, 193], 471: [13, 63], 472: [109, 87], 473: [101, 203], 474: [72, 126], 475: [91, 1], 476: [121, 114], 477: [251, 133], 478: [197, 191], 479: [140, 163], 480: [49, 157], 481: [143, 120], 482: [215, 34], 483: [235, 137], 484: [38, 155], 485: [128, 54], 486: [217, 1], 487: [95, 156], 488: [198, 254], 489: [131, 155], 490: [163, 252], 491: [151, 128], 492: [253, 5], 493: [184, 90], 494: [78, 72], 495: [1, 37], 496: [139, 223], 497: [196, 168], 498: [168, 112], 499: [247, 217], 500: [206, 116], 501: [222, 200], 502: [130, 208], 503: [10, 222], 504: [66, 144], 505: [8, 163], 506: [124, 48], 507: [39, 124], 508: [253, 254], 509: [75, 213], 510: [128, 182], 511: [86, 20], 512: [255, 178], 513: [105, 201], 514: [38, 242], 515: [254, 159], 516: [182, 186], 517: [38, 24], 518: [96, 94], 519: [129, 226], 520: [34, 79], 521: [204, 99], 522: [197, 171], 523: [48, 67], 524: [186, 171], 525: [114, 31], 526: [52, 5], 527: [22, 18], 528: [102, 245], 529: [250, 44], 530: [209, 111], 531: [108, 79], 532: [57, 167], 533: [255, 67], 534: [255, 66], 535: [184, 234], 536: [135, 110], 537: [35, 244], 538: [193, 19], 539: [70, 110], 540: [94, 55], 541: [148, 85], 542: [65, 231], 543: [20, 185], 544: [58, 94], 545: [142, 53], 546: [247, 66], 547: [190, 18], 548: [121, 151], 549: [96, 204], 550: [246, 129], 551: [5, 35], 552: [175, 52], 553: [9, 79], 554: [4, 31], 555: [240, 201], 556: [86, 147], 557: [78, 219], 558: [255, 218], 559: [26, 130], 560: [39, 155], 561: [6, 149], 562: [137, 59], 563: [75, 0], 564: [88, 100], 565: [143, 182], 566: [245, 71], 567: [41, 230], 568: [227, 2], 569: [239, 163], 570: [201, 52], 571: [202, 203], 572: [226, 81], 573: [71, 171], 574: [29, 137], 575: [209, 113], 576: [176, 49], 577: [75, 176], 578: [146, 21], 579: [44, 56], 580: [70, 157], 581: [156, 7], 582: [132, 197], 583: [169, 27], 584: [186, 203], 585: [94, 225], 586: [251, 46], 587: [250, 227], 588: [67, 148], 589: [138, 192], 590: [51, 155], 591: [57, 149], 592: [47, 132], 593: [88, 81], 594: [222, 57], 595: [53, 82], 596: [82, 103], 597: [175, 54], 598: [16, 127], 599: [54, 233], 600: [214, 233], 601: [230, 96], 602: [146, 100], 603: [223, 3], 604: [171, 102], 605: [103, 144], 606: [228, 87], 607: [122, 232], 608: [213, 108], 609: [68, 12], 610: [170, 25], 611: [221, 12], 612: [169, 25], 613: [112, 117], 614: [42, 2], 615: [100, 176], 616: [53, 177], 617: [130, 194], 618: [3, 37], 619: [15, 194], 620: [208, 93], 621: [87, 148], 622: [204, 248], 623: [236, 136], 624: [100, 197], 625: [155, 12], 626: [42, 181], 627: [201, 24], 628: [25, 63], 629: [144, 116], 630: [77, 247], 631: [70, 72], 632: [129, 5], 633: [231, 155], 634: [47, 201], 635: [222, 210], 636: [228, 24], 637: [179, 148], 638: [196, 233], 639: [165, 118], 640: [144, 78], 641: [234, 46], 642: [112, 31], 643: [244, 110], 644: [228, 39], 645: [252, 50], 646: [157, 29], 647: [80, 150], 648: [95, 255], 649: [17, 137], 650: [10, 193], 651: [130, 89], 652: [190, 142], 653: [226, 133], 654: [150, 57], 655: [74, 0], 656: [33, 34], 657: [114, 90], 658: [41, 151], 659: [168, 154], 660: [232, 161], 661: [41, 65], 662: [38, 15], 663: [81, 7], 664: [183, 12], 665: [38, 168], 666: [89, 242], 667: [211, 3], 668: [52, 131], 669: [23, 196], 670: [137, 72], 671: [214, 137], 672: [158, 68], 673: [131, 82], 674: [117, 231], 675: [71, 188], 676: [163, 186], 677: [237, 12], 678: [129, 233], 679: [167, 234], 680: [54, 133], 681: [39, 131], 682: [191, 18], 683: [141, 20], 684: [54, 195], 685: [185, 55], 686: [184, 109], 687: [252, 206], 688: [123, 249], 689: [217, 141], 690: [4, 235], 691: [247, 125], 692: [4, 167], 693: [145, 162], 694: [14, 44], 695: [92, 173], 696: [36, 233], 697: [200, 224], 698: [142, 120], 699: [131, 220], 700: [244, 147], 701: [180, 136], 702: [52, 9], 703: [118, 238], 704: [6, 144], 705: [149, 94], 706: [125, 0], 707: [45, 247], 708: [209, 26], 709: [174, 208], 710: [234, 255], 711: [209, 130], 712: [180, 94], 713: [63, 18], 714: [222, 48], 715: [34, 24], 716: [20, 238], 717: [163, 207], 718: [35, 19], 719: [63, 179], 720: [73, 5], 721: [246, 144], 722: [214, 16], 723: [109, 155], 724: [38, 22], 725: [66, 42], 726: [187, 11], 727: [98, 43], 728: [108, 204], 729: [48, 32], 730: [35, 46], 731: [25, 170], 732: [168, 109], 733: [111, 255], 734: [88, 196], 735: [231, 79], 736: [89, 135], 737: [115, 163], 738: [159, 231], 739: [162, 112], 740: [154, 119], 741: [6, 38], 742: [82, 234], 743: [196, 233], 744: [244, 184], 745: [224, 5], 746: [97, 160], 747: [124, 110], 748: [75, 168], 749: [38, 100], 750: [18, 218], 751: [176, 58], 752: [254, 184], 753: [188, 230], 754: [157, 128], 755: [74, 146], 756: [225, 240], 757: [126, 164], 758: [124, 91], 759: [97, 217], 760: [110, 189], 761: [96, 200], 762: [251, 214], 763: [106, 223], 764: [84, 10], 765: [104, 42], 766: [192, 151], 767: [104, 141], 768: [28, 230], 769: [72, 37], 770: [98, 13], 771: [217, 228], 772: [142, 85], 773: [198, 137], 774: [26, 8], 775: [32, 252], 776: [29, 84], 777: [159, 107], 778: [46, 32], 779: [186, 64], 780: [70, 242], 781: [145, 102], 782: [161, 107], 783: [33, 175], 784: [70, 113], 785: [154, 129], 786: [146, 237], 787: [208, 27], 788: [20, 14], 789: [141, 251], 790: [239, 24], 791: [243, 81], 792: [253, 60], 793: [86, 97], 794: [251, 219], 795: [46, 53], 796: [242, 23], 797: [92, 212], 798: [61, 213], 799: [36, 63], 800: [164, 99], 801: [243, 224], 802: [49, 222], 803: [1, 87], 804: [214, 184], 805: [245, 219], 806: [15, 144], 807: [98, 57], 808: [5, 77], 809: [30, 211], 810: [227, 182], 811: [225, 241], 812: [107, 198], 813: [90, 247], 814: [116, 121], 815: [205, 22], 816: [2, 222], 817: [233, 142], 818: [171, 85], 819: [9, 1], 820: [104, 244], 821: [159, 106], 822: [19, 128], 823: [11, 94], 824: [159, 147], 825: [31, 170], 826: [11, 21], 827: [250, 168], 828: [7, 46], 829: [232, 15], 830: [95, 253], 831: [58, 29], 832: [135, 119], 833: [82, 210], 834: [193, 238], 835: [182, 230], 836: [192, 57], 837: [143, 75], 838: [223, 205], 839: [75, 108], 840: [120, 18], 841: [67, 71], 842: [249, 129], 843: [116, 179], 844: [96, 54], 845: [169, 203], 846: [181, 47], 847: [75, 53], 848: [111, 0], 849: [29, 77], 850: [131, 245], 851: [115, 207], 852: [22, 75], 853: [186, 183], 854: [175, 187], 855: [25, 226], 856: [36, 246], 857: [225, 117], 858: [196, 69], 859: [229, 170], 860: [115, 135], 861: [158, 156], 862: [82, 47], 863: [140, 43], 864: [120, 176], 865: [224, 22], 866: [26, 254], 867: [226, 159], 868: [165, 17], 869: [81, 175], 870: [27, 57], 871: [202, 161], 872: [170, 158], 873: [4, 107], 874: [110, 34], 875: [226, 213], 876: [46, 22], 877: [81, 212], 878: [81, 155], 879: [235, 187], 880: [137, 225], 881: [194, 125], 882: [227, 134], 883: [54, 212], 884: [232, 48], 885: [78, 38], 886: [193, 205], 887: [82, 239], 888: [4, 128], 889: [14, 192], 890: [83, 55], 891: [230, 39], 892: [25, 239], 893: [145, 157], 894: [142, 247], 895: [137, 165], 896: [43, 70], 897: [237, 79], 898: [90, 233], 899: [137, 210], 900: [246, 44], 901: [65, 99], 902: [161, 194], 903: [226, 153], 904: [49, 253], 905: [155, 200], 906: [138, 179], 907: [66, 101], 908: [170, 127], 909: [182, 35], 910: [14, 160], 911: [40, 184], 912: [185, 108], 913: [98, 28], 914: [158, 79], 915: [108, 98], 916: [161, 126], 917: [59, 100], 918: [152, 133], 919: [129, 43], 920: [11, 207], 921: [51, 35], 922: [93, 68], 923: [161, 166], 924: [131, 140], 925: [224, 100], 926: [97, 181], 927: [17, 114], 928: [237, 37], 929: [101, 147], 930: [38, 92], 931: [194, 102], 932: [218, 189], 933: [254, 34], 934: [195, 215], 935: [35, 48], 936: [222, 167], 937: [192, 136], 938: [91, 52], 939: [254, 85], 940: [95, 64], 941: [76, 25], 942: [17, 246], 943: [64, 7], 944: [14, 179], 945: [141, 230], 946: [230, 90], 947: [214, 45], 948: [167, 223], 949: [222, 41], 950: [26, 42], 951: [78, 71], 952: [246, 230], 953: [57, 110], 954: [222, 113], 955: [17, 212], 956: [74, 217], 957: [26, 115], 958: [40, 116], 959: [65, 114], 960: [235, 179], 961: [208, 24], 962: [170, 150], 963: [203, 154], 964: [201, 176], 965: [205, 185], 966: [159, 47], 967: [3, 25], 968: [57, 126], 969: [90, 173], 970: [143, 190], 971: [30, 205], 972: [61, 78], 973: [35, 154], 974: [243, 136], 975: [220, 67], 976: [119, 233], 977: [142, 27], 978: [142, 134], 979: [123, 47], 980: [127, 85], 981: [165, 193], 982: [147, 187], 983: [226, 101], 984: [220, 178], 985: [58, 218], 986: [17, 179], 987: [231, 1], 988: [60, 239], 989: [136, 45], 990: [231, 84], 991: [50, 152], 992: [191, 198], 993: [255, 217], 994: [116, 251], 995: [118, 222], 996: [255, 152], 997: [225, 151], 998: [192, 65], 999: [60, 143]}
+# CTMmap5 -> data/CTMmap5.bin (loaded on first access)
 
 
 # example servers to target for adversary attack0: [397, 456, 563, 655, 706, 848]
@@ -68,7 +83,7 @@ CTMmap5 = {0: [146, 177], 1: [205, 153], 2: [179, 146], 3: [234, 55], 4: [156, 1
 
 #256 elements for above server mapping
 
-reap_dep_CTMmap5_Light = [238, 639, 486, 127, 65, 561, 252, 121, 246, 805, 296, 784, 203, 560, 258, 107, 43, 989, 615, 421, 407, 362, 540, 307, 538, 503, 843, 616, 987, 963, 420, 215, 889, 731, 516, 318, 19, 57, 417, 865, 840, 955, 386, 287, 596, 525, 226, 290, 56, 390, 105, 603, 268, 887, 984, 425, 488, 681, 276, 526, 492, 542, 200, 982, 95, 665, 41, 774, 427, 720, 926, 266, 938, 84, 224, 669, 529, 406, 416, 316, 727, 375, 888, 996, 940, 954, 684, 803, 897, 508, 495, 211, 367, 903, 381, 644, 479, 690, 975, 844, 289, 133, 661, 270, 707, 288, 169, 158, 14, 614, 15, 71, 350, 618, 913, 957, 439, 808, 533, 143, 310, 735, 568, 949, 102, 686, 927, 259, 814, 569, 187, 351, 306, 677, 53, 244, 336, 250, 113, 573, 667, 772, 786, 974, 604, 489, 816, 509, 414, 377, 261, 500, 481, 992, 485, 898, 789, 184, 394, 576, 839, 22, 643, 817, 873, 173, 907, 725, 819, 704, 493, 332, 189, 305, 967, 794, 272, 501, 5, 904, 233, 683, 469, 723, 11, 245, 564, 981, 125, 736, 83, 518, 552, 361, 842, 148, 672, 93, 648, 638, 472, 170, 242, 267, 171, 398, 155, 99, 745, 933, 415, 558, 632, 527, 871, 519, 551, 711, 96, 753, 366, 218, 112, 154, 298, 692, 151, 574, 637, 368, 675, 550, 475, 988, 935, 89, 905, 303, 754, 823, 950, 277, 883, 79, 541, 449, 916, 514, 119, 86, 758, 39, 470, 399, 554, 6]
+# reap_dep_CTMmap5_Light -> data/reap_dep_CTMmap5_Light.bin (loaded on first access)
 
 # a more but mildly severe reapp dependency by targetting more servers now with less randomization
 '''
@@ -84,7 +99,7 @@ list_9 = [74, 143, 189, 463, 532, 591, 594, 654, 807, 836, 870, 953, 968]
 list_10 = [45, 46, 49, 73, 149, 351, 586, 641, 730, 778, 795, 828, 876]
 '''
 
-reap_dep_CTMmap5_MILD = [2, 5, 13, 25, 35, 40, 45, 46, 49, 51, 57, 65, 71, 73, 74, 77, 90, 91, 95, 96, 98, 110, 128, 130, 131, 137, 140, 141, 142, 143, 146, 149, 152, 153, 160, 165, 181, 184, 186, 189, 190, 193, 196, 198, 200, 207, 208, 215, 221, 227, 228, 229, 231, 239, 241, 247, 251, 265, 270, 286, 287, 290, 292, 297, 303, 308, 316, 320, 321, 324, 326, 327, 329, 332, 335, 341, 342, 348, 351, 352, 356, 364, 367, 369, 370, 373, 375, 380, 380, 386, 387, 395, 403, 408, 412, 413, 415, 417, 420, 425, 435, 436, 438, 454, 456, 461, 463, 465, 469, 477, 483, 484, 486, 487, 489, 490, 494, 495, 497, 498, 499, 501, 503, 510, 513, 514, 515, 517, 518, 521, 522, 525, 526, 528, 532, 546, 549, 550, 554, 555, 558, 560, 563, 567, 568, 570, 576, 581, 586, 586, 587, 589, 591, 594, 594, 600, 601, 606, 622, 625, 627, 629, 630, 632, 634, 635, 640, 641, 647, 650, 654, 655, 660, 662, 665, 677, 682, 683, 686, 688, 690, 691, 694, 699, 707, 711, 712, 713, 714, 716, 718, 720, 724, 726, 727, 730, 733, 735, 741, 747, 749, 761, 762, 766, 778, 785, 789, 794, 795, 802, 807, 812, 813, 816, 827, 828, 836, 836, 838, 843, 844, 848, 866, 867, 870, 873, 876, 885, 889, 890, 894, 898, 900, 910, 917, 918, 927, 930, 933, 936, 937, 944, 948, 949, 953, 954, 957, 964, 968, 970, 983, 985, 994, 995, 998, 1000] 
+# reap_dep_CTMmap5_MILD -> data/reap_dep_CTMmap5_MILD.bin (loaded on first access)
 
 # a severe reappearance dependency almost targetting 20 servers rest 56 probably are still random
 '''
@@ -110,9 +125,9 @@ list_18 = [11, 148, 153, 809, 971]
 list_19 = [138, 436, 525, 554, 642, 825]
 list_20 = [7, 234, 241, 255, 280, 303, 729, 775, 778]
 '''
-reap_dep_CTMmap5_SEVERE = [5, 7, 7, 11, 21, 25, 40, 57, 61, 65, 67, 70, 71, 74, 77, 82, 83, 91, 95, 116, 128, 129, 130, 137, 138, 140, 141, 142, 143, 146, 148, 153, 160, 162, 181, 184, 189, 193, 195, 197, 197, 198, 200, 207, 208, 210, 210, 215, 218, 226, 229, 231, 234, 238, 241, 241, 246, 247, 255, 256, 258, 258, 264, 265, 270, 280, 282, 287, 303, 306, 306, 316, 320, 320, 321, 326, 327, 328, 329, 332, 333, 334, 339, 341, 342, 343, 352, 354, 354, 356, 368, 369, 370, 374, 375, 380, 380, 381, 382, 387, 387, 396, 397, 403, 408, 413, 415, 417, 418, 420, 423, 435, 436, 438, 439, 447, 451, 451, 453, 453, 457, 463, 465, 472, 477, 484, 485, 499, 500, 501, 503, 510, 512, 513, 514, 517, 517, 518, 525, 527, 530, 532, 538, 546, 549, 554, 555, 559, 570, 574, 577, 579, 580, 583, 586, 589, 591, 594, 594, 599, 601, 610, 612, 627, 627, 628, 630, 634, 635, 636, 642, 643, 646, 654, 662, 665, 667, 669, 669, 691, 707, 708, 714, 715, 724, 724, 729, 731, 741, 749, 761, 762, 766, 768, 770, 774, 775, 776, 778, 783, 787, 789, 790, 794, 796, 796, 799, 800, 802, 807, 809, 813, 815, 816, 825, 826, 829, 831, 836, 836, 844, 849, 852, 855, 858, 865, 866, 870, 870, 873, 876, 885, 889, 892, 894, 911, 913, 930, 936, 937, 941, 949, 950, 953, 954, 957, 961, 964, 967, 968, 971, 977, 980, 994, 995, 998]
+# reap_dep_CTMmap5_SEVERE -> data/reap_dep_CTMmap5_SEVERE.bin (loaded on first access)
 
-reap_dep_CTMmap6_Greedy_Vul = [767, 71, 774, 501, 463, 852, 789, 332, 413, 503, 549, 921, 320, 439, 883, 796, 326, 258, 368, 282, 413, 501, 995, 691, 702, 316, 518, 823, 352, 753, 697, 256, 499, 968, 601, 590, 453, 712, 130, 765, 602, 586, 819, 643, 549, 689, 342, 536, 384, 233, 535, 724, 137, 744, 728, 128, 493, 624, 208, 594, 568, 876, 141, 870, 707, 796, 540, 359, 287, 630, 760, 686, 196, 451, 628, 104, 296, 453, 417, 549, 749, 320, 794, 262, 761, 802, 387, 270, 612, 143, 183, 189, 559, 894, 485, 340, 521, 74, 140, 747, 44, 768, 80, 622, 643, 420, 835, 567, 341, 25, 116, 594, 131, 597, 746, 341, 752, 601, 5, 984, 953, 82, 441, 71, 339, 549, 247, 815, 265, 91, 946, 855, 957, 816, 844, 820, 58, 591, 614, 994, 181, 342, 477, 941, 836, 669, 443, 217, 462, 952, 874, 369, 669, 731, 813, 226, 375, 518, 967, 925, 306, 374, 427, 635, 815, 615, 564, 549, 331, 384, 465, 844, 198, 327, 654, 416, 466, 39, 816, 708, 705, 170, 610, 283, 5, 599, 165, 43, 64, 911, 238, 258, 553, 714, 549, 193, 210, 165, 304, 585, 128, 876, 325, 260, 546, 949, 451, 549, 724, 950, 403, 544, 891, 380, 119, 81, 464, 532, 684, 866, 804, 25, 380, 354, 210, 197, 954, 936, 306, 680, 135, 70, 208, 910, 458, 512, 238, 354, 539, 953, 337, 329, 527, 762, 306, 945, 761, 917, 905, 892, 197, 369, 539, 865, 141, 807]
+# reap_dep_CTMmap6_Greedy_Vul -> data/reap_dep_CTMmap6_Greedy_Vul.bin (loaded on first access)
 
 
 
@@ -0,0 +1,161 @@
+"""
+Registry of the test-case scenarios: chunk-to-server placements and reappearance workloads.
+
+Each scenario is stored in its own compact binary file under TestCases/data and is only read the first
+time it is asked for; every load returns a new dictionary or list (or read-only arrays), so callers may
+modify what they get. Names are the ones used in Chunktoservermaps (CTMmap5, reap_dep_CTMmap5_SEVERE, ...),
+and that module still exposes them as attributes.
+
+File layout (little-endian):
+    header   magic b"LBSC", version u8, kind u8 (0 placement, 1 workload), 2 reserved bytes,
+             count u32 (chunks of a placement / requests of a workload), total u32 (replicas of a placement)
+    payload  zlib-compressed int32 arrays: indptr (count + 1) then indices (total) for a placement,
+             the requested chunk IDs (count) for a workload
+"""
+import functools
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+HEADER = struct.Struct("<4sBBxxII")
+MAGIC = b"LBSC"
+VERSION = 1
+PLACEMENT, WORKLOAD = 0, 1
+
+# Parameters each scenario was designed for (see the notes in Chunktoservermaps)
+SCENARIOS = {
+    "CTMmap1": {"kind": "placement", "num_servers": 10, "num_chunks": 30, "d": 1, "g": 1, "q": 10},
+    "CTMmap2": {"kind": "placement", "num_servers": 10, "num_chunks": 30, "d": 1, "g": 1, "q": 10},
+    "CTMmap3": {"kind": "placement", "num_servers": 10, "num_chunks": 30, "d": 1, "g": 1, "q": 10},
+    "CTMmap4": {"kind": "placement", "num_servers": 10, "num_chunks": 100, "d": 4, "g": 2, "q": 10},
+    "CTMmap5": {"kind": "placement", "num_servers": 256, "num_chunks": 1000, "d": 2, "g": 4, "q": 8},
+    "reap_dep_CTMmap4": {"kind": "workload", "placement": "CTMmap4"},
+    "reap_dep_CTMmap5_Light": {"kind": "workload", "placement": "CTMmap5"},
+    "reap_dep_CTMmap5_MILD": {"kind": "workload", "placement": "CTMmap5"},
+    "reap_dep_CTMmap5_SEVERE": {"kind": "workload", "placement": "CTMmap5"},
+    "reap_dep_CTMmap6_Greedy_Vul": {"kind": "workload", "placement": "CTMmap5"},
+}
+
+
+def names(kind=None):
+    """
+    Returns the registered scenario names, optionally only those of one kind ("placement" or "workload").
+    """
+    return [name for name, meta in SCENARIOS.items() if kind is None or meta["kind"] == kind]
+
+
+def info(name):
+    """
+    Returns the metadata of a scenario.
+
+    :raises KeyError: If the scenario is not registered.
+    """
+    return SCENARIOS[name]
+
+
+def path_of(name):
+    return SCENARIOS[name].get("path", os.path.join(DATA_DIR, name + ".bin"))
+
+
+def register(name, path, kind, **metadata):
+    """
+    Adds a scenario stored at `path` (written with write_placement or write_workload) to the registry.
+    """
+    SCENARIOS[name] = dict(metadata, kind=kind, path=path)
+
+
+def _to_le_bytes(values):
+    if sys.byteorder != "little":
+        values = array("i", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(data):
+    values = array("i")
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def write_placement(path, chunk_to_servers):
+    """
+    Writes a chunk-to-server mapping (chunk IDs 0..n-1) to a scenario file.
+    """
+    n = max(chunk_to_servers) + 1 if chunk_to_servers else 0
+    indptr = array("i", [0]) * (n + 1)
+    for chunk_id in range(n):
+        indptr[chunk_id + 1] = indptr[chunk_id] + len(chunk_to_servers.get(chunk_id, ()))
+    indices = array("i")
+    for chunk_id in range(n):
+        indices.extend(chunk_to_servers.get(chunk_id, ()))
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, PLACEMENT, n, len(indices)))
+        f.write(zlib.compress(_to_le_bytes(indptr) + _to_le_bytes(indices), 9))
+
+
+def write_workload(path, chunks):
+    """
+    Writes a list of requested chunk IDs to a scenario file.
+    """
+    chunks = array("i", chunks)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, WORKLOAD, len(chunks), 0))
+        f.write(zlib.compress(_to_le_bytes(chunks), 9))
+
+
+@functools.lru_cache(maxsize=None)
+def _read(name, kind):
+    """
+    Reads a scenario file once; the arrays are cached, so callers only get read-only views or copies of them.
+    """
+    with open(path_of(name), "rb") as f:
+        magic, version, file_kind, count, total = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path_of(name)} is not a version {VERSION} scenario file")
+        if file_kind != kind:
+            raise ValueError(f"Scenario {name} is not a {'placement' if kind == PLACEMENT else 'workload'}")
+        values = _from_le_bytes(zlib.decompress(f.read()))
+    return values, count, total
+
+
+def load_placement_arrays(name):
+    """
+    Returns a placement as read-only CSR arrays (indptr, indices): replicas of chunk c are
+    indices[indptr[c]:indptr[c + 1]]. This avoids building a dictionary for large placements (see
+    Cluster.from_csr); the views share the cached arrays, copy them to modify them.
+    """
+    values, count, total = _read(name, PLACEMENT)
+    values = memoryview(values).toreadonly()
+    return values[:count + 1], values[count + 1:]
+
+
+def load_placement(name):
+    """
+    Returns a placement as a new chunk-to-server dictionary, like the CTMmap literals it replaces.
+    """
+    indptr, indices = load_placement_arrays(name)
+    return {chunk_id: indices[indptr[chunk_id]:indptr[chunk_id + 1]].tolist() for chunk_id in range(len(indptr) - 1)}
+
+
+def load_workload(name):
+    """
+    Returns a reappearance workload as a new list of chunk IDs.
+    """
+    values, count, total = _read(name, WORKLOAD)
+    return values.tolist()
+
+
+def load(name):
+    """
+    Loads a scenario by name: a dictionary for a placement, a list for a workload.
+    """
+    if SCENARIOS[name]["kind"] == "placement":
+        return load_placement(name)
+    return load_workload(name)
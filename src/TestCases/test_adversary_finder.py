@@ -0,0 +1,96 @@
+"""
+Adversary finder: every placement form converts to the same Placement, capture weights and attacks follow
+the definitions in the module notes, and the hot set search finds a planted overloaded set whose workload
+causes more rejections than uniform requests.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import adversary_finder as af
+import placement as pl
+import placement_store
+import simulation
+from TestCases import scenarios
+
+# Chunks 0-2 lie on servers 0 and 1 only; chunk 3 has one replica there
+SMALL = {0: [0, 1], 1: [1, 0], 2: [0, 1], 3: [1, 2], 4: [2, 3]}
+
+
+def planted(num_servers=64, num_chunks=2000, hot_servers=4, hot_chunks=40, seed=1):
+    """
+    A random placement (d = 2) in which `hot_chunks` chunks have both replicas among the first `hot_servers`.
+    """
+    rng = random.Random(seed)
+    mapping = {chunk: rng.sample(range(num_servers), 2) for chunk in range(num_chunks)}
+    for chunk in range(hot_chunks):
+        mapping[chunk] = rng.sample(range(hot_servers), 2)
+    return mapping
+
+
+class AdversaryFinderTest(unittest.TestCase):
+    def test_as_placement(self):
+        expected = af.as_placement(SMALL)
+        self.assertEqual(expected.num_servers, 4)
+        self.assertIs(af.as_placement(expected), expected)
+        self.assertEqual(af.as_placement(SMALL, num_servers=6).num_servers, 6)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "small.placement")
+            placement_store.save_placement(path, expected)
+            self.assertEqual(af.as_placement(path).to_mapping(), SMALL)
+
+        scenario = af.as_placement("CTMmap1")
+        self.assertEqual(scenario.to_mapping(), pl.Placement.from_mapping(scenarios.load_placement("CTMmap1"),
+                                                                          scenario.num_servers).to_mapping())
+
+    def test_capture_weights(self):
+        chunks, weights = af.capture_weights(SMALL, [0, 1], "Random")
+        self.assertEqual(chunks.tolist(), [0, 1, 2, 3])
+        self.assertEqual(weights.tolist(), [1.0, 1.0, 1.0, 0.5])
+        chunks, weights = af.capture_weights(SMALL, [1, 0], "Greedy")
+        self.assertEqual(weights.tolist(), [1.0, 1.0, 1.0, 0.0])
+        with self.assertRaises(ValueError):
+            af.capture_weights(SMALL, [0], "CuckooSimplified")
+
+    def test_attack(self):
+        self.assertEqual(af.attack(SMALL, [0, 1], "Random", batch_size=5).tolist(), [0, 1, 2, 3])
+        self.assertEqual(af.attack(SMALL, [0, 1], "Greedy", batch_size=5, multiplicity=2).tolist(), [0, 0, 1, 1, 2])
+        self.assertEqual(af.attack(SMALL, [0, 1], "Greedy", batch_size=3, multiplicity=None).tolist(), [0, 0, 0])
+        self.assertEqual(af.attack(SMALL, [3], "Greedy").tolist(), [])
+
+    def test_small_hot_set(self):
+        hot = af.find_hot_set(SMALL, "Greedy", g=1, batch_size=3)
+        self.assertEqual(hot["servers"].tolist(), [0, 1])
+        self.assertEqual(sorted(hot["requests"].tolist()), [0, 1, 2])
+        self.assertEqual((hot["forced"], hot["capacity"], hot["overload"]), (3.0, 2, 1.0))
+
+    def test_planted_hot_set(self):
+        mapping = planted()
+        hot = af.find_hot_set(mapping, "Greedy", g=2, eps=0.05)
+        # The planted servers, plus the few that add more fully captured chunks than capacity
+        self.assertTrue({0, 1, 2, 3} <= set(hot["servers"].tolist()))
+        self.assertLess(hot["servers"].size, 16)
+        self.assertGreaterEqual(hot["overload"], af.find_hot_set(mapping, "Greedy", g=2, within=range(4))["overload"])
+        self.assertEqual(hot["overload"], hot["forced"] - hot["capacity"])
+        np.testing.assert_array_equal(af.worst_case_workload(mapping, "Greedy", g=2, eps=0.05), hot["requests"])
+
+        rejected = {}
+        for name, workload in [("attack", hot["requests"].tolist()), ("uniform", None)]:
+            random.seed(2)
+            metrics = simulation.simulate("Greedy", mapping, workload, 64, 2000, g=2, q=4, total_intervals=20)
+            rejected[name] = metrics["rejected"]
+        self.assertGreater(rejected["attack"], rejected["uniform"])
+
+        # Searching elsewhere finds nothing as hot
+        elsewhere = af.find_hot_set(mapping, "Greedy", g=2, within=range(4, 64))
+        self.assertLess(elsewhere["overload"], hot["overload"])
+
+
+if __name__ == "__main__":
+    unittest.main()
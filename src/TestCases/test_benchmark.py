@@ -0,0 +1,79 @@
+"""
+Benchmark comparison: throughput is compared relative to the reference case of the same run, saved
+baselines hold no absolute throughput, and too few repeats neither save nor compare.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import benchmark
+
+QUICK = ["--filter", "CTMmap1", "--intervals", "5", "--no-memory"]
+
+
+class BenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "baseline.json")
+
+    def main(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = benchmark.main(QUICK + ["--baseline", self.path] + list(argv))
+        return status, out.getvalue()
+
+    def test_compare_uses_relative_speed(self):
+        baseline = {
+            "A": {"relative_speed": 2.0, "peak_kib": 100, "repeats": 5},
+            "B": {"relative_speed": 2.0, "peak_kib": 100, "repeats": 2},  # Too noisy to compare against
+            benchmark.REFERENCE: {"relative_speed": 1.0, "peak_kib": 100, "repeats": 5},
+        }
+        results = {
+            "A": {"requests_per_s": 100.0, "peak_kib": 100},
+            "B": {"requests_per_s": 100.0, "peak_kib": 500},
+            benchmark.REFERENCE: {"requests_per_s": 1000.0, "peak_kib": 100},
+        }
+        benchmark.add_relative_speed(results)
+        self.assertEqual(results["A"]["relative_speed"], 0.1)
+        self.assertEqual([name for name, _ in benchmark.compare(results, baseline, 0.25)], ["A"])
+
+        # The same relative speed on a machine ten times faster is no regression
+        for result in results.values():
+            result["requests_per_s"] *= 10
+        results["A"]["requests_per_s"] = 20000.0
+        benchmark.add_relative_speed(results)
+        self.assertEqual(benchmark.compare(results, baseline, 0.25), [])
+
+    def test_save_and_compare(self):
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            self.main("--repeats", "1", "--save-baseline")
+
+        status, out = self.main("--repeats", "3", "--save-baseline")
+        self.assertEqual(status, 0)
+        with open(self.path) as f:
+            baseline = json.load(f)
+        self.assertIn(benchmark.REFERENCE, baseline)  # Runs whatever the filter
+        self.assertEqual({key for entry in baseline.values() for key in entry}, {"relative_speed", "peak_kib", "repeats"})
+
+        status, out = self.main("--repeats", "3", "--tolerance", "0.9")
+        self.assertEqual(status, 0, out)
+        status, out = self.main("--repeats", "1")
+        self.assertEqual(status, 0)
+        self.assertIn("Not comparing", out)
+
+        baseline["Greedy/CTMmap1/uniform"]["relative_speed"] *= 100
+        with open(self.path, "w") as f:
+            json.dump(baseline, f)
+        status, out = self.main("--repeats", "3", "--tolerance", "0.9")
+        self.assertEqual(status, 1)
+        self.assertIn("REGRESSION Greedy/CTMmap1/uniform", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Cluster index: replica lookups match the chunk-to-server mapping, a Cluster stands in for the server list,
+and a plain list is indexed afresh on every call, so a mapping changed in place is never served stale.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import chunk_assignment as ca
+import numpy as np
+import server as se
+from cluster import Cluster, as_cluster
+
+
+class ClusterTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(4)
+        self.mapping = ca.generate_chunk_to_servers_mapping(200, 16, 3)
+        self.servers, _ = se.Init_Servers_with_chunk_mapping(200, 16, 2, 3, 8, self.mapping)
+
+    def test_replicas_match_mapping(self):
+        cluster = Cluster(self.servers, self.mapping)
+        self.assertEqual(cluster.num_chunks, 200)
+        for chunk_id, server_ids in self.mapping.items():
+            self.assertEqual(list(cluster.replicas(chunk_id)), server_ids)
+            self.assertEqual([server.server_id for server in cluster.replica_servers(chunk_id)], server_ids)
+        self.assertEqual(list(cluster.replicas(200)), [])
+        self.assertEqual(list(cluster), self.servers)
+        self.assertIs(cluster[3], self.servers[3])
+
+    def test_from_csr(self):
+        indptr = np.arange(0, 601, 3)
+        indices = np.array([server_id for chunk_id in range(200) for server_id in self.mapping[chunk_id]])
+        cluster = Cluster.from_csr(self.servers, indptr, indices)
+        for chunk_id, server_ids in self.mapping.items():
+            self.assertEqual(list(cluster.replicas(chunk_id)), server_ids)
+
+    def test_as_cluster(self):
+        cluster = Cluster(self.servers, self.mapping)
+        self.assertIs(as_cluster(cluster, self.mapping), cluster)
+
+        self.assertEqual(list(as_cluster(self.servers, self.mapping).replicas(7)), self.mapping[7])
+        self.mapping[7] = [15]  # Changed in place
+        self.assertEqual(list(as_cluster(self.servers, self.mapping).replicas(7)), [15])
+
+    def test_list_and_cluster_route_alike(self):
+        chunks = [random.randrange(200) for _ in range(300)]
+        results = []
+        for wrap in [list, lambda servers: Cluster(servers, self.mapping)]:
+            random.seed(9)
+            servers, _ = se.Init_Servers_with_chunk_mapping(200, 16, 2, 3, 8, self.mapping)
+            routed = ca.adversary_assign_chunks_avgcase(16, self.mapping, wrap(servers), chunks, "Random")
+            results.append((routed, [server.get_queue_status() for server in servers]))
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
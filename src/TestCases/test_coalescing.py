@@ -0,0 +1,74 @@
+"""
+Request coalescing: a request for a chunk already queued on a server is attached to the queued request
+without taking a slot, serving the queued request serves the attached ones with their own waits, evicted or
+stolen requests take their attached ones along, and coalescing lets a hot-chunk workload through.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import server as se
+import simulation
+
+
+class CoalescingTest(unittest.TestCase):
+    def test_attached_requests_take_no_slot(self):
+        server = se.Server(processing_rate=1, max_queue_size=2, coalesce=True)
+        self.assertTrue(server.add_request(5))
+        self.assertTrue(server.add_request(6))
+        self.assertTrue(server.add_request(5))  # Full queue, but chunk 5 is queued
+        self.assertFalse(server.add_request(7))
+        self.assertEqual((len(server.queue), server.coalesced), (2, 1))
+
+        server.process_request()  # Serves chunk 5 and the request attached to it
+        self.assertEqual(server.waits.total, 2)
+        self.assertTrue(server.add_request(5))  # Queued again, not attached to the served request
+        self.assertEqual((list(server.queue), server.coalesced), ([6, 5], 1))
+
+        plain = se.Server(processing_rate=1, max_queue_size=2)
+        plain.add_request(5)
+        plain.add_request(5)
+        self.assertEqual((len(plain.queue), plain.coalesced), (2, 0))
+
+    def test_waits_of_attached_requests(self):
+        server = se.Server(processing_rate=1, max_queue_size=4, coalesce=True)
+        server.add_request(1)
+        server.add_request(2)
+        server.process_request()  # Time step 0 serves chunk 1
+        server.add_request(2)  # Attached in time step 1
+        server.process_request()  # Serves chunk 2: waited 1 step, the attached request 0
+        self.assertEqual([server.waits.percentile(p) for p in (33, 66, 100)], [0, 0, 1])
+        self.assertEqual(server.waits.total, 3)
+
+    def test_evicted_and_stolen_requests(self):
+        server = se.Server(processing_rate=1, max_queue_size=4, coalesce=True)
+        for chunk_id in [1, 1, 2, 2, 3]:
+            server.add_request(chunk_id)
+        self.assertEqual(server.evict_chunk(), 1)
+        self.assertTrue(server.add_request(1))  # Queued afresh
+        self.assertEqual(list(server.queue), [2, 3, 1])
+
+        server.process_request()
+        taken = server.take_requests({1}, 1)
+        self.assertEqual([chunk_id for chunk_id, _ in taken], [1])
+        self.assertEqual(server.waits.total, 2)  # Chunk 2 and its attached request; chunk 1 goes to the thief
+        self.assertTrue(server.add_request(1))
+        self.assertEqual(server.coalesced, 2)
+
+    def test_simulation(self):
+        def run(coalesce):
+            random.seed(7)
+            return simulation.simulate("Greedy", None, list(range(8)) * 8, 64, 300, 2, 2, 4, total_intervals=20,
+                                       coalesce=coalesce)
+
+        plain, coalesced = run(False), run(True)
+        self.assertGreater(coalesced.summary()["coalesced"], 0)
+        self.assertLess(coalesced["rejected"], plain["rejected"])
+        self.assertEqual(coalesced["accepted"] + coalesced["rejected"], 64 * 20)
+        with self.assertRaises(ValueError):
+            simulation.simulate("Greedy", None, None, 64, 300, total_intervals=1, Engine="Vectorized", coalesce=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Bookkeeping of CuckooServer's four queues: the `_queued` counter behind get_queue_status must match the queues
+under every scheduler, with work stealing, Q'/P' overflow and request coalescing, and the requests
+_forget_overflow reports at a phase change must be exactly the ones push_segment drops.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import itertools
+import random
+import unittest
+
+import simulation
+from ring_buffer import SegmentedQueue, TimedRingBuffer
+from server import CuckooServer
+from TestCases import scenarios
+
+CHUNKS = 12  # Few chunks, so coalescing and stealing find matches
+
+
+def queue_contents(server):
+    return [chunk_id for queue in (server.Q, server.P, server.Q_prime, server.P_prime) for chunk_id in queue]
+
+
+def drive(server, rng, steps, steal=False):
+    """
+    Feeds a server random requests for `steps` time steps (and lets peers take some if `steal`), yielding
+    (accepted, taken) after every change: requests the server accepted so far and requests peers took from it.
+    """
+    accepted, taken = 0, 0
+    for _ in range(steps):
+        for _ in range(rng.randrange(8)):
+            add = server.add_to_Q if rng.random() < 0.5 else server.add_to_P
+            accepted += add(rng.randrange(CHUNKS))
+        yield accepted, taken
+        server.process_request()
+        yield accepted, taken
+        if steal:
+            taken += len(server.take_requests(set(rng.sample(range(CHUNKS), 4)), rng.randrange(1, 4)))
+            yield accepted, taken
+
+
+class CuckooQueuesTest(unittest.TestCase):
+    def check(self, scheduler="drr", weights=None, steal=False, coalesce=False, prime_capacity=None, seed=1):
+        rng = random.Random(seed)
+        server = CuckooServer(processing_rate=3, max_queue_size=6, server_id=0, J=3, prime_capacity=prime_capacity,
+                              scheduler=scheduler, weights=weights, coalesce=coalesce)
+        for accepted, taken in drive(server, rng, 300, steal):
+            contents = queue_contents(server)
+            self.assertEqual(server.get_queue_status(), len(contents))
+            riders = 0
+            if coalesce:
+                # Every queued chunk is queued once, and has an entry for its attached requests
+                self.assertEqual(len(set(contents)), len(contents))
+                self.assertEqual(set(server._pending), set(contents))
+                riders = sum(len(waiters or ()) for waiters in server._pending.values())
+            # Every accepted request was served (own or attached), taken, dropped or is still waiting
+            self.assertEqual(accepted, server.waits.total + taken + server.overflow + len(contents) + riders)
+        return server
+
+    def test_drr(self):
+        for weights in [None, (4, 4, 1, 1), (1, 1, 3, 5)]:
+            with self.subTest(weights=weights):
+                self.check(weights=weights)
+
+    def test_static(self):
+        self.check(scheduler="static")
+
+    def test_overflow(self):
+        for scheduler in ["drr", "static"]:
+            with self.subTest(scheduler=scheduler):
+                self.assertGreater(self.check(scheduler, prime_capacity=2).overflow, 0)
+
+    def test_stealing(self):
+        self.check(steal=True)
+        self.check(steal=True, prime_capacity=2)
+
+    def test_coalescing(self):
+        for steal, prime_capacity in itertools.product([False, True], [None, 2]):
+            with self.subTest(steal=steal, prime_capacity=prime_capacity):
+                self.assertGreater(self.check(steal=steal, coalesce=True, prime_capacity=prime_capacity).coalesced, 0)
+
+    def test_forget_overflow_matches_push_segment(self):
+        server = CuckooServer(processing_rate=1, max_queue_size=8, server_id=0)
+        for capacity in range(1, 5):
+            for held, incoming in itertools.product(range(capacity + 1), range(7)):
+                with self.subTest(capacity=capacity, held=held, incoming=incoming):
+                    queue = SegmentedQueue(capacity)
+                    queue.push_segment(TimedRingBuffer(8, range(100, 100 + held)))
+                    segment = TimedRingBuffer(8, range(incoming))
+
+                    reported = []
+                    server.on_drop = reported.append
+                    server._forget_overflow(segment, queue)
+                    dropped = queue.push_segment(segment)
+
+                    kept = [chunk_id for chunk_id in queue if chunk_id < 100]
+                    self.assertEqual(dropped, len(reported))
+                    self.assertEqual(kept + reported, list(range(incoming)))
+
+    def test_dropped_requests_count_as_lost(self):
+        random.seed(0)
+        summary = simulation.simulate("Cuckoo", scenarios.load_placement("CTMmap5"),
+                                      scenarios.load_workload("reap_dep_CTMmap5_SEVERE"), 256, 1000, 2, 2, 8, 3,
+                                      total_intervals=100).summary()
+        self.assertGreater(summary["dropped"], 0)
+        total = summary["accepted"] + summary["rejected"]
+        self.assertEqual(summary["loss_rate"], (summary["rejected"] + summary["dropped"]) / total)
+        self.assertGreater(summary["loss_rate"], summary["rejection_rate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+CuckooRouter: repeated requests of a phase follow the first one to its server, the history is forgotten
+after j routing decisions, routers are independent, and cuckoo_route leaves a given router's j alone.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import chunk_assignment as ca
+import server as se
+from cluster import Cluster
+
+MAPPING = {0: [0, 1], 1: [1, 2], 2: [2, 0]}
+
+
+def cluster():
+    servers, _ = se.Init_Cuckoo_Servers_with_chunk_mapping(3, 3, 2, 2, 8, MAPPING, 3)
+    return Cluster(servers, MAPPING)
+
+
+class CuckooRouterTest(unittest.TestCase):
+    def test_repeated_requests_follow_the_first(self):
+        servers = cluster()
+        router = ca.CuckooRouter(j=10, num_chunks=3)
+        self.assertTrue(router.route(0, servers))
+        first = router.historical_server(0)
+        self.assertIn(first.server_id, MAPPING[0])
+        for _ in range(3):
+            router.route(0, servers)
+        self.assertIs(router.historical_server(0), first)
+        self.assertEqual((len(first.Q), len(first.P)), (1, 3))
+
+    def test_phase_ends_after_j_decisions(self):
+        servers = cluster()
+        router = ca.CuckooRouter(j=3, num_chunks=3)
+        router.route(0, servers)
+        router.route(1, servers)
+        self.assertIsNotNone(router.historical_server(0))
+        router.route(2, servers)  # Third decision: the phase ends
+        self.assertEqual(router.I, 0)
+        self.assertIsNone(router.historical_server(0))
+        self.assertIsNone(router.historical_server(2))
+
+    def test_history_grows_for_unexpected_chunks(self):
+        mapping = {5: [0, 1]}
+        servers, _ = se.Init_Cuckoo_Servers_with_chunk_mapping(1, 2, 2, 2, 8, mapping, 3)
+        router = ca.CuckooRouter(j=5, num_chunks=0)
+        self.assertTrue(router.route(5, Cluster(servers, mapping)))
+        self.assertIsNotNone(router.historical_server(5))
+        self.assertEqual(router.route(4, Cluster(servers, mapping)), "No valid servers for greedy assignment")
+
+    def test_routers_are_independent(self):
+        servers = cluster()
+        first, second = ca.CuckooRouter(j=10), ca.CuckooRouter(j=10)
+        first.route(1, servers)
+        self.assertIsNotNone(first.historical_server(1))
+        self.assertIsNone(second.historical_server(1))
+
+    def test_cuckoo_route_keeps_the_routers_j(self):
+        servers = cluster()
+        router = ca.CuckooRouter(j=7, num_chunks=3)
+        ca.cuckoo_route(0, MAPPING, servers, None, 2, router)
+        ca.cuckoo_route(1, MAPPING, servers, None, 2, router)
+        self.assertEqual(router.j, 7)
+        self.assertIsNotNone(router.historical_server(0))
+
+        # Without a router, j configures the shared one
+        ca.flush_history()
+        random.seed(0)
+        ca.cuckoo_route(0, MAPPING, list(servers), None, 2, None)
+        self.assertEqual(ca._default_router.j, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+The Vectorized engine draws like the Object engine (rng=random), so for Random and Greedy both must produce
+the same run on the shipped scenarios, interval by interval.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import simulation
+from TestCases import scenarios
+
+# (placement, workload, g, q); None requests num_servers uniformly random chunks per interval
+CASES = [
+    ("CTMmap4", "reap_dep_CTMmap4", 2, 10),
+    ("CTMmap5", "reap_dep_CTMmap5_SEVERE", 2, 8),
+    ("CTMmap5", "reap_dep_CTMmap6_Greedy_Vul", 1, 8),
+    ("CTMmap5", None, 4, 8),
+]
+SERIES = ("rejections_by_interval", "queue_lengths_by_interval", "max_queue_length_by_interval")
+
+
+def run(Type, Engine, placement, workload, g, q, intervals=40, seed=7):
+    meta = scenarios.info(placement)
+    random.seed(seed)
+    return simulation.simulate(Type, scenarios.load_placement(placement),
+                               scenarios.load_workload(workload) if workload else None, meta["num_servers"],
+                               meta["num_chunks"], meta["d"], g, q, total_intervals=intervals, Engine=Engine)
+
+
+class EngineParityTest(unittest.TestCase):
+    def test_vectorized_matches_object(self):
+        for Type in ["Random", "Greedy"]:
+            for placement, workload, g, q in CASES:
+                with self.subTest(Type=Type, placement=placement, workload=workload):
+                    expected = run(Type, "Object", placement, workload, g, q)
+                    actual = run(Type, "Vectorized", placement, workload, g, q)
+                    for key in ("accepted", "rejected", "max_queue_length", "avg_queue_length"):
+                        self.assertEqual(actual.summary()[key], expected.summary()[key], key)
+                    for key in SERIES:
+                        self.assertEqual(actual.as_metrics()[key], expected.as_metrics()[key], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
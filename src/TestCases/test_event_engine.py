@@ -0,0 +1,69 @@
+"""
+Event engine: every arrival is accepted or rejected, accepted requests are completed or still queued, a
+replayed trace is served at processing_rate requests per interval, runs are reproducible with a seed and can
+be continued, and coalesced requests are served without events of their own.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import unittest
+
+import event_engine as ee
+import server as se
+from cluster import Cluster
+
+NUM_SERVERS, NUM_CHUNKS = 4, 20
+MAPPING = {chunk: [chunk % NUM_SERVERS, (chunk + 1) % NUM_SERVERS] for chunk in range(NUM_CHUNKS)}
+
+
+def run(**kwargs):
+    return ee.run_event_simulation(MAPPING, NUM_SERVERS, NUM_CHUNKS, 2, 3, **kwargs)
+
+
+class EventEngineTest(unittest.TestCase):
+    def test_request_accounting(self):
+        sim = run(total_intervals=50, seed=1)
+        summary = sim.summary()
+        self.assertGreater(summary["rejected"], 0)
+        self.assertEqual(summary["completed"] + sim.queued, summary["accepted"])
+        self.assertEqual(sim.queued, sum(len(server.queue) for server in sim.cluster))
+        self.assertEqual(summary["events"], summary["accepted"] + summary["rejected"] + summary["completed"])
+        self.assertLessEqual(summary["max_queue_length"], 3)
+        self.assertEqual(summary["time_ms"], 50 * 100)
+
+    def test_seed_reproduces_the_run(self):
+        self.assertEqual(run(total_intervals=20, seed=2).summary(), run(total_intervals=20, seed=2).summary())
+        self.assertNotEqual(run(total_intervals=20, seed=2).summary(), run(total_intervals=20, seed=3).summary())
+
+    def test_run_continues(self):
+        servers, _ = se.Init_Servers_with_chunk_mapping(NUM_CHUNKS, NUM_SERVERS, 2, 2, 3, MAPPING)
+        sim = ee.EventSimulation(Cluster(servers, MAPPING), seed=4)
+        sim.run(1000)
+        sim.run(2000)
+        self.assertEqual(sim.summary(), run(total_intervals=20, seed=4).summary())
+
+    def test_trace_replay(self):
+        # Four requests for chunk 0 in the first millisecond: Greedy spreads them over servers 0 and 1,
+        # each serving one request every 50 ms
+        trace = [(float(t), 0) for t in range(4)]
+        sim = run(total_intervals=2, trace=trace, strategy="Greedy")
+        summary = sim.summary()
+        self.assertEqual((summary["accepted"], summary["completed"], summary["rejected"]), (4, 4, 0))
+        self.assertEqual(summary["max_queue_length"], 2)
+        self.assertEqual((summary["p50_wait"], summary["p99_wait"]), (0, 1))
+        self.assertEqual(sum(server.waits.total for server in sim.cluster), 4)
+
+        # Attached to the queued request, the waiting ones are served by its completion
+        sim = run(total_intervals=2, trace=trace, strategy="Greedy", coalesce=True)
+        summary = sim.summary()
+        self.assertEqual((summary["accepted"], summary["completed"]), (4, 4))
+        self.assertEqual(sum(server.coalesced for server in sim.cluster), 2)
+        self.assertEqual(summary["events"], 4 + 2)
+        self.assertEqual(summary["p99_wait"], 0)
+
+    def test_cuckoo_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run(strategy="Cuckoo")
+
+
+if __name__ == "__main__":
+    unittest.main()
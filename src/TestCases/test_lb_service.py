@@ -0,0 +1,101 @@
+"""
+Load balancer service: every client request gets exactly one answer, overloaded backends answer with
+rejections, requests a CuckooServer drops at a phase change are answered as rejected, and the balancer's
+queue estimate follows the backends' reports.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import asyncio
+import unittest
+
+import lb_service as lb
+import server as se
+import workloads
+
+MAPPING = {chunk: [chunk % 4, (chunk + 1) % 4] for chunk in range(40)}
+
+
+async def start(servers, interval_ms=5):
+    """
+    Runs Backend objects in this event loop instead of worker processes.
+
+    :return: (addresses, tasks, listeners).
+    """
+    addresses, tasks, listeners = [], [], []
+    for server in servers:
+        backend = lb.Backend(server, interval_ms)
+        listener = await asyncio.start_server(backend.handle, "127.0.0.1", 0)
+        addresses.append(("127.0.0.1", listener.sockets[0].getsockname()[1]))
+        tasks.append(asyncio.create_task(backend.process_loop()))
+        listeners.append(listener)
+    return addresses, tasks, listeners
+
+
+async def stop(tasks, listeners):
+    await asyncio.sleep(0.05)  # Lets the backends see their connections closed
+    for task in tasks:
+        task.cancel()
+    for listener in listeners:
+        listener.close()
+
+
+async def benchmark(servers, strategy, rate, duration=0.3):
+    addresses, tasks, listeners = await start(servers)
+    try:
+        return await lb.run_benchmark(MAPPING, addresses, strategy, workloads.uniform(40, 256, seed=1), rate, duration)
+    finally:
+        await stop(tasks, listeners)
+
+
+class LoadBalancerTest(unittest.TestCase):
+    def test_every_request_is_answered(self):
+        for strategy in ["Random", "Greedy"]:
+            with self.subTest(strategy=strategy):
+                servers = [se.Server(4, 8, i) for i in range(4)]
+                report = asyncio.run(benchmark(servers, strategy, rate=500))
+                self.assertGreater(report["requests"], 0)
+                self.assertEqual(report["unanswered"], 0)
+                self.assertEqual(report["served"] + report["rejected"], report["requests"])
+
+    def test_overload_is_rejected(self):
+        # Four servers serving one request every 5 ms cannot keep up with 2000 requests per second
+        servers = [se.Server(1, 2, i) for i in range(4)]
+        report = asyncio.run(benchmark(servers, "Greedy", rate=2000))
+        self.assertEqual(report["unanswered"], 0)
+        self.assertGreater(report["rejected"], 0)
+        self.assertGreater(report["served"], 0)
+
+    def test_cuckoo_drops_are_answered(self):
+        async def run():
+            # g < 4 with the static scheduler processes nothing, so at the phase change everything is moved to
+            # Q', which holds one request: the others are dropped
+            server = se.CuckooServer(processing_rate=0, max_queue_size=4, server_id=0, J=1, prime_capacity=1)
+            addresses, tasks, listeners = await start([server], interval_ms=20)
+            reader, writer = await asyncio.open_connection(*addresses[0])
+            for request_id in range(3):
+                writer.write(lb.BACKEND_REQUEST.pack(request_id, 7, lb.QUEUE_DEFAULT))
+            answers = [lb.BACKEND_RESPONSE.unpack(await reader.readexactly(lb.BACKEND_RESPONSE.size))
+                       for _ in range(2)]
+            writer.close()
+            await stop(tasks, listeners)
+            return answers, server
+
+        answers, server = asyncio.run(run())
+        self.assertEqual(sorted(request_id for request_id, _, _, _ in answers), [1, 2])
+        self.assertEqual({status for _, status, _, _ in answers}, {lb.REJECTED})
+        self.assertEqual(server.overflow, 2)
+        self.assertEqual(len(server.Q_prime), 1)
+
+    def test_proxy_queue_estimate(self):
+        proxy = lb.BackendProxy(0, None, 1, [])
+        proxy.sent_count = 10
+        proxy.reported_depth, proxy.reported_received = 3, 8
+        self.assertEqual(proxy.get_queue_status(), 5)  # Two requests sent since the report
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            lb.LoadBalancer(MAPPING, [None] * 4, "CuckooSimplified")
+
+
+if __name__ == "__main__":
+    unittest.main()
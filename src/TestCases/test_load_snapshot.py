@@ -0,0 +1,82 @@
+"""
+LoadSnapshot: decisions use cached loads until the next refresh, refreshes happen every so many decisions
+or intervals, count_own adds the router's own requests, and a snapshot refreshed before every decision
+routes like live Greedy while an older one herds requests.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import chunk_assignment as ca
+import server as se
+import simulation
+from cluster import Cluster
+
+MAPPING = {0: [0, 1], 1: [1, 0], 2: [2]}
+
+
+def cluster():
+    servers, _ = se.Init_Servers_with_chunk_mapping(3, 3, 1, 2, 8, MAPPING)
+    return Cluster(servers, MAPPING)
+
+
+class LoadSnapshotTest(unittest.TestCase):
+    def test_every_requests(self):
+        servers = cluster()
+        snapshot = ca.LoadSnapshot(servers, every_requests=3, every_intervals=0)
+        chosen = []
+        for _ in range(4):
+            server = snapshot.choose(0)
+            server.add_request(0)
+            chosen.append(server.server_id)
+        # Three decisions on the empty snapshot herd onto server 0, then a refresh sees its queue
+        self.assertEqual(chosen, [0, 0, 0, 1])
+        self.assertEqual(snapshot.refreshes, 2)
+        self.assertEqual(list(snapshot.loads), [3, 0, 0])
+        self.assertIsNone(snapshot.choose(5))
+
+    def test_every_intervals(self):
+        servers = cluster()
+        snapshot = ca.LoadSnapshot(servers, every_intervals=2)
+        servers[1].add_request(0)
+        snapshot.end_interval()
+        self.assertEqual(list(snapshot.loads), [0, 0, 0])
+        snapshot.end_interval()
+        self.assertEqual(list(snapshot.loads), [0, 1, 0])
+        self.assertEqual(snapshot.refreshes, 2)
+        self.assertIs(snapshot.choose(1), servers[0])
+
+    def test_count_own(self):
+        servers = cluster()
+        snapshot = ca.LoadSnapshot(servers, every_intervals=1, count_own=True)
+        chosen = []
+        for _ in range(4):
+            server = snapshot.choose(0)
+            server.add_request(0)
+            snapshot.admitted(server)
+            chosen.append(server.server_id)
+        self.assertEqual(chosen, [0, 1, 0, 1])
+        self.assertEqual(snapshot.refreshes, 1)
+
+    def test_needs_a_refresh_period(self):
+        with self.assertRaises(ValueError):
+            ca.LoadSnapshot(cluster(), every_requests=0, every_intervals=0)
+
+    def test_simulation(self):
+        def run(**kwargs):
+            random.seed(4)
+            return simulation.simulate("Greedy", None, None, 64, 300, 2, 2, 4, total_intervals=30, **kwargs)
+
+        live = run()
+        fresh = run(refresh_requests=1)
+        self.assertEqual((fresh["accepted"], fresh["rejected"]), (live["accepted"], live["rejected"]))
+        stale = run(refresh_intervals=5)
+        self.assertGreater(stale["rejected"], live["rejected"])
+
+        with self.assertRaises(ValueError):
+            run(refresh_intervals=1, Engine="Vectorized")
+
+
+if __name__ == "__main__":
+    unittest.main()
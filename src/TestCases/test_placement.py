@@ -0,0 +1,72 @@
+"""
+Placement builders: every chunk gets d distinct servers, the CSR arrays of both directions agree, and a
+placement round-trips through the chunk-to-server dictionary the simulations use.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import unittest
+
+import numpy as np
+
+import placement as pl
+
+# (n, m, d); small rings and d == m are the edge cases
+CASES = [
+    (500, 64, 2),
+    (300, 16, 3),
+    (10, 3, 3),
+    (10, 2, 2),
+    (100, 4, 4),
+    (200, 20, 20),
+    (50, 1, 1),
+]
+BUILDERS = {
+    "uniform": lambda n, m, d: pl.uniform_placement(n, m, d, seed=3),
+    "consistent_hash": lambda n, m, d: pl.consistent_hash_placement(n, m, d, seed=3),
+    "consistent_hash_vnodes1": lambda n, m, d: pl.consistent_hash_placement(n, m, d, vnodes=1, seed=3),
+    "rendezvous": lambda n, m, d: pl.rendezvous_placement(n, m, d, seed=3),
+}
+
+
+class PlacementTest(unittest.TestCase):
+    def check(self, placement, n, m, d):
+        self.assertEqual(placement.num_chunks, n)
+        np.testing.assert_array_equal(np.diff(placement.indptr), np.full(n, d))
+        for chunk_id in range(n):
+            replicas = placement.replicas(chunk_id).tolist()
+            self.assertEqual(len(set(replicas)), d, f"chunk {chunk_id} has replicas {replicas}")
+            self.assertTrue(all(0 <= server_id < m for server_id in replicas))
+
+        # Server -> chunks lists every replica once, chunks ascending
+        mapping = placement.to_mapping()
+        server_to_chunks = placement.server_to_chunks()
+        self.assertEqual(sum(len(chunks) for chunks in server_to_chunks.values()), n * d)
+        for server_id, chunks in server_to_chunks.items():
+            self.assertEqual(chunks, sorted(chunks))
+            self.assertTrue(all(server_id in mapping[chunk_id] for chunk_id in chunks))
+
+        # CSR -> dictionary -> CSR keeps the replicas and their order
+        rebuilt = pl.Placement.from_mapping(mapping, m)
+        np.testing.assert_array_equal(rebuilt.indptr, placement.indptr)
+        np.testing.assert_array_equal(rebuilt.indices, placement.indices)
+        self.assertEqual(rebuilt.to_mapping(), mapping)
+
+    def test_builders(self):
+        for name, build in BUILDERS.items():
+            for n, m, d in CASES:
+                with self.subTest(builder=name, n=n, m=m, d=d):
+                    self.check(build(n, m, d), n, m, d)
+
+    def test_seeded_builders_are_reproducible(self):
+        for name, build in BUILDERS.items():
+            with self.subTest(builder=name):
+                np.testing.assert_array_equal(build(200, 32, 3).indices, build(200, 32, 3).indices)
+
+    def test_too_many_replicas(self):
+        for build in [pl.uniform_placement, pl.consistent_hash_placement, pl.rendezvous_placement]:
+            with self.assertRaises(ValueError):
+                build(10, 3, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
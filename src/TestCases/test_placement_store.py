@@ -0,0 +1,80 @@
+"""
+Placement store: a saved placement opens with the same arrays and metadata, mapped read-only, corrupted or
+truncated files are refused, and a simulation over an opened placement matches one over the dictionary.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import placement as pl
+import placement_store as ps
+import simulation
+
+
+class PlacementStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "placement.lbpl")
+
+    def test_round_trip(self):
+        placement = pl.uniform_placement(500, 64, 3, seed=3)
+        ps.save_placement(self.path, placement)
+        opened = ps.open_placement(self.path, verify=True)
+        for name in ("indptr", "indices", "server_indptr", "server_indices"):
+            np.testing.assert_array_equal(getattr(opened, name), getattr(placement, name), name)
+            self.assertIsInstance(getattr(opened, name), np.memmap, name)
+        self.assertEqual(opened.to_mapping(), placement.to_mapping())
+        self.assertEqual((opened.metadata["num_chunks"], opened.metadata["num_servers"]), (500, 64))
+        self.assertEqual((opened.metadata["d"], opened.metadata["seed"]), (3, 3))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+        with self.assertRaises(ValueError):
+            opened.indices[0] = 1  # Mapped read-only
+
+    def test_mixed_replica_counts(self):
+        placement = pl.Placement.from_mapping({0: [1], 1: [0, 2], 2: []}, 3)
+        ps.save_placement(self.path, placement, seed=9, checksum=False)
+        header = ps.read_header(self.path)
+        self.assertEqual((header["d"], header["seed"], header["checksum"]), (0, 9, None))
+        self.assertEqual(ps.open_placement(self.path, verify=True).to_mapping(), placement.to_mapping())
+
+    def test_invalid_files(self):
+        ps.save_placement(self.path, pl.uniform_placement(200, 16, 2, seed=1))
+        self.assertTrue(ps.verify(self.path))
+        size = os.path.getsize(self.path)
+
+        with open(self.path, "r+b") as f:
+            f.seek(size - 8)
+            f.write(b"\xff" * 8)
+        self.assertFalse(ps.verify(self.path))
+        ps.open_placement(self.path)  # Only checked when asked to
+
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 64)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            ps.open_placement(self.path)
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a placement file" * 10)
+        with self.assertRaises(ValueError):
+            ps.open_placement(self.path)
+
+    def test_simulation_over_an_opened_placement(self):
+        placement = pl.uniform_placement(300, 32, 2, seed=4)
+        ps.save_placement(self.path, placement)
+        results = []
+        for chunk_to_servers in (placement.to_mapping(), ps.open_placement(self.path)):
+            random.seed(5)
+            metrics = simulation.simulate("Greedy", chunk_to_servers, None, 32, 300, g=2, q=4, total_intervals=10)
+            results.append((metrics["accepted"], metrics["rejected"], metrics["rejections_by_interval"]))
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
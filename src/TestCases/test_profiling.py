@@ -0,0 +1,63 @@
+"""
+Profiling hooks: phase timing and call counting observe a run without changing it, and switching them off
+restores the original functions.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import chunk_assignment as ca
+import profiling
+import simulation
+
+INTERVALS = 20
+
+
+def run(Type="Greedy"):
+    random.seed(3)
+    return simulation.simulate(Type, None, None, 64, 300, 2, 2, 4, total_intervals=INTERVALS)
+
+
+class ProfilingTest(unittest.TestCase):
+    def tearDown(self):
+        profiling.configure(False)
+
+    def test_profiled_run_is_unchanged(self):
+        expected = run()
+        profiler = profiling.configure(True, count_calls=True)
+        actual = run()
+        for key in ("accepted", "rejected", "rejections_by_interval", "queue_lengths_by_interval"):
+            self.assertEqual(actual[key], expected[key], key)
+
+        phases = profiler.summary()["phases"]
+        for phase in (profiling.WORKLOAD, profiling.ROUTE, profiling.PROCESS, profiling.METRICS):
+            self.assertEqual(phases[phase][1], INTERVALS, phase)
+        self.assertEqual(phases[profiling.SETUP][1], 1)
+        calls = profiler.summary()["calls"]
+        self.assertEqual(calls["chunk_assignment.assign_m_chunk_greedy"], actual["accepted"] + actual["rejected"])
+        self.assertEqual(calls["chunk_assignment.adversary_assign_chunks_avgcase"], INTERVALS)
+        self.assertIn("route", profiler.report())
+
+    def test_configure_restores_the_functions(self):
+        original = ca.assign_m_chunk_greedy
+        profiling.configure(True, count_calls=True)
+        profiling.configure(True, count_calls=True)  # Wrapped once only
+        self.assertIsNot(ca.assign_m_chunk_greedy, original)
+        self.assertIs(ca.assign_m_chunk_greedy.__wrapped__, original)
+        profiling.configure(False)
+        self.assertIs(ca.assign_m_chunk_greedy, original)
+        self.assertFalse(profiling.profiler.summary()["phases"])
+
+    def test_profile_call(self):
+        for mode in ["deterministic", "sample"]:
+            with self.subTest(mode=mode):
+                metrics, report = profiling.profile_call(run, "Random", mode=mode, interval=0.001)
+                self.assertEqual(metrics["accepted"] + metrics["rejected"], 64 * INTERVALS)
+                self.assertTrue(report)
+        with self.assertRaises(ValueError):
+            profiling.profile_call(run, mode="trace")
+
+
+if __name__ == "__main__":
+    unittest.main()
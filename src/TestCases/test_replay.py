@@ -0,0 +1,100 @@
+"""
+Record and replay: a recording holds one record per routed request plus a marker per empty interval,
+re-applying the recorded decisions reproduces the recorded admissions, replaying the requests through the
+recorded strategy reproduces its totals, and recordings append across runs and survive a torn last record.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+import replay
+import server as se
+import simulation
+import workloads
+
+NUM_SERVERS, NUM_CHUNKS, G, Q = 16, 60, 2, 3
+MAPPING = {chunk: [chunk % NUM_SERVERS, (chunk * 7 + 1) % NUM_SERVERS] for chunk in range(NUM_CHUNKS)}
+INTERVALS = 12
+
+
+def workload():
+    # Every fourth interval is empty
+    stream = workloads.zipf(NUM_CHUNKS, 24, s=1.3, seed=1)
+    batches = enumerate(workloads.take(stream, INTERVALS))
+    return (batch if interval % 4 != 2 else batch[:0] for interval, batch in batches)
+
+
+def record(path, Type="Greedy"):
+    random.seed(2)
+    with replay.TraceRecorder(path, buffer_records=16) as recorder:
+        metrics = simulation.simulate(Type, MAPPING, None, NUM_SERVERS, NUM_CHUNKS, g=G, q=Q,
+                                      total_intervals=INTERVALS, workload=workload(), recorder=recorder)
+    return metrics, recorder
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "trace.bin")
+
+    def test_recording(self):
+        metrics, recorder = record(self.path)
+        self.assertGreater(metrics["rejected"], 0)
+        self.assertEqual(recorder.recorded, metrics["accepted"] + metrics["rejected"])
+
+        records = replay.load_trace(self.path)
+        markers = records[records["accepted"] == replay.MARKER]
+        self.assertEqual(markers["interval"].tolist(), [2, 6, 10])
+        self.assertEqual(len(records), recorder.recorded + len(markers))
+        self.assertTrue((np.diff(records["interval"]) >= 0).all())
+
+        replayer = replay.TraceReplayer(self.path)
+        self.assertEqual(replayer.num_intervals, INTERVALS)
+        self.assertEqual(replayer.recorded_summary(),
+                         {"accepted": metrics["accepted"], "rejected": metrics["rejected"]})
+        expected = [batch.tolist() for batch in workload()]
+        self.assertEqual([batch.tolist() for batch in replayer.batches()], expected)
+
+    def test_replay_decisions(self):
+        metrics, _ = record(self.path, "Random")
+        servers, _ = se.Init_Servers_with_chunk_mapping(NUM_CHUNKS, NUM_SERVERS, G, 2, Q, MAPPING)
+        self.assertEqual(replay.TraceReplayer(self.path).replay_decisions(servers),
+                         (metrics["accepted"], metrics["rejected"], 0))
+
+        # Servers with longer queues accept requests the recording rejected
+        servers, _ = se.Init_Servers_with_chunk_mapping(NUM_CHUNKS, NUM_SERVERS, G, 2, Q + 5, MAPPING)
+        accepted, rejected, mismatches = replay.TraceReplayer(self.path).replay_decisions(servers)
+        self.assertEqual(mismatches, metrics["rejected"] - rejected)
+        self.assertGreater(mismatches, 0)
+
+    def test_compare_replays_the_requests(self):
+        metrics, _ = record(self.path)
+        results = replay.TraceReplayer(self.path).compare(["Greedy", "Random"], MAPPING, NUM_SERVERS, NUM_CHUNKS, G, Q)
+        self.assertEqual((results["Greedy"]["accepted"], results["Greedy"]["rejected"]),
+                         (metrics["accepted"], metrics["rejected"]))
+        self.assertEqual(results["Random"]["accepted"] + results["Random"]["rejected"],
+                         metrics["accepted"] + metrics["rejected"])
+        self.assertIn("seconds", results["Random"])
+
+    def test_append_and_torn_record(self):
+        record(self.path)
+        single = len(replay.load_trace(self.path))
+        record(self.path)
+        self.assertEqual(len(replay.load_trace(self.path)), 2 * single)
+
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x00\x00")  # Crashed in the middle of a record
+        self.assertEqual(len(replay.load_trace(self.path)), 2 * single)
+
+        open(self.path, "wb").close()
+        self.assertEqual(replay.TraceReplayer(self.path).num_intervals, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+RetryAdmission: a full first choice falls back to the other replicas, refused requests are deferred
+1, 2, 4, ... intervals on and rejected once out of backoff, the run's leftovers are rejected by flush, and
+in a simulation every request ends up accepted or rejected exactly once.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import chunk_assignment as ca
+import server as se
+import simulation
+from cluster import Cluster
+
+MAPPING = {0: [0, 1, 2], 1: [0], 2: []}
+
+
+def cluster():
+    servers, _ = se.Init_Servers_with_chunk_mapping(3, 3, 1, 3, 1, MAPPING)  # Queues hold one request
+    return Cluster(servers, MAPPING)
+
+
+class RetryAdmissionTest(unittest.TestCase):
+    def test_first_choice_is_plain_random(self):
+        servers = cluster()
+        admission = ca.RetryAdmission(rng=random.Random(1))
+        rng = random.Random(1)
+        self.assertTrue(admission.admit(0, servers))
+        self.assertEqual(len(ca.choose_random_server(servers, 0, rng).queue), 1)
+        self.assertEqual((admission.accepted, admission.retried), (1, 0))
+
+    def test_retries(self):
+        servers = cluster()
+        admission = ca.RetryAdmission(rng=random.Random(2))
+        for _ in range(3):
+            self.assertTrue(admission.admit(0, servers))
+        self.assertEqual([len(server.queue) for server in servers], [1, 1, 1])
+        self.assertFalse(admission.admit(0, servers))
+        self.assertFalse(admission.admit(2, servers))  # No replica at all
+        self.assertEqual((admission.accepted, admission.rejected), (3, 2))
+        self.assertGreaterEqual(admission.retried, 1)
+
+        # Without retries a full first choice is rejected
+        for retries, rejected in [(0, True), (None, False)]:
+            admission = ca.RetryAdmission(retries=retries, rng=random.Random(3))
+            results = []
+            for _ in range(20):
+                servers = cluster()
+                servers[0].add_request(1)
+                results.append(admission.admit(0, servers))
+            self.assertEqual(False in results, rejected, retries)
+            self.assertEqual(admission.retried > 0, not rejected, retries)
+
+    def test_backoff(self):
+        servers = cluster()
+        servers[0].add_request(1)
+        admission = ca.RetryAdmission(backoff=2)
+        self.assertIsNone(admission.admit(1, servers))
+        self.assertEqual(admission.pending, {1: [(1, 1)]})
+
+        # Still full when due: deferred again, two intervals on
+        self.assertEqual(admission.retry_due(1, servers), (0, 0))
+        self.assertEqual(admission.pending, {3: [(1, 2)]})
+        self.assertEqual(admission.retry_due(2, servers), (0, 0))
+        self.assertEqual(admission.retry_due(3, servers), (0, 1))  # Out of backoff
+        self.assertEqual((admission.deferred, admission.rejected, admission.pending_count), (2, 1, 0))
+
+        # Room by the time it is due
+        self.assertIsNone(admission.admit(1, servers))
+        servers[0].process_request()
+        self.assertEqual(admission.retry_due(4, servers), (1, 0))
+        self.assertEqual(admission.accepted, 1)
+
+    def test_max_pending_and_flush(self):
+        servers = cluster()
+        servers[0].add_request(1)
+        admission = ca.RetryAdmission(backoff=3, max_pending=2)
+        self.assertEqual([admission.admit(1, servers) for _ in range(3)], [None, None, False])
+        self.assertEqual(admission.flush(), 2)
+        self.assertEqual((admission.pending, admission.pending_count, admission.rejected), ({}, 0, 3))
+
+    def test_simulation(self):
+        def run(**kwargs):
+            random.seed(5)
+            return simulation.simulate("Random", None, None, 64, 300, 2, 2, 2, total_intervals=30, **kwargs)
+
+        plain, retried, backed_off = run(), run(retries=1), run(retries=1, backoff=3)
+        self.assertLess(retried["rejected"], plain["rejected"])
+        self.assertGreater(retried.summary()["retried"], 0)
+        self.assertLessEqual(backed_off["rejected"], retried["rejected"])
+        for metrics in (plain, retried, backed_off):
+            self.assertEqual(metrics["accepted"] + metrics["rejected"], 64 * 30)
+        summary = backed_off.summary()
+        self.assertGreater(summary["deferred"], 0)
+        self.assertGreaterEqual(summary["rejected"], summary["deferred_at_end"])
+
+        with self.assertRaises(ValueError):
+            run(retries=1, Engine="Vectorized")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Ring buffers behave like a bounded deque while their slots are allocated on demand, and keep every stamp
+next to its element across reallocations.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import collections
+import random
+import unittest
+
+from ring_buffer import RingBuffer, SegmentedQueue, TimedRingBuffer
+
+
+class RingBufferTest(unittest.TestCase):
+    def test_matches_deque(self):
+        rng = random.Random(2)
+        for capacity in [0, 1, 3, 8, 50]:
+            with self.subTest(capacity=capacity):
+                buffer, expected = TimedRingBuffer(capacity), collections.deque()
+                for step in range(2000):
+                    if rng.random() < 0.55:
+                        if len(expected) == capacity:
+                            self.assertTrue(buffer.is_full())
+                            with self.assertRaises(IndexError):
+                                buffer.append(step, -step)
+                        else:
+                            buffer.append(step, -step)
+                            expected.append(step)
+                    elif expected:
+                        item = expected.popleft()
+                        self.assertEqual(buffer.popleft_timed(), (item, -item))
+                    self.assertEqual(list(buffer), list(expected))
+                    self.assertEqual(buffer.capacity, capacity)
+                    self.assertLessEqual(len(buffer._items), capacity)
+
+    def test_slots_are_allocated_on_demand(self):
+        buffer = RingBuffer(1000)
+        self.assertEqual(len(buffer._items), 0)
+        buffer.append(1)
+        self.assertLess(len(buffer._items), 1000)
+        buffer.extend(range(999))
+        self.assertTrue(buffer.is_full())
+        self.assertEqual(len(buffer._items), 1000)
+
+    def test_extend_grows_the_capacity(self):
+        buffer = TimedRingBuffer(2, [1, 2])
+        buffer.popleft()
+        buffer.append(3, 7)
+        buffer.extend(TimedRingBuffer(4, [4, 5, 6]))
+        self.assertEqual(list(buffer.timed()), [(2, 0), (3, 7), (4, 0), (5, 0), (6, 0)])
+        self.assertGreaterEqual(buffer.capacity, 5)
+
+    def test_take_matching_and_truncate(self):
+        buffer = TimedRingBuffer(8)
+        for item in range(6):
+            buffer.append(item, 10 + item)
+        self.assertEqual(buffer.take_matching({1, 3, 4}, 2), [(1, 11), (3, 13)])
+        self.assertEqual(list(buffer), [0, 2, 4, 5])
+        buffer.truncate(2)
+        buffer.append(9, 19)
+        self.assertEqual(list(buffer.timed()), [(0, 10), (2, 12), (9, 19)])
+
+    def test_segmented_queue_drops_beyond_capacity(self):
+        queue = SegmentedQueue(4)
+        self.assertEqual(queue.push_segment(TimedRingBuffer(8, [1, 2, 3])), 0)
+        self.assertEqual(queue.push_segment(TimedRingBuffer(8, [4, 5, 6])), 2)
+        self.assertEqual([queue.popleft() for _ in range(len(queue))], [1, 2, 3, 4])
+        self.assertEqual(queue.take_spare(8).capacity, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
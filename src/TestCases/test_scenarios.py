@@ -0,0 +1,56 @@
+"""
+Scenario registry: files round-trip placements and workloads, and every load hands out its own copy (or
+read-only arrays), so one caller's changes never leak into the next.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import os
+import tempfile
+import unittest
+
+from TestCases import Chunktoservermaps as CTM
+from TestCases import scenarios
+
+
+class ScenariosTest(unittest.TestCase):
+    def test_loads_are_independent(self):
+        placement = scenarios.load_placement("CTMmap5")
+        replicas = list(placement[0])
+        placement[0].append(-1)
+        placement[1] = []
+        self.assertEqual(scenarios.load_placement("CTMmap5")[0], replicas)
+        self.assertEqual(CTM.CTMmap5[1], scenarios.load_placement("CTMmap5")[1])
+        self.assertTrue(CTM.CTMmap5[1])
+
+        workload = scenarios.load_workload("reap_dep_CTMmap4")
+        size = len(workload)
+        workload.clear()
+        self.assertEqual(len(CTM.reap_dep_CTMmap4), size)
+
+    def test_arrays_are_read_only(self):
+        indptr, indices = scenarios.load_placement_arrays("CTMmap5")
+        with self.assertRaises(TypeError):
+            indices[0] = 0
+        with self.assertRaises(TypeError):
+            indptr[1] = 0
+        self.assertEqual(len(indptr), scenarios.info("CTMmap5")["num_chunks"] + 1)
+
+    def test_round_trip(self):
+        mapping = {0: [3, 1], 1: [], 2: [2]}
+        chunks = [2, 0, 0, 1]
+        with tempfile.TemporaryDirectory() as directory:
+            scenarios.write_placement(os.path.join(directory, "p.bin"), mapping)
+            scenarios.write_workload(os.path.join(directory, "w.bin"), chunks)
+            scenarios.register("test_p", os.path.join(directory, "p.bin"), "placement", num_servers=4)
+            scenarios.register("test_w", os.path.join(directory, "w.bin"), "workload")
+            try:
+                self.assertEqual(scenarios.load("test_p"), mapping)
+                self.assertEqual(scenarios.load("test_w"), chunks)
+                with self.assertRaises(ValueError):
+                    scenarios.load_workload("test_p")
+            finally:
+                del scenarios.SCENARIOS["test_p"], scenarios.SCENARIOS["test_w"]
+
+
+if __name__ == "__main__":
+    unittest.main()
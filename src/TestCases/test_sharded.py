@@ -0,0 +1,71 @@
+"""
+Sharded engine: with one worker Greedy is the sequential Greedy of the vectorized engine, every request is
+accounted for at any worker count, and the four-queue Cuckoo is refused rather than silently simplified.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import numpy as np
+
+import chunk_assignment as ca
+import sharded
+import simulation
+import vectorized_engine as ve
+
+NUM_SERVERS, NUM_CHUNKS, G, Q = 32, 300, 2, 6
+
+
+def requests(seed, intervals=30):
+    rng = np.random.default_rng(seed)
+    hot = rng.integers(0, NUM_CHUNKS, 6)  # Skewed, so queues fill and Greedy's choices matter
+    return [np.concatenate([rng.integers(0, NUM_CHUNKS, 30), rng.choice(hot, 50)]) for _ in range(intervals)]
+
+
+class ShardedTest(unittest.TestCase):
+    def setUp(self):
+        random.seed(5)
+        self.mapping = ca.generate_chunk_to_servers_mapping(NUM_CHUNKS, NUM_SERVERS, 3)
+
+    def test_one_worker_greedy_matches_vectorized(self):
+        vectorized = ve.VectorizedSimulation(self.mapping, NUM_SERVERS, G, Q, "Greedy")
+        with sharded.ShardedSimulation(self.mapping, NUM_SERVERS, G, Q, "Greedy", workers=1) as sim:
+            for interval, chunks in enumerate(requests(1)):
+                expected = vectorized.route(chunks)
+                vectorized.process()
+                self.assertEqual(sim.step(chunks), expected, f"interval {interval}")
+                np.testing.assert_array_equal(sim.loads, vectorized.get_queue_status())
+
+    def test_every_request_is_accounted_for(self):
+        for strategy in ["Random", "Greedy", "CuckooSimplified"]:
+            for workers in [1, 3]:
+                with self.subTest(strategy=strategy, workers=workers), \
+                        sharded.ShardedSimulation(self.mapping, NUM_SERVERS, G, Q, strategy, workers, seed=2,
+                                                  max_batch=20) as sim:
+                    for chunks in requests(3, intervals=10):
+                        chunks = np.append(chunks, [-1, NUM_CHUNKS])  # Unknown chunks are rejected
+                        accepted, rejected = sim.step(chunks)
+                        self.assertEqual(accepted + rejected, chunks.size)
+                        self.assertGreaterEqual(rejected, 2)
+                        self.assertTrue(((sim.loads >= 0) & (sim.loads <= Q)).all())
+
+    def test_cuckoo_is_refused(self):
+        with self.assertRaisesRegex(ValueError, "CuckooSimplified"):
+            sharded.ShardedSimulation(self.mapping, NUM_SERVERS, G, Q, "Cuckoo", workers=1)
+        with self.assertRaisesRegex(ValueError, "CuckooSimplified"):
+            simulation.simulate("Cuckoo", self.mapping, None, NUM_SERVERS, NUM_CHUNKS, Engine="Sharded", workers=1)
+        with self.assertRaises(ValueError):
+            simulation.simulate("CuckooSimplified", self.mapping, None, NUM_SERVERS, NUM_CHUNKS)
+
+    def test_simulate_passes_workers(self):
+        runs = []
+        for _ in range(2):
+            random.seed(8)
+            runs.append(simulation.simulate("Greedy", self.mapping, None, NUM_SERVERS, NUM_CHUNKS, g=G, q=Q,
+                                            total_intervals=10, Engine="Sharded", workers=2).summary())
+        self.assertEqual(runs[0], runs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
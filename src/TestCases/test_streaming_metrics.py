@@ -0,0 +1,97 @@
+"""
+Streaming metrics: percentiles match the nearest-rank definition, lists and NumPy arrays are recorded
+alike, series stay bounded without losing totals, and merging collectors equals recording both runs.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import math
+import random
+import unittest
+
+import numpy as np
+
+from streaming_metrics import DownsampledSeries, Histogram, MetricsCollector
+
+
+def nearest_rank(values, p):
+    values = sorted(values)
+    return values[max(1, math.ceil(len(values) * p / 100)) - 1]
+
+
+def intervals(seed, count=300, servers=40):
+    rng = random.Random(seed)
+    for interval in range(count):
+        accepted = rng.randrange(200)
+        yield interval, accepted, rng.randrange(50), [rng.randrange(12) for _ in range(servers)]
+
+
+class StreamingMetricsTest(unittest.TestCase):
+    def test_histogram_percentiles(self):
+        rng = random.Random(1)
+        values = [rng.randrange(60) for _ in range(1001)]
+        histogram = Histogram(100)
+        for value in values:
+            histogram.add(value)
+        for p in [1, 25, 50, 90, 99, 100]:
+            self.assertEqual(histogram.percentile(p), nearest_rank(values, p), p)
+
+        histogram = Histogram(4)
+        histogram.add_counts([1, 0, 0, 2, 5])  # Values 3 and 4 share the overflow bin
+        self.assertEqual((list(histogram.counts), histogram.total), ([1, 0, 0, 7], 8))
+        self.assertEqual(Histogram(4).percentile(50), 0)
+        with self.assertRaises(ValueError):
+            histogram.merge(Histogram(5))
+
+    def test_list_and_array_observations_agree(self):
+        by_list, by_array = MetricsCollector(queue_bins=8), MetricsCollector(queue_bins=8)
+        for interval, accepted, rejected, lengths in intervals(2):
+            by_list.observe(interval, accepted, rejected, lengths)
+            by_array.observe(interval, accepted, rejected, np.array(lengths))
+        self.assertEqual(by_list.summary(), by_array.summary())
+        self.assertEqual(list(by_list.queue_depths.counts), list(by_array.queue_depths.counts))
+
+    def test_series_stay_bounded(self):
+        series = DownsampledSeries(max_points=16)
+        for interval in range(1000):
+            series.append(interval, interval % 7)
+        self.assertLessEqual(len(series.sums), 16)
+        self.assertEqual(sum(series.sums), sum(i % 7 for i in range(1000)))
+        self.assertEqual(sum(series.counts), 1000)
+        self.assertEqual(series.intervals()[1], series.stride)
+        self.assertEqual(max(series.maxima), 6)
+
+    def test_summary(self):
+        collector = MetricsCollector()
+        lengths_seen, rejected_total, accepted_total = [], 0, 0
+        for interval, accepted, rejected, lengths in intervals(3):
+            collector.observe(interval, accepted, rejected, lengths)
+            lengths_seen += lengths
+            accepted_total += accepted
+            rejected_total += rejected
+        summary = collector.summary()
+        self.assertEqual((summary["accepted"], summary["rejected"]), (accepted_total, rejected_total))
+        self.assertEqual(summary["max_queue_length"], max(lengths_seen))
+        self.assertEqual(summary["p99_queue_length"], nearest_rank(lengths_seen, 99))
+        self.assertAlmostEqual(summary["avg_queue_length"], sum(lengths_seen) / len(lengths_seen))
+        self.assertEqual(collector["accepted"], accepted_total)  # Keys of the old metrics dictionary
+
+    def test_merge_equals_one_collector(self):
+        merged, first, second = (MetricsCollector(max_points=32) for _ in range(3))
+        for interval, accepted, rejected, lengths in intervals(4, count=100):
+            first.observe(interval, accepted, rejected, lengths)
+            merged.observe(interval, accepted, rejected, lengths)
+        for interval, accepted, rejected, lengths in intervals(5, count=50):
+            second.observe(interval, accepted, rejected, lengths)
+            merged.observe(interval, accepted, rejected, lengths)
+        first.observe_dropped(3)
+        second.observe_dropped(4)
+        merged.observe_dropped(7)
+
+        combined = first.merge(second).summary()
+        for key in ("accepted", "rejected", "dropped", "loss_rate", "max_queue_length", "p50_queue_length",
+                    "p99_queue_length", "p95_rejection_rate"):
+            self.assertEqual(combined[key], merged.summary()[key], key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Sweep results files: an interrupted or older file is resumed and upgraded without relabelling or rerunning
+its cells, and cell seeds do not change when parameters are added.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import csv
+import os
+import tempfile
+import unittest
+import zlib
+
+import sweep
+
+# Header of the user-022 era, before the scheduler parameter and the later summary columns
+OLD_PARAMETERS = ("Type", "num_servers", "num_chunks", "d", "g", "q", "J", "mapping", "workload", "total_intervals",
+                  "Engine", "refresh_intervals", "refresh_requests", "retries", "backoff", "repeat")
+OLD_SUMMARY = ("seed", "accepted", "rejected", "retried", "deferred", "dropped", "rejection_rate",
+               "avg_queue_length", "max_queue_length", "seconds")
+GRID = {"Type": ["Random", "Cuckoo"], "num_servers": 16, "num_chunks": 60, "total_intervals": 5, "repeat": [0, 1]}
+
+
+def old_row(Type, **values):
+    row = {name: sweep.DEFAULTS[name] for name in OLD_PARAMETERS}
+    row.update({name: 1 for name in OLD_SUMMARY})
+    row.update(Type=Type, **values)
+    return row
+
+
+class SweepResultsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "results.csv")
+
+    def write(self, fieldnames, rows):
+        with open(self.path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def read(self):
+        with open(self.path, newline="") as f:
+            reader = csv.DictReader(f)
+            return reader.fieldnames, list(reader)
+
+    def test_upgrade_labels_rows_with_their_legacy_values(self):
+        self.write(OLD_PARAMETERS + OLD_SUMMARY, [old_row("Cuckoo"), old_row("Greedy", refresh_intervals=4)])
+        sweep.completed_keys(self.path)
+
+        fieldnames, rows = self.read()
+        self.assertEqual(fieldnames, list(sweep.COLUMNS))
+        self.assertEqual([row["scheduler"] for row in rows], ["static", "static"])
+        self.assertEqual([row["refresh_intervals"] for row in rows], ["0", "4"])
+        self.assertEqual([row["base_seed"] for row in rows], ["0", "0"])
+        self.assertEqual([row["loss_rate"] for row in rows], ["", ""])
+
+    def test_upgrade_refuses_changed_models(self):
+        without_dropped = tuple(name for name in OLD_SUMMARY if name != "dropped")
+        self.write(OLD_PARAMETERS + without_dropped, [old_row("Random"), old_row("Cuckoo")])
+        with self.assertRaisesRegex(ValueError, "dropped"):
+            sweep.completed_keys(self.path)
+
+        # Without Cuckoo rows the file is upgraded
+        self.write(OLD_PARAMETERS + without_dropped, [old_row("Random"), old_row("Greedy")])
+        sweep.completed_keys(self.path)
+        self.assertEqual(self.read()[0], list(sweep.COLUMNS))
+
+        self.write(OLD_PARAMETERS + OLD_SUMMARY, [old_row("Random", backoff=2)])
+        with self.assertRaisesRegex(ValueError, "deferred_at_end"):
+            sweep.completed_keys(self.path)
+
+    def test_unknown_columns_are_refused(self):
+        self.write(OLD_PARAMETERS + OLD_SUMMARY + ("colour",), [old_row("Random", colour="red")])
+        with self.assertRaisesRegex(ValueError, "colour"):
+            sweep.completed_keys(self.path)
+
+    def test_seed_ignores_later_parameters(self):
+        cell = sweep.expand_grid({"Type": "Cuckoo", "steal": True, "weights": "2:2:1:1"})[0]
+        original = "|".join(f"{name}={cell[name]}" for name in sweep.SEED_PARAMETERS)
+        self.assertEqual(sweep.cell_seed(cell, 5), zlib.crc32(original.encode()) ^ 5)
+        self.assertEqual(sweep.cell_seed(cell, 5), sweep.cell_seed(dict(cell, steal=False), 5))
+        self.assertNotEqual(sweep.cell_seed(cell, 5), sweep.cell_seed(dict(cell, repeat=1), 5))
+
+    def test_resume_runs_missing_cells_only(self):
+        self.assertEqual(sweep.run_sweep(GRID, self.path, workers=1), 4)
+        _, rows = self.read()
+
+        # Cut the last row short, as an interrupted write would
+        with open(self.path, "rb+") as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+        self.assertEqual(sweep.run_sweep(GRID, self.path, workers=1), 1)
+        self.assertEqual(sweep.run_sweep(GRID, self.path, workers=1), 0)
+
+        _, resumed = self.read()
+        self.assertEqual(len(resumed), 4)
+        self.assertEqual(sorted(row["seed"] for row in resumed), sorted(row["seed"] for row in rows))
+        # Another base seed is another set of runs
+        self.assertEqual(sweep.run_sweep(GRID, self.path, workers=1, base_seed=1), 4)
+
+    def test_resume_keys_on_the_stored_seed(self):
+        sweep.run_sweep(GRID, self.path, workers=1)
+        fieldnames, rows = self.read()
+
+        # Parameters written differently still match; a row stored with another seed ran another run
+        rows[0]["steal"], rows[0]["q"] = "False", " 8"
+        rows[1]["seed"] = int(rows[1]["seed"]) ^ 1
+        self.write(fieldnames, rows)
+        self.assertEqual(sweep.run_sweep(GRID, self.path, workers=1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Event tracing: a traced run records one ASSIGN per routed request and one SERVER_STATUS per server and
+interval, levels and sampling filter events, binary traces read back as written, and tracing never changes
+the run.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+import simulation
+import tracing
+
+NUM_SERVERS, INTERVALS = 16, 5
+
+
+def run():
+    random.seed(6)
+    return simulation.simulate("Random", None, None, NUM_SERVERS, 60, 2, 2, 4, total_intervals=INTERVALS)
+
+
+class TracingTest(unittest.TestCase):
+    def tearDown(self):
+        tracing.configure(tracing.OFF)
+
+    def test_traced_run(self):
+        expected = run().summary()
+        sink = tracing.RingBufferSink()
+        tracing.configure(tracing.DEBUG, [sink])
+        self.assertEqual(run().summary(), expected)
+
+        events = [record[2] for record in sink.records]
+        self.assertEqual(events.count(tracing.ASSIGN), NUM_SERVERS * INTERVALS)
+        self.assertEqual(events.count(tracing.SERVER_STATUS), NUM_SERVERS * INTERVALS)
+        self.assertEqual(events.count(tracing.INTERVAL_END), INTERVALS)
+        times = [record[0] for record in sink.records]
+        self.assertEqual(times, sorted(times))
+
+    def test_level_and_sampling(self):
+        sink = tracing.RingBufferSink()
+        tracer = tracing.configure(tracing.INFO, [sink], sample_every=3)
+        for i in range(9):
+            tracer.emit(tracing.DEBUG, tracing.ASSIGN, i, 0)  # Below the level
+            tracer.emit(tracing.WARNING, tracing.UNASSIGNED_CHUNK, i)
+        self.assertEqual([record[3] for record in sink.records], [2, 5, 8])
+
+        small = tracing.RingBufferSink(capacity=2)
+        tracer = tracing.configure(tracing.DEBUG, [small])
+        for i in range(5):
+            tracer.emit(tracing.INFO, tracing.INTERVAL_END, i, 0)
+        self.assertEqual([record[3] for record in small.records], [3, 4])
+
+    def test_binary_and_print_sinks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            tracer = tracing.configure(tracing.DEBUG, [tracing.BinaryFileSink(path)])
+            tracer.emit(tracing.DEBUG, tracing.ASSIGN, 7, 3)
+            tracer.emit(tracing.INFO, tracing.INTERVAL_END, 1, -2)
+            tracing.configure(tracing.OFF)  # Closes the file
+            records = list(tracing.read_trace(path))
+        self.assertEqual([record[1:] for record in records],
+                         [(tracing.DEBUG, tracing.ASSIGN, 7, 3), (tracing.INFO, tracing.INTERVAL_END, 1, -2)])
+
+        out = io.StringIO()
+        tracer = tracing.configure(tracing.DEBUG, [tracing.PrintSink()])
+        with contextlib.redirect_stdout(out):
+            tracer.emit(tracing.DEBUG, tracing.ASSIGN, 7, 3)
+        self.assertTrue(out.getvalue().rstrip().endswith("DEBUG assign 7 3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
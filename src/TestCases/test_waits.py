@@ -0,0 +1,87 @@
+"""
+Per-request waits: LogHistogram is exact for small values and within its resolution above, merging equals
+adding both, and servers record how many time steps each processed request waited.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import math
+import random
+import unittest
+
+import server as se
+import simulation
+from streaming_metrics import LogHistogram, MetricsCollector
+
+
+def nearest_rank(values, p):
+    values = sorted(values)
+    return values[max(1, math.ceil(len(values) * p / 100)) - 1]
+
+
+class LogHistogramTest(unittest.TestCase):
+    def test_small_values_are_exact(self):
+        rng = random.Random(1)
+        values = [rng.randrange(16) for _ in range(500)]
+        histogram = LogHistogram()
+        for value in values:
+            histogram.add(value)
+        for p in [1, 50, 90, 99, 100]:
+            self.assertEqual(histogram.percentile(p), nearest_rank(values, p), p)
+        self.assertAlmostEqual(histogram.mean(), sum(values) / len(values))
+        self.assertEqual(LogHistogram().percentile(50), 0)
+        self.assertEqual(LogHistogram().mean(), 0.0)
+
+    def test_resolution(self):
+        rng = random.Random(2)
+        values = [int(rng.lognormvariate(8, 2)) for _ in range(5000)]
+        histogram = LogHistogram()
+        for value in values:
+            histogram.add(value)
+        for p in [50, 90, 99, 99.9]:
+            exact = nearest_rank(values, p)
+            self.assertGreaterEqual(histogram.percentile(p), exact, p)
+            self.assertLessEqual(histogram.percentile(p), exact * 1.125, p)
+        self.assertAlmostEqual(histogram.mean(), sum(values) / len(values), delta=0.07 * sum(values) / len(values))
+
+        # Values beyond max_bits share the last bucket
+        small = LogHistogram(precision=1, max_bits=4)
+        small.add(1000, count=3)
+        self.assertEqual((len(small.counts), small.total), (small.buckets, 3))
+
+    def test_merge(self):
+        first, second, both = LogHistogram(), LogHistogram(), LogHistogram()
+        for value in range(0, 3000, 7):
+            (first if value % 2 else second).add(value)
+            both.add(value)
+        first.merge(second)
+        self.assertEqual((list(first.counts), first.total), (list(both.counts), both.total))
+        with self.assertRaises(ValueError):
+            first.merge(LogHistogram(precision=4))
+
+
+class ServerWaitsTest(unittest.TestCase):
+    def test_server_records_waits(self):
+        server = se.Server(processing_rate=1, max_queue_size=8)
+        for chunk_id in range(3):
+            server.add_request(chunk_id)
+        for _ in range(3):
+            server.process_request()
+        server.add_request(3)  # Enqueued at time step 3 and processed in it
+        server.process_request()
+        self.assertEqual(server.waits.total, 4)
+        self.assertEqual([server.waits.percentile(p) for p in (25, 50, 75, 100)], [0, 0, 1, 2])
+        self.assertEqual(server.waits.mean(), 3 / 4)
+
+    def test_simulation_reports_waits(self):
+        random.seed(3)
+        collector = MetricsCollector()
+        metrics = simulation.simulate("Random", None, None, 32, 200, 2, 2, 4, total_intervals=30, collector=collector)
+        self.assertGreater(collector.waits.total, 0)
+        self.assertLessEqual(collector.waits.total, metrics["accepted"])
+        summary = collector.summary()
+        self.assertLessEqual(summary["p50_wait"], summary["p99_wait"])
+        self.assertLessEqual(summary["p999_wait"], 4 // 2 + 1)  # A full queue of q drains in q / g steps
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Work stealing: the replica-neighbour index pairs servers sharing chunks (most shared first), idle servers take
+only requests for chunks they hold, oldest first and up to their spare slots, from their most loaded peers,
+and stealing in a simulation processes more requests without losing any.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import random
+import unittest
+
+import numpy as np
+
+import server as se
+import simulation
+import work_stealing as ws
+from cluster import Cluster
+from placement import Placement
+
+# Server 0 shares chunks 0 and 1 with server 1 and chunk 2 with server 2; server 3 shares nothing
+MAPPING = {0: [0, 1], 1: [1, 0], 2: [0, 2], 3: [1], 4: [3]}
+
+
+def cluster(g=2, q=8):
+    servers, _ = se.Init_Servers_with_chunk_mapping(5, 4, g, 2, q, MAPPING)
+    return Cluster(servers, MAPPING)
+
+
+class WorkStealingTest(unittest.TestCase):
+    def test_replica_neighbours(self):
+        placement = Placement.from_mapping(MAPPING, 4)
+        indptr, indices, shared = ws.replica_neighbours(placement.indptr, placement.indices, 4)
+        neighbours = {s: indices[indptr[s]:indptr[s + 1]].tolist() for s in range(4)}
+        self.assertEqual(neighbours, {0: [1, 2], 1: [0], 2: [0], 3: []})
+        self.assertEqual(shared[indptr[0]:indptr[1]].tolist(), [2, 1])
+
+        # A chunk listing a server twice does not make it its own neighbour
+        indptr, indices, _ = ws.replica_neighbours(np.array([0, 2]), np.array([3, 3]), 4)
+        self.assertEqual(indices.tolist(), [])
+
+    def test_steal(self):
+        servers = cluster()
+        victim = servers[1]
+        for chunk_id in [3, 0, 3, 1, 0]:
+            victim.add_request(chunk_id)
+        thief = servers[0]
+        thief.process_request()
+        victim.process_request()  # Serves 3 and 0, leaving 3, 1, 0
+
+        stealer = ws.WorkStealer(servers)
+        self.assertEqual(list(stealer.neighbours(0)), [1, 2])
+        self.assertEqual(stealer.steal([(thief, 2)], [1]), 2)
+        self.assertEqual(list(victim.queue), [3])  # Server 0 holds no replica of chunk 3
+        self.assertEqual((stealer.stolen, thief.waits.total), (2, 2))
+
+        self.assertEqual(stealer.steal([(servers[3], 2)], [1]), 0)  # No shared chunk
+        self.assertEqual(stealer.steal([], [1]), 0)
+
+    def test_most_loaded_peer_first(self):
+        servers = cluster(g=1)
+        for _ in range(2):
+            servers[1].add_request(0)
+        for _ in range(4):
+            servers[2].add_request(2)
+        for server in servers:
+            server.process_request()
+        stealer = ws.WorkStealer(servers, min_backlog=2)
+        self.assertEqual(stealer.steal([(servers[0], 2)], [1, 2]), 2)
+        self.assertEqual((len(servers[1].queue), len(servers[2].queue)), (1, 1))
+
+        stealer = ws.WorkStealer(servers, max_peers=1)  # Server 1 only
+        self.assertEqual(list(stealer.neighbours(0)), [1])
+        self.assertEqual(stealer.steal([(servers[0], 2)], [1, 2]), 1)
+        self.assertEqual((len(servers[1].queue), len(servers[2].queue)), (0, 1))
+
+    def test_simulation(self):
+        def run(steal):
+            random.seed(6)
+            return simulation.simulate("Random", None, None, 64, 300, 2, 2, 4, total_intervals=40, steal=steal)
+
+        plain, stolen = run(False), run(True)
+        self.assertGreater(stolen.summary()["stolen"], 0)
+        self.assertLess(stolen["rejected"], plain["rejected"])
+        self.assertEqual(stolen["accepted"] + stolen["rejected"], 64 * 40)
+        with self.assertRaises(ValueError):
+            simulation.simulate("Random", None, None, 64, 300, total_intervals=1, Engine="Vectorized", steal=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
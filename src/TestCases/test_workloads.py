@@ -0,0 +1,103 @@
+"""
+Workloads: streams are reproducible for a seed, Zipf and hot spots skew requests as configured, the
+composition helpers keep sizes and order, a recorded stream replays unchanged, and a simulation ends with
+its workload.
+
+    cd src && python -m unittest TestCases/test_*.py
+"""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import simulation
+import workloads
+from TestCases import scenarios
+
+
+def batches(stream, count):
+    return list(workloads.take(stream, count))
+
+
+class WorkloadsTest(unittest.TestCase):
+    def assertSameBatches(self, first, second):
+        self.assertEqual(len(first), len(second))
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+
+    def test_seed_reproduces_the_stream(self):
+        for make in [lambda seed: workloads.uniform(100, 32, seed=seed),
+                     lambda seed: workloads.zipf(100, 32, s=1.1, seed=seed),
+                     lambda seed: workloads.hotspot(100, 32, 5, seed=seed)]:
+            self.assertSameBatches(batches(make(7), 5), batches(make(7), 5))
+            self.assertFalse(np.array_equal(np.concatenate(batches(make(7), 5)), np.concatenate(batches(make(8), 5))))
+
+        # A shared Generator is drawn from, not reseeded
+        rng = np.random.default_rng(1)
+        self.assertSameBatches(batches(workloads.uniform(100, 8, seed=rng), 2),
+                               batches(workloads.uniform(100, 8, seed=np.random.default_rng(1)), 2))
+
+    def test_zipf(self):
+        requests = np.concatenate(batches(workloads.zipf(50, 1000, s=1.5, seed=2, shuffle=False), 20))
+        self.assertTrue(((requests >= 0) & (requests < 50)).all())
+        counts = np.bincount(requests, minlength=50)
+        expected = 1.0 / np.arange(1, 51) ** 1.5
+        expected /= expected.sum()
+        self.assertAlmostEqual(counts[0] / len(requests), expected[0], delta=0.01)
+        self.assertGreater(counts[0], counts[1])
+        self.assertGreater(counts[1], counts[10])
+
+    def test_hotspot_moves(self):
+        stream = workloads.hotspot(100, 1000, hot_chunks=5, hot_fraction=0.9, period=2, seed=3)
+        for window in [range(0, 5), range(0, 5), range(5, 10), range(5, 10), range(10, 15)]:
+            batch = next(stream)
+            self.assertGreater(np.isin(batch, list(window)).mean(), 0.85)
+
+    def test_reappearance(self):
+        chunks = scenarios.load_workload("reap_dep_CTMmap5_SEVERE")
+        stream = workloads.reappearance("reap_dep_CTMmap5_SEVERE")
+        for batch in batches(stream, 2):
+            self.assertEqual(batch.tolist(), list(chunks))
+
+        drawn = np.concatenate(batches(workloads.reappearance([3, 9], batch_size=10, seed=4), 3))
+        self.assertEqual(len(drawn), 30)
+        self.assertEqual(set(drawn.tolist()), {3, 9})
+
+    def test_composition(self):
+        self.assertEqual([len(batch) for batch in workloads.limit(workloads.uniform(10, 4, seed=0), 10)], [4, 4, 2])
+        self.assertEqual(list(workloads.limit(workloads.uniform(10, 4, seed=0), 0)), [])
+
+        phased = list(workloads.phases((workloads.reappearance([1]), 2), (workloads.reappearance([2]), 1)))
+        self.assertEqual([batch.tolist() for batch in phased], [[1], [1], [2]])
+
+        joined = next(workloads.concat(workloads.reappearance([1, 2]), workloads.reappearance([3])))
+        self.assertEqual(joined.tolist(), [1, 2, 3])
+
+        mixed = next(workloads.mix([workloads.reappearance([0] * 1000), workloads.reappearance([1] * 1000)],
+                                   [0.75, 0.25], seed=5))
+        self.assertEqual(len(mixed), 1000)
+        self.assertAlmostEqual(mixed.mean(), 0.25, delta=0.05)
+
+    def test_record_and_replay(self):
+        recorded = batches(workloads.zipf(1000, 64, seed=6), 5)
+        with tempfile.TemporaryDirectory() as directory:
+            raw = os.path.join(directory, "requests.bin")
+            self.assertEqual(workloads.record(iter(recorded), raw, 5), 5 * 64)
+            self.assertSameBatches(list(workloads.replay(raw, 64)), recorded)
+
+            npy = os.path.join(directory, "requests.npy")
+            np.save(npy, np.concatenate(recorded))
+            replayed = list(workloads.replay(npy, 100))
+        self.assertEqual([len(batch) for batch in replayed], [100, 100, 100, 20])
+        np.testing.assert_array_equal(np.concatenate(replayed), np.concatenate(recorded))
+
+    def test_simulation_ends_with_the_workload(self):
+        workload = workloads.take(workloads.uniform(300, 64, seed=7), 10)
+        metrics = simulation.simulate("Greedy", None, None, 64, 300, 2, 2, 4, total_intervals=50, workload=workload)
+        self.assertEqual(metrics["accepted"] + metrics["rejected"], 10 * 64)
+        self.assertEqual(len(metrics["rejections_by_interval"]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Automatic search for adversarial reappearance workloads.
+
+The reappearance lists of TestCases (list_1 ... list_27 in TestingArena, the reap_dep_* scenarios) were
+put together by hand from the chunks stored on a few servers. This module finds such workloads for any
+placement, using the server -> chunk index of placement.Placement so that only the chunks touching the
+servers under attack are read.
+
+A request for chunk c is forced into a server set S with some weight, depending on the strategy:
+
+    Random          |replicas(c) & S| / |replicas(c)|, the chance that the random replica lies in S
+    Greedy, Cuckoo  1 if every replica of c is in S, else 0 (a least-loaded choice escapes S whenever it can;
+                    Cuckoo routes a chunk's first request of a phase as Greedy)
+
+With a budget of batch_size requests per interval, each chunk requested at most `multiplicity` times, the
+adversary requests the chunks of largest weight. The forced load is the sum of their weights and the
+overload of S is forced load - g * |S|: once it is positive S cannot keep up, its queues fill after about
+q * |S| / overload intervals and every interval after that rejects about `overload` requests.
+
+find_hot_set looks for the S of largest overload by peeling the replica hypergraph (servers are vertices,
+chunks hyperedges): starting from all servers, repeatedly drop the fraction eps of servers that carry the
+least weight, scoring every intermediate set. Each pass is a few vectorized operations over the replicas
+still alive, so placements with millions of chunks take seconds.
+
+    hot = adversary_finder.find_hot_set(placement, "Greedy", g=4)
+    simulation.simulate("Greedy", placement, hot["requests"].tolist(), ...)
+"""
+import argparse
+
+import numpy as np
+
+import placement_store
+from placement import Placement
+from TestCases import scenarios
+
+STRATEGIES = ["Random", "Greedy", "Cuckoo"]
+
+
+def as_placement(mapping, num_servers=None):
+    """
+    Returns a Placement for a chunk-to-server dictionary, a Placement, a placement file (".placement") or the
+    name of a registered placement scenario.
+
+    :param num_servers: Number of servers (default: from the scenario metadata, else the largest server ID + 1).
+    """
+    if isinstance(mapping, Placement):
+        return mapping
+    if isinstance(mapping, str) and mapping.endswith(".placement"):
+        return placement_store.open_placement(mapping)
+    if isinstance(mapping, str):
+        indptr, indices = scenarios.load_placement_arrays(mapping)
+        indptr, indices = np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int32)
+        if num_servers is None:
+            num_servers = scenarios.info(mapping).get("num_servers", int(indices.max(initial=-1)) + 1)
+        return Placement(indptr, indices, num_servers)
+    if num_servers is None:
+        num_servers = max((max(assigned) for assigned in mapping.values() if assigned), default=-1) + 1
+    return Placement.from_mapping(mapping, num_servers)
+
+
+def _ranges(starts, lengths):
+    """
+    Concatenation of range(start, start + length) for every pair, without a Python loop.
+    """
+    ends = np.cumsum(lengths)
+    return np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if ends.size else 0)
+
+
+def _chunks_on(placement, servers):
+    """
+    Distinct chunks with a replica on one of `servers`, read from the server -> chunk index.
+    """
+    starts, ends = placement.server_indptr[servers], placement.server_indptr[np.asarray(servers) + 1]
+    return np.unique(placement.server_indices[_ranges(starts, ends - starts)]).astype(np.int64)
+
+
+def _replicas(placement, chunks):
+    """
+    Replica arrays of the given chunks: (row, server) of every replica, row being the position in `chunks`.
+    """
+    counts = placement.indptr[chunks + 1] - placement.indptr[chunks]
+    rows = np.repeat(np.arange(chunks.size), counts)
+    return rows, placement.indices[_ranges(placement.indptr[chunks], counts)].astype(np.int64), counts
+
+
+def capture_weights(placement, servers, strategy="Greedy"):
+    """
+    Weights with which requests are forced into a server set (see the module notes).
+
+    :param servers: Server IDs of the set.
+    :return: (chunks, weights): every chunk with a replica in the set and its weight.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy}")
+    placement = as_placement(placement)
+    servers = np.unique(np.asarray(servers, dtype=np.int64))
+    inside = np.zeros(placement.num_servers, dtype=bool)
+    inside[servers] = True
+
+    chunks = _chunks_on(placement, servers)
+    rows, replica_servers, counts = _replicas(placement, chunks)
+    hits = np.bincount(rows, weights=inside[replica_servers], minlength=chunks.size)
+    if strategy == "Random":
+        return chunks, hits / counts
+    return chunks, (hits == counts).astype(np.float64)
+
+
+def _forced_load(weights, batch_size, multiplicity):
+    """
+    Largest total weight of batch_size requests, each chunk requested at most `multiplicity` times (None: no limit).
+    """
+    if weights.size == 0 or batch_size <= 0:
+        return 0.0
+    if multiplicity is None:
+        return float(batch_size * weights.max())
+    full, rest = divmod(batch_size, multiplicity)
+    top = min(full + 1, weights.size)
+    best = np.sort(np.partition(weights, weights.size - top)[weights.size - top:])[::-1]
+    return float(multiplicity * best[:full].sum() + (rest * best[full] if full < best.size else 0.0))
+
+
+def attack(placement, servers, strategy="Greedy", batch_size=None, multiplicity=1):
+    """
+    One interval of requests that forces as much load as possible into a server set.
+
+    :param servers: Server IDs under attack.
+    :param batch_size: Requests per interval (default: number of servers, as in the simulations).
+    :param multiplicity: Times a chunk may be requested per interval (None: no limit, the best chunk is
+                         requested batch_size times).
+    :return: int64 array of chunk IDs, highest weight first; shorter than batch_size if fewer chunks can
+             put load on the set.
+    """
+    placement = as_placement(placement)
+    batch_size = placement.num_servers if batch_size is None else batch_size
+    chunks, weights = capture_weights(placement, servers, strategy)
+    useful = weights > 0
+    chunks, weights = chunks[useful], weights[useful]
+    if chunks.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.lexsort((chunks, -weights))
+    if multiplicity is None:
+        return np.full(batch_size, chunks[order[0]], dtype=np.int64)
+    return np.repeat(chunks[order], multiplicity)[:batch_size]
+
+
+def find_hot_set(placement, strategy="Greedy", g=2, batch_size=None, multiplicity=1, within=None, eps=0.1):
+    """
+    Searches for the server set with the largest overload (see the module notes) by peeling.
+
+    :param placement: Placement, chunk-to-server dictionary, placement file or scenario name (see as_placement).
+    :param g: Processing rate of every server.
+    :param batch_size: Requests per interval (default: number of servers, as in the simulations).
+    :param multiplicity: Times a chunk may be requested per interval (None: no limit).
+    :param within: Server IDs to search in (default: all); only chunks with a replica there are read.
+    :param eps: Fraction of the remaining servers dropped per pass; smaller is slower but finer.
+    :return: Dictionary with the "servers" of the set, the attacking "requests" of one interval (see attack),
+             and its "forced" load, "capacity" (g * |S|) and "overload" per interval.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy}")
+    placement = as_placement(placement)
+    m = placement.num_servers
+    batch_size = m if batch_size is None else batch_size
+
+    alive = np.zeros(m, dtype=bool)
+    if within is None:
+        alive[:] = True
+        chunks = np.arange(placement.num_chunks, dtype=np.int64)
+    else:
+        alive[np.asarray(within, dtype=np.int64)] = True
+        chunks = _chunks_on(placement, np.flatnonzero(alive))
+    rows, servers, counts = _replicas(placement, chunks)
+
+    # Only replicas that still carry weight are kept: for Greedy and Cuckoo the replicas of chunks lying
+    # entirely in the set, for Random every replica in the set (worth 1 / replicas of its chunk)
+    if strategy == "Random":
+        keep = alive[servers]
+        rows, servers, weights = rows[keep], servers[keep], 1.0 / counts[rows[keep]]
+    else:
+        outside = np.bincount(rows, weights=~alive[servers], minlength=chunks.size) > 0
+        keep = ~outside[rows]
+        rows, servers, weights = rows[keep], servers[keep], np.ones(np.count_nonzero(keep))
+
+    best_overload, best_servers = -np.inf, np.zeros(0, dtype=np.int64)
+    size = int(np.count_nonzero(alive))
+    while size and rows.size:
+        chunk_weights = np.bincount(rows, weights=weights, minlength=chunks.size)
+        if strategy != "Random":
+            chunk_weights = np.minimum(chunk_weights, 1.0)  # One per chunk, not per replica
+        overload = _forced_load(chunk_weights[chunk_weights > 0], batch_size, multiplicity) - g * size
+        if overload > best_overload:
+            best_overload, best_servers = overload, np.flatnonzero(alive)
+
+        # Drop the servers carrying the least weight, then the replicas they take down with them
+        candidates = np.flatnonzero(alive)
+        degree = np.bincount(servers, weights=weights, minlength=m)[candidates]
+        k = max(1, int(eps * size))
+        dropped = candidates[np.argpartition(degree, k - 1)[:k]] if k < size else candidates
+        alive[dropped] = False
+        size -= dropped.size
+        if strategy == "Random":
+            keep = alive[servers]
+        else:
+            dead = np.zeros(chunks.size, dtype=bool)
+            dead[rows[~alive[servers]]] = True
+            keep = ~dead[rows]
+        rows, servers, weights = rows[keep], servers[keep], weights[keep]
+
+    requests = attack(placement, best_servers, strategy, batch_size, multiplicity)
+    forced = 0.0
+    if requests.size:
+        chunks, weights = capture_weights(placement, best_servers, strategy)  # chunks are sorted
+        forced = float(weights[np.searchsorted(chunks, requests)].sum())
+    return {"servers": best_servers, "requests": requests, "forced": forced, "capacity": g * best_servers.size,
+            "overload": forced - g * best_servers.size}
+
+
+def worst_case_workload(placement, strategy="Greedy", g=2, batch_size=None, multiplicity=1, eps=0.1):
+    """
+    Reappearance workload (one interval of requests, repeated every interval) attacking the hottest server set,
+    usable as simulate's reappearance_chunks_list or with workloads.reappearance.
+    """
+    return find_hot_set(placement, strategy, g, batch_size, multiplicity, eps=eps)["requests"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find a worst-case reappearance workload for a placement.")
+    parser.add_argument("placement", help="placement scenario name or .placement file")
+    parser.add_argument("--strategy", default="Greedy", choices=STRATEGIES)
+    parser.add_argument("--g", type=int, default=2, help="processing rate of every server")
+    parser.add_argument("--batch-size", type=int, default=None, help="requests per interval (default: servers)")
+    parser.add_argument("--multiplicity", type=int, default=1, help="times a chunk may be requested per interval")
+    parser.add_argument("--eps", type=float, default=0.1, help="fraction of servers dropped per peeling pass")
+    parser.add_argument("--out", default=None, help="write the workload to this scenario file")
+    args = parser.parse_args()
+
+    hot = find_hot_set(args.placement, args.strategy, args.g, args.batch_size, args.multiplicity, eps=args.eps)
+    print(f"{hot['servers'].size} servers, {hot['requests'].size} requests, forced load {hot['forced']:.1f}, "
+          f"capacity {hot['capacity']}, overload {hot['overload']:.1f} per interval")
+    if args.out:
+        scenarios.write_workload(args.out, hot["requests"].tolist())
+        print(f"Workload written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Benchmark suite: runs every strategy against the shipped scenarios and synthetic scaled-up clusters,
+reports requests/second, intervals/second and peak traced memory, and compares against stored baselines.
+
+    python benchmark.py                       # run and compare against benchmark_baseline.json
+    python benchmark.py --save-baseline       # run and store the results as the new baseline
+    python benchmark.py --filter CTMmap5      # only cases whose name contains CTMmap5
+
+Every case is timed `--repeats` times and its median is kept, so one lucky or unlucky run neither sets the
+baseline nor trips the comparison; baselines are saved, and regressions flagged, only from at least
+MIN_REPEATS repeats. Throughput is compared as a ratio to the REFERENCE case of the same run (which always
+runs, whatever the filter), so a baseline saved on one machine carries over to another; peak memory is
+compared as is. Exits with status 1 if any case is slower (or uses more memory) than its baseline beyond
+the tolerance.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import chunk_assignment as ca
+import simulation
+from TestCases import scenarios
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+STRATEGIES = ["Random", "Greedy", "Cuckoo"]
+MIN_REPEATS = 3  # Fewer timed runs per case are too noisy to save as a baseline or to flag a regression
+# Case every throughput is divided by, so results compare across machines
+REFERENCE = "Random/CTMmap5/reap_dep_CTMmap5_SEVERE"
+
+# (placement, workload) pairs; None requests num_servers uniformly random chunks per interval
+SCENARIO_CASES = [
+    ("CTMmap1", None),
+    ("CTMmap2", None),
+    ("CTMmap3", None),
+    ("CTMmap4", "reap_dep_CTMmap4"),
+    ("CTMmap5", "reap_dep_CTMmap5_Light"),
+    ("CTMmap5", "reap_dep_CTMmap5_MILD"),
+    ("CTMmap5", "reap_dep_CTMmap5_SEVERE"),
+    ("CTMmap5", "reap_dep_CTMmap6_Greedy_Vul"),
+]
+
+# Synthetic random placements: (num_servers, num_chunks, d, g, q, intervals, engines)
+SYNTHETIC_CASES = [
+    (4096, 16000, 2, 4, 12, 20, ["Object"]),
+    (100000, 400000, 2, 4, 17, 5, ["Vectorized"]),
+]
+
+
+def benchmark_cases(scenario_intervals=300):
+    """
+    Returns the list of benchmark cases, each a dictionary of simulate() keyword arguments plus a name.
+    """
+    cases = []
+    for Type in STRATEGIES:
+        for placement, workload in SCENARIO_CASES:
+            meta = scenarios.info(placement)
+            cases.append({
+                "name": f"{Type}/{placement}/{workload or 'uniform'}",
+                "Type": Type,
+                "mapping": placement,
+                "workload": workload,
+                "num_servers": meta["num_servers"],
+                "num_chunks": meta["num_chunks"],
+                "d": meta["d"],
+                "g": meta["g"],
+                "q": meta["q"],
+                "total_intervals": scenario_intervals,
+                "Engine": "Object",
+            })
+
+        for num_servers, num_chunks, d, g, q, intervals, engines in SYNTHETIC_CASES:
+            for Engine in engines:
+                if Engine == "Vectorized" and Type == "Cuckoo":
+                    continue
+                cases.append({
+                    "name": f"{Type}/synthetic-{num_servers}x{num_chunks}-d{d}/uniform/{Engine}",
+                    "Type": Type,
+                    "mapping": None,
+                    "workload": None,
+                    "num_servers": num_servers,
+                    "num_chunks": num_chunks,
+                    "d": d,
+                    "g": g,
+                    "q": q,
+                    "total_intervals": intervals,
+                    "Engine": Engine,
+                })
+    return cases
+
+
+def _simulate(case):
+    random.seed(0)
+    chunk_to_servers = scenarios.load_placement(case["mapping"]) if case["mapping"] else None
+    if chunk_to_servers is None:
+        chunk_to_servers = ca.generate_chunk_to_servers_mapping(case["num_chunks"], case["num_servers"], case["d"])
+    workload = scenarios.load_workload(case["workload"]) if case["workload"] else None
+
+    start = time.perf_counter()
+    metrics = simulation.simulate(case["Type"], chunk_to_servers, workload, case["num_servers"], case["num_chunks"],
+                                  case["d"], case["g"], case["q"], 3, case["total_intervals"], case["Engine"])
+    return time.perf_counter() - start, metrics
+
+
+def run_case(case, repeats=3, memory=True):
+    """
+    Times a case (median of `repeats`, after one untimed run) and optionally measures its peak traced memory in one more run.
+
+    :return: Dictionary with requests_per_s, intervals_per_s, peak_kib (None if not measured) and repeats.
+    """
+    _simulate(case)  # Warm-up: scenario loading and first-call costs are not timed
+    times, requests = [], 0
+    for _ in range(repeats):
+        seconds, metrics = _simulate(case)
+        requests = metrics.accepted + metrics.rejected
+        times.append(seconds)
+    median = statistics.median(times)
+
+    peak_kib = None
+    if memory:
+        tracemalloc.start()
+        _simulate(case)
+        peak_kib = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+
+    return {
+        "requests_per_s": requests / median,
+        "intervals_per_s": case["total_intervals"] / median,
+        "peak_kib": peak_kib,
+        "repeats": repeats,
+    }
+
+
+def add_relative_speed(results):
+    """
+    Sets every result's relative_speed: its requests/second divided by those of the REFERENCE case.
+    """
+    reference = results[REFERENCE]["requests_per_s"]
+    for result in results.values():
+        result["relative_speed"] = result["requests_per_s"] / reference
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of (name, message) for every case that regressed beyond `tolerance` (a fraction).
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None or reference.get("repeats", 0) < MIN_REPEATS or name == REFERENCE:
+            continue  # No baseline, one too noisy to compare against, or the yardstick itself
+        if "relative_speed" in reference and result["relative_speed"] < reference["relative_speed"] * (1 - tolerance):
+            regressions.append((name, f"speed {result['relative_speed']:.3f} x {REFERENCE} < baseline "
+                                      f"{reference['relative_speed']:.3f}"))
+        if result["peak_kib"] is not None and reference.get("peak_kib") is not None \
+                and result["peak_kib"] > reference["peak_kib"] * (1 + tolerance):
+            regressions.append((name, f"peak {result['peak_kib']} KiB > baseline {reference['peak_kib']} KiB"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the routing strategies.")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per case (the median is kept)")
+    parser.add_argument("--intervals", type=int, default=300, help="intervals per scenario case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = parser.parse_args(argv)
+    if args.save_baseline and args.repeats < MIN_REPEATS:
+        parser.error(f"a baseline needs at least {MIN_REPEATS} repeats per case")
+
+    results = {}
+    print(f"{'case':64} {'req/s':>12} {'intervals/s':>12} {'peak KiB':>10}")
+    for case in benchmark_cases(args.intervals):
+        if args.filter not in case["name"] and case["name"] != REFERENCE:
+            continue
+        result = run_case(case, args.repeats, not args.no_memory)
+        results[case["name"]] = result
+        peak = "-" if result["peak_kib"] is None else result["peak_kib"]
+        print(f"{case['name']:64} {result['requests_per_s']:12.0f} {result['intervals_per_s']:12.1f} {peak:>10}")
+    add_relative_speed(results)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Only what carries across machines: no absolute throughput
+        baseline.update((name, {key: result[key] for key in ("relative_speed", "peak_kib", "repeats")})
+                        for name, result in results.items())
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline)")
+        return 0
+    if args.repeats < MIN_REPEATS:
+        print(f"Not comparing against the baseline: {args.repeats} repeats per case, at least {MIN_REPEATS} needed")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for name, message in regressions:
+        print(f"REGRESSION {name}: {message}")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
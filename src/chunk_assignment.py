@@ -1,39 +1,253 @@
 import random
+from array import array
+
+from cluster import as_cluster
+from tracing import tracer, DEBUG, INFO, WARNING, ASSIGN, ADVERSARY_SEND, FLUSH_HISTORY, UNASSIGNED_CHUNK, OVERLOADED_CHUNKS
 
 # Assuming the Server class is already defined
 
-def assign_chunk_to_random_server(chunk_id, chunk_to_servers, servers):
+def choose_random_server(cluster, chunk_id, rng=random):
+    """
+    Random strategy decision: one of the chunk's replica servers, chosen uniformly.
+
+    :param cluster: Cluster holding the servers and the chunk-to-replica index.
+    :param rng: Source of randomness (the `random` module or a random.Random instance).
+    :return: The chosen server, or None if the chunk has no replica.
+    """
+    servers_for_chunk = cluster.replica_servers(chunk_id)
+    if not servers_for_chunk:
+        return None
+    return rng.choice(servers_for_chunk)
+
+
+def choose_greedy_server(cluster, chunk_id):
+    """
+    Greedy strategy decision: the first of the chunk's replica servers with the shortest queue.
+
+    :return: The chosen server, or None if the chunk has no replica.
+    """
+    valid_servers = cluster.replica_servers(chunk_id)
+    if not valid_servers:
+        return None
+    return min(valid_servers, key=lambda s: s.get_queue_status())
+
+
+class LoadSnapshot:
+    """
+    Cached queue lengths of every server, as a router that pays a round trip per load query would see them.
+    The cache is refreshed (one query per server) every `every_requests` routing decisions and/or every
+    `every_intervals` intervals, so decisions are made on loads at most that old.
+    """
+
+    __slots__ = ("cluster", "every_requests", "every_intervals", "count_own", "loads", "refreshes",
+                 "_requests", "_intervals")
+
+    def __init__(self, cluster, every_requests=0, every_intervals=1, count_own=False):
+        """
+        :param cluster: Cluster whose server loads are cached.
+        :param every_requests: Refresh before a decision once this many were made on the snapshot (0: never).
+        :param every_intervals: Refresh at the end of every this many intervals (0: never).
+        :param count_own: Add the router's own accepted requests to the cached loads (known without a query).
+        """
+        if every_requests <= 0 and every_intervals <= 0:
+            raise ValueError("A load snapshot needs every_requests or every_intervals")
+        self.cluster = cluster
+        self.every_requests = every_requests
+        self.every_intervals = every_intervals
+        self.count_own = count_own
+        self.loads = array('q', [0]) * (max((server.server_id for server in cluster), default=-1) + 1)
+        self.refreshes = 0  # Snapshots taken, i.e. load queries / number of servers
+        self.refresh()
+
+    def refresh(self):
+        loads = self.loads
+        for server in self.cluster:
+            loads[server.server_id] = server.get_queue_status()
+        self.refreshes += 1
+        self._requests = 0
+        self._intervals = 0
+
+    def end_interval(self):
+        """
+        Call once per interval, after the servers processed their queues.
+        """
+        self._intervals += 1
+        if self.every_intervals and self._intervals >= self.every_intervals:
+            self.refresh()
+
+    def choose(self, chunk_id):
+        """
+        Stale Greedy decision: the first of the chunk's replica servers with the shortest cached queue.
+
+        :return: The chosen server, or None if the chunk has no replica.
+        """
+        if self.every_requests and self._requests >= self.every_requests:
+            self.refresh()
+        self._requests += 1
+        valid_servers = self.cluster.replica_servers(chunk_id)
+        if not valid_servers:
+            return None
+        loads = self.loads
+        return min(valid_servers, key=lambda s: loads[s.server_id])
+
+    def admitted(self, server):
+        """
+        Records that the router's request was accepted by `server` (only counted with count_own).
+        """
+        if self.count_own:
+            self.loads[server.server_id] += 1
+
+
+def assign_chunk_to_random_server(chunk_id, chunk_to_servers, servers, recorder=None):
     """
     Assigns a given chunk to a randomly selected server from the list of servers assigned to it.
     
     :param chunk_id: The chunk ID to be assigned to a server.
     :param chunk_to_servers: Dictionary mapping chunk IDs to lists of server IDs.
-    :param servers: List of Server objects.
+    :param servers: Cluster (O(d) lookup) or list of Server objects (indexed on every call, see cluster.as_cluster).
+    :param recorder: Optional replay.TraceRecorder that records the decision.
     """
-    # Get the list of servers that the chunk is assigned to
-    servers_for_chunk = chunk_to_servers.get(chunk_id, [])
+    cluster = as_cluster(servers, chunk_to_servers)
+
+    # Randomly select a server from the servers already assigned this chunk
+    random_server = choose_random_server(cluster, chunk_id)
     
     # If there are no servers assigned, return early
-    if len(servers_for_chunk) == 0:
-        print(f"Chunk {chunk_id} is not assigned to any server yet.")
+    if random_server is None:
+        if tracer.level <= WARNING:
+            tracer.emit(WARNING, UNASSIGNED_CHUNK, chunk_id)
+        if recorder is not None:
+            recorder.record(chunk_id, -1, False)
         return
     
-    # Randomly select a server from the servers already assigned this chunk
-    random_server_id = random.choice(servers_for_chunk)
-    
     # Add the chunk to this randomly selected server
-    print(f"Assigning Chunk {chunk_id} to Server {random_server_id}.")
+    if tracer.level <= DEBUG:
+        tracer.emit(DEBUG, ASSIGN, chunk_id, random_server.server_id)
     
-    # Add the chunk to the server's queue if it's not already there
-    for server in servers:
-        if server.server_id == random_server_id:
-            if server.add_request(chunk_id):
-                return True
-            else:
-                return False
+    # Add the chunk to the server's queue if there is space
+    success = random_server.add_request(chunk_id)
+    if recorder is not None:
+        recorder.record(chunk_id, random_server.server_id, success)
+    return success
 
     
 
+class RetryAdmission:
+    """
+    Admission layer for the Random strategy: a request goes to a random replica as usual, but if that
+    replica's queue is full the other replicas are tried in random order instead of rejecting right away.
+    Optionally, a request every replica refused is deferred and tried again in a later interval, backing
+    off 1, 2, 4, ... intervals, up to `backoff` times.
+
+    Only a full first choice costs extra random draws, so with room everywhere this is plain Random.
+    """
+
+    __slots__ = ("retries", "backoff", "max_pending", "rng", "interval", "pending", "pending_count",
+                 "accepted", "retried", "deferred", "rejected")
+
+    def __init__(self, retries=None, backoff=0, max_pending=None, rng=random):
+        """
+        :param retries: Alternate replicas tried after the first choice (None: all of them).
+        :param backoff: Times a refused request is deferred to a later interval before it is rejected.
+        :param max_pending: Bound on deferred requests; once reached, refused requests are rejected.
+        :param rng: Source of randomness (the `random` module or a random.Random instance).
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_pending = max_pending
+        self.rng = rng
+        self.interval = 0
+        self.pending = {}  # Interval -> [(chunk_id, deferrals so far)] due then
+        self.pending_count = 0
+
+        self.accepted = 0  # Requests queued, on the first choice or after retries
+        self.retried = 0  # Of those, requests queued on an alternate replica
+        self.deferred = 0  # Deferrals into a later interval (a request can be deferred several times)
+        self.rejected = 0  # Requests refused by every replica, with no backoff left
+
+    def admit(self, chunk_id, cluster, recorder=None, deferrals=0):
+        """
+        Routes one request.
+
+        :param cluster: Cluster holding the servers and the chunk-to-replica index.
+        :param recorder: Optional replay.TraceRecorder that records the final decision.
+        :param deferrals: Times this request was already deferred.
+        :return: True if queued, False if rejected, None if deferred to a later interval.
+        """
+        replicas = cluster.replica_servers(chunk_id)
+        if not replicas:
+            if tracer.level <= WARNING:
+                tracer.emit(WARNING, UNASSIGNED_CHUNK, chunk_id)
+            if recorder is not None:
+                recorder.record(chunk_id, -1, False)
+            self.rejected += 1
+            return False
+
+        server = self.rng.choice(replicas)  # Same draw as choose_random_server
+        success = server.add_request(chunk_id)
+        if not success and self.retries != 0 and len(replicas) > 1:
+            others = [replica for replica in replicas if replica is not server]
+            self.rng.shuffle(others)
+            for other in others if self.retries is None else others[:self.retries]:
+                if other.add_request(chunk_id):
+                    server, success = other, True
+                    self.retried += 1
+                    break
+
+        if not success and deferrals < self.backoff \
+                and (self.max_pending is None or self.pending_count < self.max_pending):
+            self.pending.setdefault(self.interval + (1 << deferrals), []).append((chunk_id, deferrals + 1))
+            self.pending_count += 1
+            self.deferred += 1
+            return None
+
+        if tracer.level <= DEBUG and success:
+            tracer.emit(DEBUG, ASSIGN, chunk_id, server.server_id)
+        if recorder is not None:
+            recorder.record(chunk_id, server.server_id, success)
+        if success:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        return success
+
+    def retry_due(self, interval, cluster, recorder=None):
+        """
+        Starts an interval: sets the current interval and routes the deferred requests due in it.
+        Call before routing the interval's new requests.
+
+        :return: (accepted, rejected) among the due requests (the others were deferred again).
+        """
+        self.interval = interval
+        due = self.pending.pop(interval, ())
+        self.pending_count -= len(due)
+        accepted, rejected = 0, 0
+        for chunk_id, deferrals in due:
+            result = self.admit(chunk_id, cluster, recorder, deferrals)
+            if result is True:
+                accepted += 1
+            elif result is False:
+                rejected += 1
+        return accepted, rejected
+
+    def flush(self, recorder=None):
+        """
+        Ends the run: rejects every request still deferred (due in an interval that is never routed).
+
+        :return: Number of requests rejected.
+        """
+        flushed = 0
+        for due in self.pending.values():
+            for chunk_id, _ in due:
+                if recorder is not None:
+                    recorder.record(chunk_id, -1, False)
+                flushed += 1
+        self.pending = {}
+        self.pending_count = 0
+        self.rejected += flushed
+        return flushed
+
+
 # def RandomChunktoRandomServers(n, m, d, chunk_to_servers, servers):
 #     """
 #     Function that randomly assigns chunks to a random server from the list of duplicated servers.
@@ -68,16 +282,19 @@ def generate_chunk_to_servers_mapping(n, m, d):
 
 
 
-def assign_m_chunks_randomly(m, chunk_to_servers, servers,chunks_list, state=None):
+def assign_m_chunks_randomly(m, chunk_to_servers, servers,chunks_list, state=None, recorder=None):
     """
     Random strategy: route each chunk request to a random one of its d replica servers.
     Returns accepted and rejected counts.
+
+    :param recorder: Optional replay.TraceRecorder that records every decision.
     """
     accepted, rejected = 0, 0
+    cluster = as_cluster(servers, chunk_to_servers)
 
     for _ in range(m):
         chunk_id = random.choice(chunks_list)
-        if assign_chunk_to_random_server(chunk_id,chunk_to_servers,servers):
+        if assign_chunk_to_random_server(chunk_id,chunk_to_servers,cluster,recorder):
             accepted += 1
         else:
             rejected += 1
@@ -106,9 +323,11 @@ def adversary_assign_chunks_g1d1case(m, chunk_to_servers, servers):
             # This chunk resides on a single server, so it's vulnerable
             overloaded_chunks.append(chunk_id)
     
-    print(f"Overloaded Chunks (assigned to only 1 server): {overloaded_chunks}")
+    if tracer.level <= INFO:
+        tracer.emit(INFO, OVERLOADED_CHUNKS, len(overloaded_chunks))
     
     accepted, rejected = 0, 0
+    cluster = as_cluster(servers, chunk_to_servers)
     # Now, the adversary selects `m` chunks from the overloaded ones and sends requests
     for _ in range(m):
         # Randomly pick an overloaded chunk
@@ -120,19 +339,21 @@ def adversary_assign_chunks_g1d1case(m, chunk_to_servers, servers):
         # The adversary tries to send multiple requests to this chunk's server
         for server_id in servers_for_chunk:
             # Since the chunk is only assigned to one server, the server is likely to be overwhelmed
-            print(f"Adversary sending Chunk {chunk_id} to Server {server_id}.")
+            if tracer.level <= DEBUG:
+                tracer.emit(DEBUG, ADVERSARY_SEND, chunk_id, server_id)
             
             # Add the chunk to the selected server's queue using the random assignment function
             
 
-            if assign_chunk_to_random_server(chunk_id, chunk_to_servers, servers):
+            if assign_chunk_to_random_server(chunk_id, chunk_to_servers, cluster):
                 accepted += 1
             else:
                 rejected += 1
 
     return accepted,rejected
 
-def adversary_assign_chunks_avgcase(m, chunk_to_servers, servers, chunklist, Strategy = "None", J=3 ):
+def adversary_assign_chunks_avgcase(m, chunk_to_servers, servers, chunklist, Strategy = "None", J=3, router=None, recorder=None,
+                                    snapshot=None, admission=None):
     """
     Adversary function that tries to find vulnerable chunks and overload servers by sending requests
     for chunks that would cause server overloads based on the processing power `g` and duplication factor `d`.
@@ -142,7 +363,13 @@ def adversary_assign_chunks_avgcase(m, chunk_to_servers, servers, chunklist, Str
     :param d: Duplication factor (number of servers each chunk is assigned to).
     :param g: Server processing power (requests the server can process).
     :param chunk_to_servers: Dictionary mapping chunk IDs to lists of server IDs.
-    :param servers: List of Server objects.
+    :param servers: Cluster or list of Server objects (a list is indexed once per call, see cluster.as_cluster).
+    :param router: CuckooRouter of this simulation (Cuckoo only); the shared module router if None.
+    :param recorder: Optional replay.TraceRecorder that records every routing decision.
+    :param snapshot: LoadSnapshot for Greedy to decide on cached loads (stale Greedy); live loads if None.
+                     For Cuckoo, set it on the router instead.
+    :param admission: RetryAdmission for Random to retry other replicas of a full server; deferred requests
+                      count as neither accepted nor rejected here (see RetryAdmission.retry_due).
     """
 
     if (Strategy not in ["Random", "Greedy", "Cuckoo"]):
@@ -150,25 +377,31 @@ def adversary_assign_chunks_avgcase(m, chunk_to_servers, servers, chunklist, Str
         return 0,0
     
     accepted, rejected = 0, 0
+    cluster = as_cluster(servers, chunk_to_servers)
     # Now, the adversary selects `m` chunks from the overloaded ones and sends requests
     for chunk_id in chunklist:
             
         # Add the chunk to the selected server's queue using the random assignment function
         if (Strategy == "Random"):
-            if assign_chunk_to_random_server(chunk_id, chunk_to_servers, servers):
+            if admission is not None:
+                result = admission.admit(chunk_id, cluster, recorder)
+                if result is True:
+                    accepted += 1
+                elif result is False:
+                    rejected += 1
+            elif assign_chunk_to_random_server(chunk_id, chunk_to_servers, cluster, recorder):
                 accepted += 1
             else:
                 rejected += 1
 
         elif (Strategy == "Greedy"):
-            if assign_m_chunk_greedy(chunk_id, chunk_to_servers, servers):
+            if assign_m_chunk_greedy(chunk_id, chunk_to_servers, cluster, recorder=recorder, snapshot=snapshot):
                 accepted += 1
             else:
                 rejected += 1
 
         elif (Strategy == "Cuckoo"):
-            server_dict = {s.server_id: s for s in servers}
-            if cuckoo_route(chunk_id, chunk_to_servers, servers,server_dict,J): 
+            if cuckoo_route(chunk_id, chunk_to_servers, cluster, None, J, router, recorder):
                 accepted += 1
             else:
                 rejected += 1
@@ -177,17 +410,22 @@ def adversary_assign_chunks_avgcase(m, chunk_to_servers, servers, chunklist, Str
 
 #new
 
-def assign_m_chunk_greedy(chunk_id, chunk_to_servers, servers, state=None):
-    server_dict = {server.server_id: server for server in servers}
-
-    assigned_server_ids = chunk_to_servers.get(chunk_id, [])
-    valid_servers = [server_dict[sid] for sid in assigned_server_ids]
+def assign_m_chunk_greedy(chunk_id, chunk_to_servers, servers, state=None, recorder=None, snapshot=None):
+    if snapshot is None:
+        best_server = choose_greedy_server(as_cluster(servers, chunk_to_servers), chunk_id)
+    else:
+        best_server = snapshot.choose(chunk_id)  # Cached loads, see LoadSnapshot
 
-    if not valid_servers:
+    if best_server is None:
+        if recorder is not None:
+            recorder.record(chunk_id, -1, False)
         return "No valid servers for greedy assignment"
 
-    best_server = min(valid_servers, key=lambda s: s.get_queue_status())
     success = best_server.add_request(chunk_id)
+    if recorder is not None:
+        recorder.record(chunk_id, best_server.server_id, success)
+    if success and snapshot is not None:
+        snapshot.admitted(best_server)
 
     if success:
         return True
@@ -197,57 +435,121 @@ def assign_m_chunk_greedy(chunk_id, chunk_to_servers, servers, state=None):
 
 #new
 
-# Global Variables
-I = 0  # Global counter for time steps within a phase
-History = {}  # Global dictionary to track chunk-to-server history
-
-def cuckoo_route(chunk_id, chunk_to_servers, servers, server_dict, j):
+class CuckooRouter:
     """
-    Cuckoo routing function that applies cuckoo routing logic and tracks historical chunk-to-server mapping.
-    If I exceeds or touches J, flushes all historical data.
+    Cuckoo routing state of one simulation: the chunk-to-server history of the current phase and the
+    time step counter I. Several routers can run side by side (one per simulation or thread).
 
-    :param chunk_id: The ID of the chunk being requested.
-    :param chunk_to_servers: Global dictionary to track chunk-to-server mappings.
-    :param servers: List of server objects.
-    :param server_dict: Dictionary to track chunk assignments.
-    :param j: The phase limit (maximum value for I).
+    History entries are stamped with the phase (epoch) they were written in; an entry from an older
+    epoch counts as absent. Ending a phase only increments the epoch, so a flush is O(1), and the
+    history arrays never grow beyond one slot per chunk.
     """
-    global I
-    # Check if chunk_id is already in historical data (chunk_to_servers)
-    if chunk_id not in History:
-        server_dict = {server.server_id: server for server in servers}
 
-        assigned_server_ids = chunk_to_servers.get(chunk_id, [])
-        valid_servers = [server_dict[sid] for sid in assigned_server_ids]
+    __slots__ = ("j", "I", "epoch", "snapshot", "_stamps", "_servers")
+
+    def __init__(self, j=3, num_chunks=0, snapshot=None):
+        """
+        :param j: The phase limit (maximum value for I).
+        :param num_chunks: Expected number of chunks (the history grows on demand for larger IDs).
+        :param snapshot: LoadSnapshot the first request of a chunk in a phase is routed on (live loads if None).
+        """
+        self.j = j
+        self.snapshot = snapshot
+        self.I = 0  # Time steps within the current phase
+        self.epoch = 1
+        self._stamps = array('q', [0]) * num_chunks  # Epoch in which each chunk was last routed
+        self._servers = [None] * num_chunks  # Server each chunk was routed to in that epoch
+
+    def _reserve(self, chunk_id):
+        missing = chunk_id + 1 - len(self._stamps)
+        self._stamps.extend(array('q', [0]) * missing)
+        self._servers.extend([None] * missing)
+
+    def historical_server(self, chunk_id):
+        """
+        Returns the server the chunk was routed to in the current phase, or None.
+        """
+        if chunk_id < len(self._stamps) and self._stamps[chunk_id] == self.epoch:
+            return self._servers[chunk_id]
+        return None
+
+    def route(self, chunk_id, cluster, recorder=None):
+        """
+        Routes a request: the first request for a chunk in a phase goes to the Q queue of its least loaded
+        replica (and is remembered), repeated requests go to the P queue of the remembered server.
+
+        :param cluster: Cluster of CuckooServer objects.
+        :param recorder: Optional replay.TraceRecorder that records the decision.
+        :return: True if the request was queued, False if the queue was full.
+        """
+        best_server = self.historical_server(chunk_id)
+        if best_server is None:
+            if self.snapshot is None:
+                best_server = choose_greedy_server(cluster, chunk_id)
+            else:
+                best_server = self.snapshot.choose(chunk_id)
 
-        if not valid_servers:
-            return "No valid servers for greedy assignment"
+            if best_server is None:
+                if recorder is not None:
+                    recorder.record(chunk_id, -1, False)
+                return "No valid servers for greedy assignment"
 
-        best_server = min(valid_servers, key=lambda s: s.get_queue_status())
-        res = best_server.add_to_Q(chunk_id)
+            res = best_server.add_to_Q(chunk_id)
 
-        # Log the chunk-server mapping in history
-        History[chunk_id] = best_server
-    else:
-        # If the chunk is in history, use the historical chunk-to-server mapping
-        # assigned_server_id = History[chunk_id]
+            # Log the chunk-server mapping in history
+            if chunk_id >= len(self._stamps):
+                self._reserve(chunk_id)
+            self._stamps[chunk_id] = self.epoch
+            self._servers[chunk_id] = best_server
+        else:
+            res = best_server.add_to_P(chunk_id)  # Add to P queue for repeated requests
+
+        if res and self.snapshot is not None:
+            self.snapshot.admitted(best_server)
+        if recorder is not None:
+            recorder.record(chunk_id, best_server.server_id, res)
+
+        self.I += 1
+
+        # If we've reached the end of the current phase (I == J), forget the history
+        if self.I >= self.j:
+            self.flush()
+
+        return res
 
-        res = History[chunk_id].add_to_P(chunk_id)  # Add to P queue for repeated requests
+    def flush(self):
+        """
+        Ends the current phase: forgets the history (in O(1)) and resets I.
+        """
+        if tracer.level <= DEBUG:
+            tracer.emit(DEBUG, FLUSH_HISTORY)
+        self.epoch += 1
+        self.I = 0
 
-    # Increment the global counter I each time the function is called
-    I += 1
 
-    # If we've reached the end of the current phase (I == J), reset historical data
-    if I >= j:
-        flush_history()
+# Router behind the module-level cuckoo_route and flush_history
+_default_router = CuckooRouter()
 
-    return res
+def cuckoo_route(chunk_id, chunk_to_servers, servers, server_dict, j, router=None, recorder=None):
+    """
+    Cuckoo routing function that applies cuckoo routing logic and tracks historical chunk-to-server mapping.
+    If I exceeds or touches J, flushes all historical data.
+
+    :param chunk_id: The ID of the chunk being requested.
+    :param chunk_to_servers: Global dictionary to track chunk-to-server mappings.
+    :param servers: Cluster or list of server objects.
+    :param server_dict: Unused, kept for compatibility (the Cluster index replaces it).
+    :param j: The phase limit (maximum value for I) of the shared module router; a given router keeps its own.
+    :param router: CuckooRouter holding the history; the shared module router if None.
+    :param recorder: Optional replay.TraceRecorder that records the decision.
+    """
+    if router is None:
+        router = _default_router
+        router.j = j
+    return router.route(chunk_id, as_cluster(servers, chunk_to_servers), recorder)
 
 def flush_history():
     """
-    Flush the global historical data and reset the global counter I.
+    Flush the historical data of the shared module router and reset its counter I.
     """
-    global I, History
-    print("Flushing historical data...")  # For logging purposes
-    History.clear()  # Clear the historical mapping
-    I = 0  # Reset the global counter I
+    _default_router.flush()
@@ -0,0 +1,115 @@
+from array import array
+
+import numpy as np
+
+
+class Cluster:
+    """
+    Owns the servers of a simulation together with a compact chunk-to-replica index.
+    Replicas of chunk c are indices[indptr[c]:indptr[c + 1]] (CSR layout), so routing a request
+    touches only the d replicas of its chunk instead of scanning or re-indexing every server.
+
+    A Cluster can be passed anywhere a list of servers is expected: it iterates, indexes and
+    reports its length like the list it was built from.
+    """
+
+    def __init__(self, servers, chunk_to_servers):
+        """
+        :param servers: List of Server (or CuckooServer) objects.
+        :param chunk_to_servers: Dictionary mapping chunk IDs (0..n-1) to lists of server IDs.
+        """
+        self.servers = list(servers)
+
+        # Position i holds the server whose server_id is i
+        size = max((server.server_id for server in self.servers), default=-1) + 1
+        self._by_id = [None] * size
+        for server in self.servers:
+            self._by_id[server.server_id] = server
+
+        n = max(chunk_to_servers) + 1 if chunk_to_servers else 0
+        counts = [0] * n
+        for chunk_id, assigned_servers in chunk_to_servers.items():
+            counts[chunk_id] = len(assigned_servers)
+
+        self.indptr = array('q', [0]) * (n + 1)
+        for chunk_id in range(n):
+            self.indptr[chunk_id + 1] = self.indptr[chunk_id] + counts[chunk_id]
+
+        self.indices = array('q', [0]) * self.indptr[n]
+        for chunk_id, assigned_servers in chunk_to_servers.items():
+            self.indices[self.indptr[chunk_id]:self.indptr[chunk_id + 1]] = array('q', assigned_servers)
+
+    @classmethod
+    def from_csr(cls, servers, indptr, indices):
+        """
+        Builds a Cluster directly from CSR replica arrays (e.g. scenarios.load_placement_arrays),
+        without going through a chunk-to-server dictionary. Contiguous int64 NumPy arrays (such as the
+        memory-mapped arrays of placement_store) are used in place; anything else is converted in bulk.
+        """
+        cluster = cls(servers, {})
+        cluster.indptr = _int64_view(indptr)
+        cluster.indices = _int64_view(indices)
+        return cluster
+
+    @property
+    def num_chunks(self):
+        return len(self.indptr) - 1
+
+    def server(self, server_id):
+        """
+        Returns the server with the given ID.
+        """
+        return self._by_id[server_id]
+
+    def replicas(self, chunk_id):
+        """
+        Returns the IDs of the servers holding a chunk (empty if the chunk is unknown).
+        """
+        if 0 <= chunk_id < len(self.indptr) - 1:
+            return self.indices[self.indptr[chunk_id]:self.indptr[chunk_id + 1]]
+        return self.indices[:0]
+
+    def replica_servers(self, chunk_id):
+        """
+        Returns the server objects holding a chunk, in mapping order, in O(d).
+        """
+        by_id = self._by_id
+        return [by_id[server_id] for server_id in self.replicas(chunk_id)]
+
+    def __iter__(self):
+        return iter(self.servers)
+
+    def __len__(self):
+        return len(self.servers)
+
+    def __getitem__(self, index):
+        return self.servers[index]
+
+
+def _int64_view(values):
+    """
+    Returns `values` as an int64 sequence that indexes and slices like array('q'): a memoryview of the same
+    memory if it already is a contiguous int64 buffer, otherwise an array('q') filled with one bulk copy.
+    """
+    if isinstance(values, array) and values.typecode == 'q':
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:  # Not a buffer (e.g. a list)
+        return array('q', values)
+    if view.c_contiguous and view.itemsize == 8 and view.format in ('q', 'l', '<q', '<l'):
+        return view.cast('B').cast('q')
+    converted = array('q')
+    converted.frombytes(memoryview(np.ascontiguousarray(values, dtype=np.int64)).cast('B'))
+    return converted
+
+
+def as_cluster(servers, chunk_to_servers):
+    """
+    Returns `servers` unchanged if it already is a Cluster, otherwise a new Cluster indexing the plain list.
+    Nothing is cached, so a list costs a full index build on every call: callers that route many requests
+    build the Cluster once (as simulation.simulate does) and pass it on.
+    """
+    if isinstance(servers, Cluster):
+        return servers
+    return Cluster(servers, chunk_to_servers)
@@ -0,0 +1,183 @@
+"""
+Discrete-event simulation mode.
+
+Instead of visiting every server every interval, the engine keeps a time-ordered heap of events:
+request arrivals (Poisson or replayed from a trace) and service completions. A server serves the
+request at the head of its queue for interval_ms / processing_rate milliseconds, so g requests per
+interval_ms as in the lock-step loop. Idle servers generate no events, and the cost of a run grows
+with the number of requests rather than with servers x intervals. Requests are served through
+Server.serve_next with the server's clock set to the current interval, so waits (in intervals) and
+coalesced requests are accounted as in the lock-step loop.
+
+    metrics = event_engine.run_event_simulation(CTM.CTMmap5, 256, 1000, 4, 8, strategy="Greedy", seed=1)
+    print(metrics.summary())
+"""
+import heapq
+import random
+
+import chunk_assignment as ca
+import server as se
+from cluster import Cluster
+from streaming_metrics import DownsampledSeries, Histogram, LogHistogram
+
+ARRIVAL, COMPLETION = 0, 1
+
+
+def poisson_arrivals(rate_per_ms, num_chunks, rng, chunks=None):
+    """
+    Endless Poisson stream of (time_ms, chunk_id).
+
+    :param rate_per_ms: Mean number of requests per millisecond.
+    :param num_chunks: Chunks are drawn uniformly from 0..num_chunks-1 ...
+    :param chunks: ... or uniformly from this list (e.g. a reappearance dependency), if given.
+    """
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate_per_ms)
+        yield t, (rng.choice(chunks) if chunks is not None else rng.randrange(num_chunks))
+
+
+class EventSimulation:
+    def __init__(self, cluster, strategy="Random", interval_ms=100, seed=None):
+        """
+        :param cluster: Cluster of Server objects; their queues and max_queue_size are used as is.
+        :param strategy: "Random" or "Greedy" (Cuckoo phases are defined in lock-step time steps).
+        :param interval_ms: Length of an interval; a server serves processing_rate requests per interval.
+        :param seed: Seed of the engine's own random.Random (replica choice and Poisson arrivals).
+        """
+        if strategy not in ["Random", "Greedy"]:
+            raise ValueError(f"Event engine supports Random and Greedy, not {strategy}")
+
+        self.cluster = cluster
+        self.strategy = strategy
+        self.interval_ms = interval_ms
+        self.rng = random.Random(seed)
+
+        self.now = 0.0
+        self._events = []  # Heap of (time_ms, sequence, kind, payload)
+        self._sequence = 0
+        self._arrivals = None
+
+        # Statistics
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0  # Requests served, including the ones attached to a served request
+        self.events = 0
+        self.max_queue_length = 0
+        self.queued = 0  # Requests in all queues (including the ones in service)
+        self._queued_area = 0.0  # Integral of `queued` over time
+        self.queue_depth_at_arrival = Histogram(1024)
+        self.rejection_series = DownsampledSeries()
+
+    def _push(self, time_ms, kind, payload):
+        self._sequence += 1
+        heapq.heappush(self._events, (time_ms, self._sequence, kind, payload))
+
+    def _next_arrival(self):
+        for time_ms, chunk_id in self._arrivals:
+            self._push(time_ms, ARRIVAL, chunk_id)
+            return
+
+    def _choose(self, chunk_id):
+        if self.strategy == "Random":
+            return ca.choose_random_server(self.cluster, chunk_id, self.rng)
+        return ca.choose_greedy_server(self.cluster, chunk_id)
+
+    def _arrive(self, chunk_id):
+        server = self._choose(chunk_id)
+        queue_length = server.get_queue_status() if server is not None else 0
+        self.queue_depth_at_arrival.add(queue_length)
+
+        if server is not None:
+            server.clock = int(self.now // self.interval_ms)  # Enqueue stamp
+        if server is not None and server.add_request(chunk_id):
+            self.accepted += 1
+            self.queued += 1
+            if server.get_queue_status() > self.max_queue_length:
+                self.max_queue_length = server.get_queue_status()
+            if queue_length == 0:
+                # The server was idle, it starts serving right away
+                self._push(self.now + self.interval_ms / server.processing_rate, COMPLETION, server)
+        else:
+            self.rejected += 1
+            self.rejection_series.append(int(self.now // self.interval_ms), 1)
+
+    def _complete(self, server):
+        server.clock = int(self.now // self.interval_ms)
+        _, served = server.serve_next()
+        self.completed += served
+        self.queued -= served
+        if server.queue:
+            self._push(self.now + self.interval_ms / server.processing_rate, COMPLETION, server)
+
+    def run(self, duration_ms, arrival_rate=None, chunks=None, trace=None):
+        """
+        Simulates until `duration_ms` (events at or after it stay pending).
+
+        :param arrival_rate: Poisson arrivals per interval (default: one per server per interval,
+                             like chunks_per_interval = num_servers).
+        :param chunks: Optional list to draw Poisson requests from instead of all chunks.
+        :param trace: Iterable of (time_ms, chunk_id) in time order, replayed instead of Poisson arrivals.
+        :return: Summary dictionary.
+        """
+        if self._arrivals is None:
+            if trace is not None:
+                self._arrivals = iter(trace)
+            else:
+                rate = len(self.cluster) if arrival_rate is None else arrival_rate
+                self._arrivals = poisson_arrivals(rate / self.interval_ms, self.cluster.num_chunks, self.rng, chunks)
+            self._next_arrival()
+
+        events = self._events
+        while events and events[0][0] < duration_ms:
+            time_ms, _, kind, payload = heapq.heappop(events)
+            self._queued_area += self.queued * (time_ms - self.now)
+            self.now = time_ms
+            self.events += 1
+
+            if kind == ARRIVAL:
+                self._arrive(payload)
+                self._next_arrival()
+            else:
+                self._complete(payload)
+
+        self._queued_area += self.queued * (duration_ms - self.now)
+        self.now = duration_ms
+        return self.summary()
+
+    def summary(self):
+        total = self.accepted + self.rejected
+        waits = LogHistogram()  # Intervals every served request waited
+        for server in self.cluster:
+            waits.merge(server.waits)
+        return {
+            "time_ms": self.now,
+            "events": self.events,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "rejection_rate": self.rejected / total if total else 0.0,
+            # Time-averaged queue length per server
+            "avg_queue_length": self._queued_area / (self.now * len(self.cluster)) if self.now else 0.0,
+            "max_queue_length": self.max_queue_length,
+            "p50_queue_at_arrival": self.queue_depth_at_arrival.percentile(50),
+            "p99_queue_at_arrival": self.queue_depth_at_arrival.percentile(99),
+            "p50_wait": waits.percentile(50),
+            "p99_wait": waits.percentile(99),
+        }
+
+
+def run_event_simulation(chunk_to_servers, num_servers, num_chunks, g, q, d=2, total_intervals=100, interval_ms=100,
+                         strategy="Random", arrival_rate=None, chunks=None, trace=None, seed=None, coalesce=False):
+    """
+    Builds plain servers for a mapping and runs an EventSimulation for total_intervals * interval_ms.
+
+    :param coalesce: Coalesce requests for a chunk already queued on a server (see Server).
+
+    :return: The EventSimulation (call summary() for the totals).
+    """
+    servers, servers_to_chunks = se.Init_Servers_with_chunk_mapping(num_chunks, num_servers, g, d, q, chunk_to_servers,
+                                                                    coalesce=coalesce)
+    sim = EventSimulation(Cluster(servers, chunk_to_servers), strategy, interval_ms, seed)
+    sim.run(total_intervals * interval_ms, arrival_rate, chunks, trace)
+    return sim
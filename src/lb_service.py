@@ -0,0 +1,430 @@
+"""
+Load balancer service: routes real chunk requests over local sockets.
+
+    clients --TCP--> LoadBalancer --pooled TCP connections--> backend worker processes
+
+Each backend process wraps a Server (or CuckooServer) object: requests are admitted into its queue with the
+usual add_request / add_to_Q / add_to_P, every interval_ms the server processes up to g of them, and each
+processed request is answered. Rejections are answered immediately, and so are queued requests a
+CuckooServer drops at a phase change (its Q' or P' being full). Every answer carries the backend's queue
+depth, which the balancer uses as live feedback for the Greedy and Cuckoo decisions (the same
+chunk_assignment code as the simulations).
+
+    python lb_service.py --strategy Greedy --servers 8 --rate 2000 --duration 5
+
+starts the backends and the balancer, drives them with the built-in load generator and prints latency
+percentiles and throughput.
+
+Wire format (little-endian structs, see the *_REQUEST / *_RESPONSE definitions below); every request carries
+an ID, so a connection can have many requests in flight and answers may come back out of order.
+"""
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import random
+import struct
+import time
+
+import numpy as np
+
+import chunk_assignment as ca
+import server as se
+import workloads
+from cluster import Cluster
+from TestCases import scenarios
+
+CLIENT_REQUEST = struct.Struct("<Ii")  # request_id, chunk_id
+CLIENT_RESPONSE = struct.Struct("<IBi")  # request_id, status, server_id (-1 if the chunk has no replica)
+BACKEND_REQUEST = struct.Struct("<IiB")  # request_id, chunk_id, queue (QUEUE_DEFAULT or QUEUE_P)
+BACKEND_RESPONSE = struct.Struct("<IBii")  # request_id, status, queue_depth, requests received so far
+
+SERVED, REJECTED = 0, 1
+QUEUE_DEFAULT, QUEUE_P = 0, 1  # QUEUE_DEFAULT is the Q queue of a CuckooServer
+
+
+# --- Backend worker ---
+
+class Backend:
+    def __init__(self, server, interval_ms):
+        """
+        :param server: Server or CuckooServer whose queues hold the admitted requests.
+        :param interval_ms: Time between two process_request calls.
+        """
+        self.server = server
+        self.interval_ms = interval_ms
+        self.received = 0
+        # The server queues entry tokens rather than chunk IDs, so two queued requests for the same chunk stay
+        # distinct whichever queue serves (or drops) them first
+        self._waiters = {}  # Entry token -> (writer, request_id)
+        self._tokens = itertools.count()
+        if isinstance(server, se.CuckooServer):
+            server.on_drop = self._dropped
+
+    def _reply(self, writer, request_id, status):
+        if not writer.is_closing():
+            writer.write(BACKEND_RESPONSE.pack(request_id, status, self.server.get_queue_status(), self.received))
+
+    def _admit(self, token, queue):
+        if queue == QUEUE_P:
+            return self.server.add_to_P(token)
+        if isinstance(self.server, se.CuckooServer):
+            return self.server.add_to_Q(token)
+        return self.server.add_request(token)
+
+    def _dropped(self, token):
+        writer, request_id = self._waiters.pop(token)
+        self._reply(writer, request_id, REJECTED)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                # The backend only queues entry tokens, the chunk ID is not needed
+                request_id, _, queue = BACKEND_REQUEST.unpack(await reader.readexactly(BACKEND_REQUEST.size))
+                self.received += 1
+                token = next(self._tokens)
+                if self._admit(token, queue):
+                    self._waiters[token] = (writer, request_id)
+                else:
+                    self._reply(writer, request_id, REJECTED)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def process_loop(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            # Fixed-rate ticks, so a slow tick does not shift the following ones
+            deadline += self.interval_ms / 1000
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            for token in self.server.process_request():
+                writer, request_id = self._waiters.pop(token)
+                self._reply(writer, request_id, SERVED)
+
+
+def _backend_main(server, interval_ms, host, port_pipe):
+    async def serve():
+        backend = Backend(server, interval_ms)
+        listener = await asyncio.start_server(backend.handle, host, 0)
+        port_pipe.send(listener.sockets[0].getsockname()[1])
+        port_pipe.close()
+        async with listener:
+            await backend.process_loop()
+
+    asyncio.run(serve())
+
+
+def start_backends(servers, interval_ms, host="127.0.0.1"):
+    """
+    Starts one worker process per server object.
+
+    :return: (processes, addresses), addresses[i] being the (host, port) of servers[i].
+    """
+    processes, addresses = [], []
+    for server in servers:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_backend_main, args=(server, interval_ms, host, sender), daemon=True)
+        process.start()
+        processes.append(process)
+        addresses.append((host, receiver.recv()))
+    return processes, addresses
+
+
+def stop_backends(processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+
+# --- Balancer ---
+
+class BackendProxy:
+    """
+    Stands in for a Server inside the balancer, so the chunk_assignment routing code can drive it.
+    Queue methods send the request to the backend and return True; the real admission result arrives
+    with the answer.
+    """
+
+    def __init__(self, server_id, address, pool_size, sent):
+        self.server_id = server_id
+        self.address = address
+        self.pool_size = pool_size
+        self._sent = sent  # Shared with the balancer: futures of the requests sent by the current decision
+
+        self._writers = []
+        self._next_writer = None
+        self._pending = {}  # request_id -> future
+        self._request_ids = itertools.count()
+
+        # Feedback: the backend reports its depth and how many requests it had received at that moment
+        self.reported_depth = 0
+        self.reported_received = 0
+        self.sent_count = 0
+
+    async def connect(self):
+        for _ in range(self.pool_size):
+            reader, writer = await asyncio.open_connection(*self.address)
+            self._writers.append(writer)
+            asyncio.create_task(self._read_responses(reader))
+        self._next_writer = itertools.cycle(self._writers)
+
+    async def _read_responses(self, reader):
+        try:
+            while True:
+                request_id, status, depth, received = BACKEND_RESPONSE.unpack(
+                    await reader.readexactly(BACKEND_RESPONSE.size))
+                if received >= self.reported_received:
+                    self.reported_depth, self.reported_received = depth, received
+                future = self._pending.pop(request_id)
+                if not future.done():
+                    future.set_result(status)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result(REJECTED)
+            self._pending.clear()
+
+    def get_queue_status(self):
+        """
+        Estimated queue depth: the last reported depth plus the requests sent after that report.
+        """
+        return self.reported_depth + self.sent_count - self.reported_received
+
+    def _send(self, chunk_id, queue):
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        next(self._next_writer).write(BACKEND_REQUEST.pack(request_id, chunk_id, queue))
+        self.sent_count += 1
+        self._sent.append((self, future))
+        return True
+
+    def add_request(self, chunk_id):
+        return self._send(chunk_id, QUEUE_DEFAULT)
+
+    def add_to_Q(self, chunk_id):
+        return self._send(chunk_id, QUEUE_DEFAULT)
+
+    def add_to_P(self, chunk_id):
+        return self._send(chunk_id, QUEUE_P)
+
+    def close(self):
+        for writer in self._writers:
+            writer.close()
+
+
+class LoadBalancer:
+    def __init__(self, chunk_to_servers, addresses, strategy="Greedy", J=3, pool_size=4, seed=None):
+        """
+        :param chunk_to_servers: Dictionary mapping chunk IDs to lists of server IDs.
+        :param addresses: (host, port) of the backend of every server ID.
+        :param strategy: "Random", "Greedy" or "Cuckoo" (the backends must then wrap CuckooServer objects).
+        :param J: Cuckoo phase length, in routed requests.
+        :param pool_size: Persistent connections per backend.
+        """
+        if strategy not in ["Random", "Greedy", "Cuckoo"]:
+            raise ValueError(f"Unknown strategy {strategy}")
+        self.strategy = strategy
+        self.rng = random.Random(seed)
+        self._sent = []
+        self.proxies = [BackendProxy(server_id, address, pool_size, self._sent) for server_id, address in enumerate(addresses)]
+        self.cluster = Cluster(self.proxies, chunk_to_servers)
+        self.router = ca.CuckooRouter(J, self.cluster.num_chunks)
+        self.accepted = 0
+        self.rejected = 0
+
+    async def connect(self):
+        await asyncio.gather(*(proxy.connect() for proxy in self.proxies))
+
+    def _route(self, chunk_id):
+        """
+        Makes the routing decision and sends the request; returns (proxy, future) or None if no replica.
+        """
+        self._sent.clear()
+        if self.strategy == "Cuckoo":
+            self.router.route(chunk_id, self.cluster)
+        else:
+            if self.strategy == "Random":
+                server = ca.choose_random_server(self.cluster, chunk_id, self.rng)
+            else:
+                server = ca.choose_greedy_server(self.cluster, chunk_id)
+            if server is not None:
+                server.add_request(chunk_id)
+        return self._sent[0] if self._sent else None
+
+    async def _answer(self, writer, request_id, chunk_id):
+        sent = self._route(chunk_id)
+        if sent is None:
+            status, server_id = REJECTED, -1
+        else:
+            proxy, future = sent
+            status, server_id = await future, proxy.server_id
+        if status == SERVED:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        if not writer.is_closing():
+            writer.write(CLIENT_RESPONSE.pack(request_id, status, server_id))
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                request_id, chunk_id = CLIENT_REQUEST.unpack(await reader.readexactly(CLIENT_REQUEST.size))
+                asyncio.create_task(self._answer(writer, request_id, chunk_id))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # Shutdown; finish quietly (asyncio's stream callback reports cancelled handlers as errors)
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=0):
+        """
+        Connects to the backends and starts listening.
+
+        :return: The asyncio server (its sockets give the bound port).
+        """
+        await self.connect()
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        for proxy in self.proxies:
+            proxy.close()
+
+
+# --- Load generator ---
+
+async def load_generator(host, port, workload, rate, duration, connections=4):
+    """
+    Open-loop client: sends requests at `rate` per second for `duration` seconds, whatever the answers.
+
+    :param workload: Stream of chunk ID batches (see workloads), consumed request by request.
+    :return: Dictionary with throughput, acceptance counts and latency percentiles in milliseconds.
+    """
+    streams = [await asyncio.open_connection(host, port) for _ in range(connections)]
+    sent_at = {}
+    latencies, served, rejected = [], 0, 0
+    done = asyncio.Event()
+    expected = None
+
+    async def read_answers(reader):
+        nonlocal served, rejected
+        try:
+            while True:
+                request_id, status, server_id = CLIENT_RESPONSE.unpack(await reader.readexactly(CLIENT_RESPONSE.size))
+                latencies.append(time.perf_counter() - sent_at.pop(request_id))
+                if status == SERVED:
+                    served += 1
+                else:
+                    rejected += 1
+                if expected is not None and served + rejected == expected:
+                    done.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            done.set()
+
+    readers = [asyncio.create_task(read_answers(reader)) for reader, writer in streams]
+    writers = itertools.cycle([writer for reader, writer in streams])
+    chunks = (int(chunk_id) for batch in workload for chunk_id in batch)
+
+    start = time.perf_counter()
+    request_id = 0
+    while True:
+        # Send everything that is due, then sleep until the next send
+        now = time.perf_counter()
+        due = min(int((now - start) * rate), int(duration * rate))
+        while request_id < due:
+            chunk_id = next(chunks)
+            sent_at[request_id] = time.perf_counter()
+            next(writers).write(CLIENT_REQUEST.pack(request_id, chunk_id))
+            request_id += 1
+        if now - start >= duration:
+            break
+        await asyncio.sleep(0.001)
+
+    expected = request_id
+    if served + rejected < expected:
+        try:
+            await asyncio.wait_for(done.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            pass
+    elapsed = time.perf_counter() - start
+
+    for task in readers:
+        task.cancel()
+    for reader, writer in streams:
+        writer.close()
+
+    latency_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": request_id,
+        "served": served,
+        "rejected": rejected,
+        "unanswered": request_id - served - rejected,  # Still without an answer when the client gave up
+        "throughput_per_s": served / elapsed,
+        "p50_latency_ms": float(np.percentile(latency_ms, 50)),
+        "p99_latency_ms": float(np.percentile(latency_ms, 99)),
+        "max_latency_ms": float(latency_ms.max()),
+    }
+
+
+async def run_benchmark(chunk_to_servers, addresses, strategy, workload, rate, duration, J=3, pool_size=4):
+    balancer = LoadBalancer(chunk_to_servers, addresses, strategy, J, pool_size)
+    listener = await balancer.serve()
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        return await load_generator("127.0.0.1", port, workload, rate, duration)
+    finally:
+        listener.close()
+        balancer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the load balancer against local backend processes.")
+    parser.add_argument("--strategy", default="Greedy", choices=["Random", "Greedy", "Cuckoo"])
+    parser.add_argument("--mapping", default=None, help="placement scenario (default: random placement)")
+    parser.add_argument("--servers", type=int, default=8)
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--d", type=int, default=2)
+    parser.add_argument("--g", type=int, default=4)
+    parser.add_argument("--q", type=int, default=8)
+    parser.add_argument("--J", type=int, default=3)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    parser.add_argument("--rate", type=float, default=2000, help="requests per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds")
+    parser.add_argument("--zipf", type=float, default=0, help="Zipf exponent (0: uniform requests)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    if args.mapping:
+        chunk_to_servers = scenarios.load_placement(args.mapping)
+        meta = scenarios.info(args.mapping)
+        args.servers, args.chunks = meta["num_servers"], meta["num_chunks"]
+    else:
+        chunk_to_servers = ca.generate_chunk_to_servers_mapping(args.chunks, args.servers, args.d)
+
+    if args.strategy == "Cuckoo":
+        servers = [se.CuckooServer(args.g, args.q, i, args.J) for i in range(args.servers)]
+    else:
+        servers = [se.Server(args.g, args.q, i) for i in range(args.servers)]
+    if args.zipf:
+        workload = workloads.zipf(args.chunks, 1024, args.zipf, seed=args.seed)
+    else:
+        workload = workloads.uniform(args.chunks, 1024, seed=args.seed)
+
+    processes, addresses = start_backends(servers, args.interval_ms)
+    try:
+        report = asyncio.run(run_benchmark(chunk_to_servers, addresses, args.strategy, workload, args.rate,
+                                           args.duration, args.J))
+    finally:
+        stop_backends(processes)
+
+    for key, value in report.items():
+        print(f"{key:18} {value:.2f}" if isinstance(value, float) else f"{key:18} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import server as se
 import chunk_assignment as ca
+import simulation
+from streaming_metrics import MetricsCollector
 import random
 import matplotlib.pyplot as plt
 import time
@@ -7,18 +9,11 @@ import pprint
 from TestCases import Chunktoservermaps as CTM
 
 # SImulation metrics
-# # --- Metrics Collection ---
-metrics = {
-    'intervals': [],
-    'accepted': 0,
-    'rejected': 0,
-    'rejections_by_interval': [],
-    'queue_lengths_by_interval': [],
-    'max_queue_length_by_interval':[]
-}
+# # --- Metrics Collection --- (every run_simulation call is merged in)
+metrics = MetricsCollector()
 
 
-def run_simulation(Type = "Random"):
+def run_simulation(Type = "Random", Engine = "Object"):
 
      # --- Parameters for LAST TEST CASE MAKE SYRE TO REFER TO CHUNK TO SERVER MAPPINGS ADN SET THESE PARAMETERS ACCORDINGLY TO TEST FOR ANY TEST CASE---
     num_servers = 256  # Number of servers
@@ -34,69 +29,45 @@ def run_simulation(Type = "Random"):
 
     #servers, chunk_to_servers,servers_to_chunks = se.Init_Servers_with_random_chunks(num_chunks, num_servers, g, d, q) # RANDOM INITIALIZATION (CANT USEREAPPEARANCE DEPENDENCY WITH RANDOMINITIALIZATION)
 
-    if(Type in ["Greedy", "Random"]):
-        servers, servers_to_chunks = se.Init_Servers_with_chunk_mapping(num_chunks, num_servers, g, d, q,chunk_to_servers) # CUSTOM INIT 
-    else :
-        servers, servers_to_chunks = se.Init_Cuckoo_Servers_with_chunk_mapping(num_chunks, num_servers, 4, d, q, chunk_to_servers ,3) # CUCKOO INIT g and j hardcoded
-
-    for interval in range(total_intervals):
-        # Generate the list of requested chunks for this interval
-        reappearance_chunks_list = CTM.reap_dep_CTMmap5_SEVERE  # SELECT REAPPEARANCE DEPENDENCY here maake sure it corresponds to the correct server and chunk mapping
-
-        chunks_list = [i for i in range(num_chunks)]
-        
-        accepted, rejected = ca.adversary_assign_chunks_avgcase(num_servers, chunk_to_servers, servers, reappearance_chunks_list, Type)
-       # accepted, rejected = ca.assign_m_chunks_randomly(num_servers , chunk_to_servers, servers, chunks_list)
-
-        for server in servers:
-            processed = server.process_request()  # Process up to g requests
-
-            print(f"Server-{server.server_id} processed: {processed}")
-        
-        # Update metrics
-        metrics['accepted'] += accepted
-        metrics['rejected'] += rejected
-        metrics['rejections_by_interval'].append(rejected)
+    reappearance_chunks_list = CTM.reap_dep_CTMmap5_SEVERE  # SELECT REAPPEARANCE DEPENDENCY here maake sure it corresponds to the correct server and chunk mapping
+    # reappearance_chunks_list = None  # Uniformly random chunks every interval instead
 
-        # Track total queue length (to estimate latency)
-        total_avg_queue_length = sum(server.get_queue_status() for server in servers) / num_servers
-        metrics['queue_lengths_by_interval'].append(total_avg_queue_length)
-        
-        max_queue_length = max(server.get_queue_status() for server in servers)
-        metrics['max_queue_length_by_interval'].append(max_queue_length)
+    if(Type == "Cuckoo"):
+        g = 4  # CUCKOO g and j hardcoded
+    J = 3
 
-
-        metrics['intervals'].append(interval)
-
-        # Print updated server statuses
-        print(f"\nInterval {interval + 1} complete.")
-        for server in servers:
-            print(server)  # Print the server's chunks and queue status
-
-        # Wait for the next interval (simulate the interval using time.sleep)
-        # time.sleep(interval_ms / 1000)  # Convert ms to seconds
+    # Routing decisions and server status: see tracing.configure; phase timing: see profiling.configure
+    run = simulation.simulate(Type, chunk_to_servers, reappearance_chunks_list, num_servers, num_chunks, d, g, q, J,
+                              total_intervals, Engine)
+    metrics.merge(run)
 
     # --- Print Summary ---
-    total = metrics['accepted'] + metrics['rejected']
+    summary = run.summary()
+    total = summary['accepted'] + summary['rejected']
     print("\n--- Simulation Summary ---")
     print(f"Total Requests: {total}")
-    print(f"Accepted Requests: {metrics['accepted']}")
-    print(f"Rejected Requests: {metrics['rejected']}")
-    print(f"Rejection Rate: {metrics['rejected'] / total:.4f}")
-
-    # --- Plotting the Results ---
+    print(f"Accepted Requests: {summary['accepted']}")
+    print(f"Rejected Requests: {summary['rejected']}")
+    print(f"Rejection Rate: {summary['rejection_rate']:.4f}")
+    print(f"Dropped Requests (accepted, then dropped from a full Q'/P'): {summary['dropped']}")
+    print(f"Loss Rate (rejected + dropped): {summary['loss_rate']:.4f}")
+    print(f"Queue Length p50/p95/p99: {summary['p50_queue_length']}/{summary['p95_queue_length']}/{summary['p99_queue_length']}")
+    print(f"Rejection Rate per Interval p50/p95/p99: {summary['p50_rejection_rate']:.3f}/{summary['p95_rejection_rate']:.3f}/{summary['p99_rejection_rate']:.3f}")
+
+    # --- Plotting the Results --- (series are downsampled to a bounded number of points)
+    series = run.as_metrics()
     plt.figure(figsize=(10, 4))
 
     plt.subplot(1, 2, 1)
-    plt.plot(metrics['intervals'], metrics['queue_lengths_by_interval'], label='Queue Length')
-    plt.plot(metrics['intervals'], metrics['max_queue_length_by_interval'], label='Max Queue Length', linestyle='--')
+    plt.plot(series['intervals'], series['queue_lengths_by_interval'], label='Queue Length')
+    plt.plot(series['intervals'], series['max_queue_length_by_interval'], label='Max Queue Length', linestyle='--')
     plt.xlabel('Interval') 
     plt.ylabel('Total Queue Length')
     plt.title('Queue Length per Interval')
     plt.grid(True)
 
     plt.subplot(1, 2, 2)
-    plt.plot(metrics['intervals'], metrics['rejections_by_interval'], label='Rejections', color='r')
+    plt.plot(series['intervals'], series['rejections_by_interval'], label='Rejections', color='r')
     plt.xlabel('Interval')
     plt.ylabel('Rejected Requests')
     plt.title('Rejections per Interval')
@@ -115,6 +86,11 @@ if __name__ == "__main__":
     # Run the simulation with the given parameters
     #--------------------------Run Simulation here--------------------
     run_simulation("Random") # POssible Options are "Greedy" , "Cuckoo", "Random"(Default)
+    # run_simulation("Greedy", Engine = "Vectorized") # Array engine for large num_servers, same statistics as the object path
+    # simulation.simulate("Cuckoo", CTM.CTMmap5, g = 2, scheduler = "drr") # Work-conserving: the default g // 4 split processes nothing with g < 4
+    # simulation.simulate("Cuckoo", CTM.CTMmap5, scheduler = "drr", weights = (2, 2, 1, 1)) # DRR favouring the current phase's Q and P over Q' and P'
+    # simulation.simulate("Random", CTM.CTMmap5, CTM.reap_dep_CTMmap5_SEVERE, steal = True).summary()["stolen"] # Idle replica peers take queued work
+    # simulation.simulate("Greedy", CTM.CTMmap5, CTM.reap_dep_CTMmap5_SEVERE, coalesce = True).summary()["coalescing_ratio"] # Repeated chunks share a slot
 
     # -------------------------Testing Area---------------------------
     # # Initialize servers (assuming `Init_Servers` is in `server.py`)
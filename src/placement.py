@@ -0,0 +1,227 @@
+"""
+Bulk chunk placement.
+
+A Placement holds the chunk-to-server mapping as compact CSR arrays in both directions:
+
+    replicas of chunk c     indices[indptr[c]:indptr[c + 1]]                  (in preference order)
+    chunks on server s      server_indices[server_indptr[s]:server_indptr[s + 1]]  (ascending)
+
+Builders:
+    uniform_placement           d distinct uniformly random servers per chunk, sampled for all chunks at once
+    consistent_hash_placement   the d distinct servers following the chunk's point on a hash ring with
+                                virtual nodes (moving a server only moves the chunks next to it)
+    rendezvous_placement        the d servers with the highest hash(chunk, server) weight (HRW); this scores
+                                every server for every chunk, O(n * m), so it suits small clusters only
+"""
+import numpy as np
+
+from cluster import Cluster
+
+
+class Placement:
+    def __init__(self, indptr, indices, num_servers):
+        """
+        :param indptr: int64 array of n + 1 offsets into indices.
+        :param indices: Server ID of every replica, grouped by chunk.
+        :param num_servers: Number of servers (m).
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices)
+        self.num_servers = num_servers
+        self.metadata = {}  # How the placement was built (builder, seed), kept by placement_store
+
+        # Server -> chunks: sorting the unique keys server * n + chunk groups replicas by server, chunks ascending
+        n = self.num_chunks
+        chunk_of_replica = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        keys = np.sort(self.indices.astype(np.int64) * max(n, 1) + chunk_of_replica)
+        self.server_indices = (keys % max(n, 1)).astype(self.indices.dtype)
+        self.server_indptr = np.zeros(num_servers + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=num_servers), out=self.server_indptr[1:])
+
+    @classmethod
+    def from_arrays(cls, indptr, indices, num_servers, server_indptr, server_indices, metadata=None):
+        """
+        Wraps existing CSR arrays of both directions (e.g. memory-mapped ones) without copying or re-sorting.
+        """
+        placement = cls.__new__(cls)
+        placement.indptr, placement.indices = indptr, indices
+        placement.server_indptr, placement.server_indices = server_indptr, server_indices
+        placement.num_servers = num_servers
+        placement.metadata = dict(metadata or {})
+        return placement
+
+    @classmethod
+    def from_mapping(cls, chunk_to_servers, num_servers):
+        """
+        Builds a Placement from a chunk-to-server dictionary (chunk IDs 0..n-1).
+        """
+        n = max(chunk_to_servers) + 1 if chunk_to_servers else 0
+        counts = np.zeros(n, dtype=np.int64)
+        for chunk_id, assigned_servers in chunk_to_servers.items():
+            counts[chunk_id] = len(assigned_servers)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        for chunk_id, assigned_servers in chunk_to_servers.items():
+            indices[indptr[chunk_id]:indptr[chunk_id + 1]] = assigned_servers
+        return cls(indptr, indices, num_servers)
+
+    @property
+    def num_chunks(self):
+        return self.indptr.size - 1
+
+    def replicas(self, chunk_id):
+        return self.indices[self.indptr[chunk_id]:self.indptr[chunk_id + 1]]
+
+    def chunks_of(self, server_id):
+        return self.server_indices[self.server_indptr[server_id]:self.server_indptr[server_id + 1]]
+
+    def to_mapping(self):
+        """
+        Returns the chunk-to-server dictionary used by the simulations (slow for millions of chunks).
+        """
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        return {chunk_id: indices[indptr[chunk_id]:indptr[chunk_id + 1]] for chunk_id in range(self.num_chunks)}
+
+    def server_to_chunks(self):
+        """
+        Returns the server-to-chunk dictionary, as returned by the Init_Servers_* functions.
+        """
+        indptr, chunks = self.server_indptr.tolist(), self.server_indices.tolist()
+        return {server_id: chunks[indptr[server_id]:indptr[server_id + 1]] for server_id in range(self.num_servers)}
+
+    def cluster(self, servers):
+        """
+        Returns a Cluster of the given servers indexed with this placement.
+        """
+        return Cluster.from_csr(servers, self.indptr, self.indices)  # int64 arrays are used in place
+
+
+def _server_dtype(m):
+    return np.int32 if m <= np.iinfo(np.int32).max else np.int64
+
+
+# Redraws of the rows holding a server twice before uniform_placement falls back to permutations
+REDRAWS = 8
+
+
+def _built(table, m, builder, seed):
+    n, d = table.shape
+    placement = Placement(np.arange(0, n * d + 1, d, dtype=np.int64), table.ravel(), m)
+    placement.metadata = {"builder": builder, "seed": seed}
+    return placement
+
+
+def _duplicate_rows(table):
+    """
+    Returns a mask of the rows of a 2-D table holding some value twice.
+    """
+    ordered = np.sort(table, axis=1)
+    return (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+
+
+def uniform_placement(n, m, d, seed=None):
+    """
+    Places every chunk on d distinct uniformly random servers (like generate_chunk_to_servers_mapping).
+    All rows are drawn at once; the few rows that drew a server twice are drawn again. When d is close to m
+    almost every row holds a duplicate, so rows still left after REDRAWS rounds take the first d servers of a
+    random permutation instead.
+    """
+    if d > m:
+        raise ValueError(f"Cannot place {d} distinct replicas on {m} servers")
+    rng = np.random.default_rng(seed)
+    table = rng.integers(0, m, size=(n, d), dtype=_server_dtype(m))
+    if d > 1:
+        redo = np.flatnonzero(_duplicate_rows(table))
+        for _ in range(REDRAWS):
+            if not redo.size:
+                break
+            table[redo] = rng.integers(0, m, size=(redo.size, d), dtype=table.dtype)
+            redo = redo[_duplicate_rows(table[redo])]
+        if redo.size:
+            table[redo] = np.argsort(rng.random((redo.size, m)), axis=1)[:, :d]
+    return _built(table, m, "uniform", seed)
+
+
+def _mix64(values):
+    """
+    SplitMix64 finalizer over a uint64 array: a fast, well-distributed integer hash.
+    """
+    values = values.astype(np.uint64)
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+
+def consistent_hash_placement(n, m, d, vnodes=64, seed=0):
+    """
+    Consistent hashing: each server owns `vnodes` points on a 64-bit ring, and a chunk is placed on the
+    first d distinct servers met walking clockwise from its own hash.
+    """
+    if d > m:
+        raise ValueError(f"Cannot place {d} distinct replicas on {m} servers")
+    salt = np.uint64(seed * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+    points = _mix64(np.arange(m * vnodes, dtype=np.uint64) ^ salt)
+    order = np.argsort(points)
+    ring_points = points[order]
+    ring_servers = (order // vnodes).astype(_server_dtype(m))
+
+    # Chunks are handled in ring order, which keeps the searches and the walks below cache friendly
+    chunk_points = _mix64(np.arange(n, dtype=np.uint64) + (salt ^ np.uint64(1 << 63)))
+    by_point = np.argsort(chunk_points)
+    start = np.searchsorted(ring_points, chunk_points[by_point])
+    table = np.empty((n, d), dtype=ring_servers.dtype)
+
+    # Look `window` points ahead for every chunk; the rare chunks that need more are widened and retried.
+    # Work column by column (one ring step for all chunks at a time), which keeps every operation contiguous.
+    # Walks wrap around the ring, possibly several times when the window is longer than the ring.
+    pending = np.arange(n)
+    window = 2 * d
+    size = ring_servers.size
+    while pending.size:
+        base = start[pending] % size
+        steps = [ring_servers[(base + k) % size] for k in range(window)]
+        picks = [np.empty(pending.size, dtype=ring_servers.dtype) for _ in range(d)]
+        found = np.zeros(pending.size, dtype=np.int32)  # Distinct servers met so far
+        for k in range(window):
+            is_new = np.ones(pending.size, dtype=bool)
+            for j in range(k):
+                is_new &= steps[k] != steps[j]
+            for slot in range(d):
+                take = is_new & (found == slot)
+                picks[slot][take] = steps[k][take]
+            found += is_new
+
+        done = found >= d
+        rows = by_point[pending[done]]
+        for slot in range(d):
+            table[rows, slot] = picks[slot][done]
+        pending = pending[~done]
+        window *= 2
+    return _built(table, m, "consistent_hash", seed)
+
+
+def rendezvous_placement(n, m, d, seed=0, block_entries=1 << 22):
+    """
+    Rendezvous (highest random weight) hashing: a chunk is placed on the d servers with the largest
+    hash(chunk, server), in decreasing weight. Costs O(n * m) hashes, computed in blocks of chunks.
+
+    :param block_entries: Upper bound on chunk x server weights held in memory at once.
+    """
+    if d > m:
+        raise ValueError(f"Cannot place {d} distinct replicas on {m} servers")
+    salt = np.uint64(seed * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+    server_keys = _mix64(np.arange(m, dtype=np.uint64) ^ salt)
+    table = np.empty((n, d), dtype=_server_dtype(m))
+    block = max(1, block_entries // m)
+    for first in range(0, n, block):
+        chunks = np.arange(first, min(first + block, n), dtype=np.uint64)
+        weights = _mix64(_mix64(chunks)[:, None] ^ server_keys[None, :])
+        top = np.argpartition(weights, m - d, axis=1)[:, m - d:] if d < m else np.tile(np.arange(m), (chunks.size, 1))
+        top_weights = np.take_along_axis(weights, top, axis=1)
+        ranked = np.take_along_axis(top, np.argsort(top_weights, axis=1)[:, ::-1], axis=1)
+        table[first:first + chunks.size] = ranked
+    return _built(table, m, "rendezvous", seed)
@@ -0,0 +1,146 @@
+"""
+On-disk placements that open in O(1) and are shared through the page cache.
+
+save_placement writes a Placement once; open_placement maps its arrays with numpy.memmap, so opening costs
+the same for ten chunks or ten million, nothing is copied into the process heap, and every process (sweep
+workers, sharded workers, repeated runs) that opens the same file shares the same physical pages. All arrays
+are stored as int64, the type the engines and Cluster index with, so they are used in place, never converted.
+
+File layout (little-endian):
+    header   magic b"LBPL", version u8, flags u8 (bit 0: checksum present), server ID size u8 (4 or 8),
+             1 reserved byte, n u64, m u64, d u32 (0 if chunks have different replica counts),
+             crc32 of the payload u32, seed i64 (-1 if unknown), then the byte offsets (u64) of
+             indptr, indices, server_indptr and server_indices
+    payload  the four arrays of placement.Placement, each starting on a 64-byte boundary; offsets are int64,
+             server and chunk IDs use the server ID size (8 when written by save_placement; files with 4-byte
+             IDs still open, but their ID arrays are converted when an engine uses them)
+"""
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from placement import Placement
+
+HEADER = struct.Struct("<4sBBBxQQIIq4Q")
+MAGIC = b"LBPL"
+VERSION = 1
+HAS_CHECKSUM = 1
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _crc32(arrays, block=1 << 24):
+    crc = 0
+    for array in arrays:
+        data = memoryview(np.ascontiguousarray(array)).cast("B")
+        for start in range(0, len(data), block):
+            crc = zlib.crc32(data[start:start + block], crc)
+    return crc
+
+
+def save_placement(path, placement, seed=None, checksum=True):
+    """
+    Writes a placement to `path` (atomically: readers never see a partial file).
+
+    :param seed: Seed the placement was built with; defaults to placement.metadata["seed"] (-1 if unknown).
+    :param checksum: Store a crc32 of the payload, checked by verify() and open_placement(verify=True).
+    """
+    if seed is None:
+        seed = placement.metadata.get("seed")
+    seed = -1 if seed is None else seed
+
+    id_dtype = np.dtype("<i8")  # What the engines index with (see the module notes)
+    arrays = [
+        np.asarray(placement.indptr, dtype="<i8"),
+        np.asarray(placement.indices, dtype=id_dtype),
+        np.asarray(placement.server_indptr, dtype="<i8"),
+        np.asarray(placement.server_indices, dtype=id_dtype),
+    ]
+    counts = np.diff(arrays[0])
+    d = int(counts[0]) if counts.size and (counts == counts[0]).all() else 0
+
+    offsets = []
+    offset = _align(HEADER.size)
+    for array in arrays:
+        offsets.append(offset)
+        offset = _align(offset + array.nbytes)
+
+    crc = _crc32(arrays) if checksum else 0
+    header = HEADER.pack(MAGIC, VERSION, HAS_CHECKSUM if checksum else 0, id_dtype.itemsize, placement.num_chunks,
+                         placement.num_servers, d, crc, seed, *offsets)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        for array, start in zip(arrays, offsets):
+            f.seek(start)
+            array.tofile(f)
+        f.truncate(offset)
+    os.replace(temporary, path)
+
+
+def read_header(path):
+    """
+    Returns the metadata of a placement file: n, m, d, seed, whether it has a checksum, and the array layout.
+
+    :raises ValueError: If the file is not a complete placement file of this version.
+    """
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+        size = f.seek(0, 2)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is not a placement file")
+    magic, version, flags, id_size, n, m, d, crc, seed, *offsets = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} placement file")
+
+    id_dtype = np.dtype("<i4" if id_size == 4 else "<i8")
+    header = {"num_chunks": n, "num_servers": m, "d": d, "seed": None if seed < 0 else seed,
+              "checksum": crc if flags & HAS_CHECKSUM else None, "offsets": offsets, "id_dtype": id_dtype}
+
+    # The indptr arrays give the lengths of the others; check the file holds all of them
+    with open(path, "rb") as f:
+        f.seek(offsets[0] + 8 * n)
+        nnz = int(np.frombuffer(f.read(8), dtype="<i8")[0]) if n else 0
+    header["lengths"] = [n + 1, nnz, m + 1, nnz]
+    itemsizes = [8, id_dtype.itemsize, 8, id_dtype.itemsize]
+    if offsets[3] + nnz * itemsizes[3] > size:
+        raise ValueError(f"{path} is truncated")
+    return header
+
+
+def open_placement(path, verify=False):
+    """
+    Maps a placement file read-only. Only the header is read; array pages are loaded on first access.
+
+    :param verify: Check the payload against the stored checksum first (reads the whole file once).
+    :return: Placement whose arrays are numpy.memmap views of the file; metadata holds n, m, d, seed.
+    :raises ValueError: If the file is invalid, or verify is set and the checksum does not match.
+    """
+    header = read_header(path)
+    dtypes = [np.dtype("<i8"), header["id_dtype"], np.dtype("<i8"), header["id_dtype"]]
+    arrays = [np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(length,)) if length else np.zeros(0, dtype)
+              for dtype, offset, length in zip(dtypes, header["offsets"], header["lengths"])]
+
+    if verify and header["checksum"] is not None and _crc32(arrays) != header["checksum"]:
+        raise ValueError(f"{path} is corrupted (checksum mismatch)")
+
+    metadata = {key: header[key] for key in ("num_chunks", "num_servers", "d", "seed")}
+    metadata["path"] = path
+    return Placement.from_arrays(arrays[0], arrays[1], header["num_servers"], arrays[2], arrays[3], metadata)
+
+
+def verify(path):
+    """
+    Returns True if the payload matches the stored checksum (or the file has none).
+    """
+    try:
+        open_placement(path, verify=True)
+    except ValueError:
+        return False
+    return True
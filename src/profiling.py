@@ -0,0 +1,239 @@
+"""
+Opt-in instrumentation of the simulation loop.
+
+Phase timing: simulate() splits every interval into phases (request generation, routing, processing,
+metrics, tracing) and reports each one to the process-wide profiler. Call sites guard on a single flag:
+
+    if profiler.enabled:
+        profiler.lap(ROUTE)
+
+so with profiling disabled (the default) that guard is the only cost. lap(phase) charges the time since the
+previous lap (or mark) to `phase`.
+
+Call counting: configure(count_calls=True) wraps the strategy functions of chunk_assignment (and the server
+processing methods) with counters; they are unwrapped again by configure(False).
+
+Whole-run profiles: profile_call runs any callable under cProfile (deterministic) or a sampling profiler (a
+thread that records the main thread's stack every few milliseconds, cheap enough for long runs).
+
+    profiling.configure(True, count_calls=True)
+    simulation.simulate("Greedy", ...)
+    print(profiling.profiler.report())
+    metrics, text = profiling.profile_call(simulation.simulate, "Cuckoo", mode="sample")
+"""
+import cProfile
+import collections
+import functools
+import io
+import pstats
+import sys
+import threading
+import time
+
+import chunk_assignment as ca
+import server as se
+
+# Phases of an interval
+SETUP = "setup"
+WORKLOAD = "workload"
+ROUTE = "route"
+PROCESS = "process"
+METRICS = "metrics"
+TRACE = "trace"
+FINISH = "finish"
+
+PHASES = [SETUP, WORKLOAD, ROUTE, PROCESS, METRICS, TRACE, FINISH]
+
+# (owner, attribute) pairs wrapped by count_calls
+COUNTED = [
+    (ca, "adversary_assign_chunks_avgcase"),
+    (ca, "assign_chunk_to_random_server"),
+    (ca, "assign_m_chunk_greedy"),
+    (ca, "cuckoo_route"),
+    (ca, "choose_random_server"),
+    (ca, "choose_greedy_server"),
+    (ca.CuckooRouter, "route"),
+    (se.Server, "add_request"),
+    (se.Server, "process_request"),
+    (se.CuckooServer, "add_to_Q"),
+    (se.CuckooServer, "add_to_P"),
+    (se.CuckooServer, "process_request"),
+]
+
+
+class Profiler:
+    __slots__ = ("enabled", "seconds", "laps", "calls", "_last", "_originals")
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.seconds = collections.defaultdict(float)  # Phase -> total seconds
+        self.laps = collections.Counter()  # Phase -> number of laps
+        self.calls = collections.Counter()  # Counted function -> calls
+        self._last = time.perf_counter()
+        self._originals = []  # (owner, attribute, original) of the wrapped functions
+
+    def mark(self):
+        """
+        Starts timing: the next lap is measured from now.
+        """
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Charges the time since the previous lap or mark to `phase`.
+        """
+        now = time.perf_counter()
+        self.seconds[phase] += now - self._last
+        self.laps[phase] += 1
+        self._last = now
+
+    def _counting(self, name, function):
+        calls = self.calls
+
+        @functools.wraps(function)
+        def counted(*args, **kwargs):
+            calls[name] += 1
+            return function(*args, **kwargs)
+        return counted
+
+    def count_calls(self, targets=COUNTED):
+        """
+        Wraps the given (owner, attribute) functions with call counters (once; see restore).
+        """
+        for owner, attribute in targets:
+            if any(owner is o and attribute == a for o, a, _ in self._originals):
+                continue
+            original = owner.__dict__[attribute]
+            name = f"{owner.__name__}.{attribute}"
+            setattr(owner, attribute, self._counting(name, original))
+            self._originals.append((owner, attribute, original))
+
+    def restore(self):
+        """
+        Unwraps every function wrapped by count_calls.
+        """
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals = []
+
+    def reset(self):
+        self.seconds.clear()
+        self.laps.clear()
+        self.calls.clear()
+
+    def summary(self):
+        """
+        Returns {"phases": {phase: (seconds, laps)}, "calls": {function: calls}}.
+        """
+        order = PHASES + sorted(phase for phase in self.seconds if phase not in PHASES)
+        return {
+            "phases": {phase: (self.seconds[phase], self.laps[phase]) for phase in order if phase in self.seconds},
+            "calls": dict(self.calls.most_common()),
+        }
+
+    def report(self):
+        """
+        Returns the phase times (with their share of the total) and call counts as text.
+        """
+        summary = self.summary()
+        total = sum(seconds for seconds, _ in summary["phases"].values())
+        lines = [f"{'phase':12} {'seconds':>10} {'share':>7} {'laps':>8} {'us/lap':>9}"]
+        for phase, (seconds, laps) in summary["phases"].items():
+            share = seconds / total if total else 0.0
+            lines.append(f"{phase:12} {seconds:10.4f} {share:7.1%} {laps:8} {1e6 * seconds / laps if laps else 0:9.1f}")
+        lines.append(f"{'total':12} {total:10.4f}")
+        if summary["calls"]:
+            lines.append("")
+            lines.append(f"{'function':48} {'calls':>12}")
+            for name, calls in summary["calls"].items():
+                lines.append(f"{name:48} {calls:12}")
+        return "\n".join(lines)
+
+
+# Process-wide profiler used by simulate(); configure() changes it in place
+profiler = Profiler()
+
+
+def configure(enabled=False, count_calls=False):
+    """
+    Enables or disables the process-wide profiler, clearing what it recorded so far.
+
+    :param count_calls: Also count calls of the strategy functions (wraps them, which slows routing down).
+    :return: The profiler.
+    """
+    profiler.restore()
+    profiler.reset()
+    profiler.enabled = enabled
+    if enabled and count_calls:
+        profiler.count_calls()
+    return profiler
+
+
+class _Sampler(threading.Thread):
+    """
+    Records the stack of one thread every `interval` seconds.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.own = collections.Counter()  # Function on top of the stack
+        self.inclusive = collections.Counter()  # Function anywhere on the stack
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[_frame_name(frame)] += 1
+            seen = set()
+            while frame is not None:
+                seen.add(_frame_name(frame))
+                frame = frame.f_back
+            self.inclusive.update(seen)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def report(self, top):
+        lines = [f"{self.samples} samples every {1000 * self.interval:g} ms",
+                 f"{'own':>7} {'total':>7}  function"]
+        for name, count in self.own.most_common(top):
+            lines.append(f"{count / self.samples:7.1%} {self.inclusive[name] / self.samples:7.1%}  {name}")
+        return "\n".join(lines)
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+
+
+def profile_call(function, *args, mode="deterministic", interval=0.005, top=25, **kwargs):
+    """
+    Runs function(*args, **kwargs) under a profiler.
+
+    :param mode: "deterministic" (cProfile: exact call counts, slows Python code down several times) or
+                 "sample" (stack samples every `interval` seconds: statistical, nearly free).
+    :param top: Number of functions in the report.
+    :return: (result of the call, report text).
+    """
+    if mode == "deterministic":
+        profile = cProfile.Profile()
+        result = profile.runcall(function, *args, **kwargs)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(top)
+        return result, out.getvalue()
+    if mode == "sample":
+        sampler = _Sampler(threading.get_ident(), interval)
+        sampler.start()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            sampler.stop()
+        return result, sampler.report(top)
+    raise ValueError(f"Unknown profiling mode {mode}")
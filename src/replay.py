@@ -0,0 +1,177 @@
+"""
+Record and replay of routing decisions.
+
+TraceRecorder appends one fixed-size record per routed request to a binary file:
+
+    interval int32, chunk_id int32, server_id int32 (-1 if the chunk has no replica), accepted int32 (0 or 1)
+
+all little-endian, no header, so a recording can be appended to across runs and a crashed run leaves at most
+one torn record at the end (ignored on reading). load_trace maps the file with numpy.memmap. An interval in
+which nothing was routed is written as a single marker record (chunk_id and server_id -1, accepted -1), so
+replays keep its time step.
+
+TraceReplayer feeds a recording back without any pacing: as a workload stream through any strategy
+(A/B comparison, regression benchmarks) or by re-applying the recorded routing decisions.
+"""
+import sys
+import time
+from array import array
+
+import numpy as np
+
+import simulation
+
+RECORD = np.dtype([("interval", "<i4"), ("chunk_id", "<i4"), ("server_id", "<i4"), ("accepted", "<i4")])
+MARKER = -1  # `accepted` of the record standing for an interval without requests
+
+
+class TraceRecorder:
+    """
+    Pass as `recorder` to adversary_assign_chunks_avgcase, assign_m_chunks_randomly or simulate.
+    Set `interval` before routing each interval (simulate does it); an interval set this way that records
+    nothing gets a marker record.
+    """
+
+    def __init__(self, path, buffer_records=65536):
+        """
+        :param path: File to append to (created if missing).
+        :param buffer_records: Records kept in memory between writes.
+        """
+        self.file = open(path, "ab")
+        self._interval = 0
+        self._empty = False  # The current interval was set and nothing was recorded in it yet
+        self.recorded = 0
+        self._buffer = array("i")
+        self._buffer_values = 4 * buffer_records
+
+    @property
+    def interval(self):
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval):
+        self._mark_empty()
+        self._interval = interval
+        self._empty = True
+
+    def _mark_empty(self):
+        if self._empty:
+            self._buffer.extend((self._interval, -1, -1, MARKER))
+            self._empty = False
+
+    def record(self, chunk_id, server_id, accepted):
+        self._buffer.extend((self._interval, chunk_id, server_id, 1 if accepted is True else 0))
+        self._empty = False
+        self.recorded += 1
+        if len(self._buffer) >= self._buffer_values:
+            self.flush()
+
+    def flush(self):
+        if sys.byteorder != "little":
+            self._buffer.byteswap()
+        self.file.write(self._buffer.tobytes())
+        self.file.flush()
+        self._buffer = array("i")
+
+    def close(self):
+        self._mark_empty()
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_trace(path):
+    """
+    Maps a recording as a structured NumPy array with the fields of RECORD (read-only, nothing is loaded
+    until accessed).
+    """
+    count = _file_size(path) // RECORD.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", shape=(count,))
+
+
+def _file_size(path):
+    with open(path, "rb") as f:
+        return f.seek(0, 2)
+
+
+class TraceReplayer:
+    def __init__(self, path):
+        self.records = load_trace(path)
+
+        # Records are grouped by interval; bounds[i]:bounds[i + 1] is the i-th recorded interval
+        intervals = self.records["interval"]
+        changes = np.flatnonzero(intervals[1:] != intervals[:-1]) + 1
+        self.bounds = np.concatenate(([0], changes, [len(intervals)])) if len(intervals) else np.zeros(1, dtype=np.int64)
+
+    @property
+    def num_intervals(self):
+        return len(self.bounds) - 1
+
+    def batches(self):
+        """
+        The recorded requests as a workload stream (one batch per recorded interval, empty for an interval
+        without requests), for simulate(workload=...).
+        """
+        chunk_ids, accepted = self.records["chunk_id"], self.records["accepted"]
+        for i in range(self.num_intervals):
+            start, end = self.bounds[i], self.bounds[i + 1]
+            batch = np.asarray(chunk_ids[start:end], dtype=np.int64)
+            yield batch[accepted[start:end] != MARKER]
+
+    def recorded_summary(self):
+        """
+        Accepted and rejected counts of the recording itself.
+        """
+        flags = self.records["accepted"]
+        accepted = int(np.count_nonzero(flags == 1))
+        return {"accepted": accepted, "rejected": int(np.count_nonzero(flags == 0))}
+
+    def replay_decisions(self, servers):
+        """
+        Re-applies the recorded routing decisions to fresh plain servers: every request goes to the recorded
+        server, then every server processes, once per recorded interval.
+
+        :param servers: Cluster or list of Server objects indexed by server ID, with the recorded g and q.
+        :return: (accepted, rejected, mismatches), mismatches being requests whose admission differs from the
+                 recording (0 when the servers match the recorded run).
+        """
+        by_id = {server.server_id: server for server in servers}
+        accepted, rejected, mismatches = 0, 0, 0
+        for i in range(self.num_intervals):
+            part = self.records[self.bounds[i]:self.bounds[i + 1]]
+            for chunk_id, server_id, was_accepted in zip(part["chunk_id"].tolist(), part["server_id"].tolist(),
+                                                         part["accepted"].tolist()):
+                if was_accepted == MARKER:
+                    continue
+                ok = server_id >= 0 and by_id[server_id].add_request(chunk_id)
+                if ok:
+                    accepted += 1
+                else:
+                    rejected += 1
+                if ok != bool(was_accepted):
+                    mismatches += 1
+
+            for server in servers:
+                server.process_request()
+        return accepted, rejected, mismatches
+
+    def compare(self, strategies, chunk_to_servers, num_servers, num_chunks, g, q, J=3, Engine="Object"):
+        """
+        A/B comparison: runs the recorded request sequence through each strategy as fast as possible.
+
+        :return: Dictionary strategy -> summary (see MetricsCollector.summary) plus "seconds".
+        """
+        results = {}
+        for Type in strategies:
+            start = time.perf_counter()
+            metrics = simulation.simulate(Type, chunk_to_servers, None, num_servers, num_chunks, g=g, q=q, J=J,
+                                          total_intervals=self.num_intervals, Engine=Engine, workload=self.batches())
+            results[Type] = dict(metrics.summary(), seconds=time.perf_counter() - start)
+        return results
@@ -0,0 +1,306 @@
+class RingBuffer:
+    """
+    Fixed-capacity FIFO queue backed by a circular list.
+    append and popleft are O(1), unlike list.pop(0) which shifts every remaining element. The list is
+    allocated on demand, doubling up to the capacity, so the many queues that never fill stay small.
+    """
+
+    __slots__ = ("_items", "_head", "_size", "_capacity")
+
+    def __init__(self, capacity, items=()):
+        """
+        :param capacity: Maximum number of elements the buffer holds.
+        :param items: Optional initial elements (the buffer grows if they do not fit).
+        """
+        self._items = ()  # Allocated slots, at most `capacity` (a list from the first append on)
+        self._head = 0  # Index of the oldest element
+        self._size = 0
+        self._capacity = capacity
+        self.extend(items)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def is_full(self):
+        return self._size == self._capacity
+
+    def append(self, item):
+        """
+        Adds an element at the back.
+
+        :raises IndexError: If the buffer is full.
+        """
+        items = self._items
+        if self._size == len(items):
+            items = self._reserve()
+        items[(self._head + self._size) % len(items)] = item
+        self._size += 1
+
+    def popleft(self):
+        """
+        Removes and returns the oldest element.
+
+        :raises IndexError: If the buffer is empty.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty RingBuffer")
+        items = self._items
+        item = items[self._head]
+        items[self._head] = None  # Drop the reference
+        self._head = (self._head + 1) % len(items)
+        self._size -= 1
+        return item
+
+    def extend(self, items):
+        """
+        Appends every element of `items`, growing the capacity if they do not fit.
+        """
+        items = list(items)
+        if self._size + len(items) > self._capacity:
+            self._grow(self._size + len(items))
+        for item in items:
+            self.append(item)
+
+    def _grow(self, min_capacity):
+        self._capacity = max(min_capacity, 2 * self._capacity)
+
+    def _reserve(self):
+        """
+        Doubles the allocated slots (up to the capacity) once every one holds an element.
+
+        :return: The new list of slots.
+        :raises IndexError: If the buffer is full.
+        """
+        if self._size == self._capacity:
+            raise IndexError("append to a full RingBuffer")
+        self._reallocate(min(self._capacity, max(4, 2 * len(self._items))))
+        return self._items
+
+    def _reallocate(self, length):
+        self._items = list(self) + [None] * (length - self._size)
+        self._head = 0
+
+    def truncate(self, size):
+        """
+        Keeps the `size` oldest elements, dropping the newer ones.
+        """
+        items = self._items
+        for i in range(size, self._size):
+            items[(self._head + i) % len(items)] = None
+        self._size = min(self._size, size)
+
+    def clear(self):
+        """
+        Removes every element.
+        """
+        items = self._items
+        for i in range(self._size):
+            items[(self._head + i) % len(items)] = None
+        self._head = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        items, head, capacity = self._items, self._head, len(self._items)
+        for i in range(self._size):
+            yield items[(head + i) % capacity]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class TimedRingBuffer(RingBuffer):
+    """
+    RingBuffer that keeps a stamp (e.g. the enqueue interval) next to every element.
+    popleft returns the element alone, popleft_timed the element and its stamp.
+    """
+
+    __slots__ = ("_stamps",)
+
+    def __init__(self, capacity, items=()):
+        self._stamps = ()
+        super().__init__(capacity, items)
+
+    def append(self, item, stamp=0):
+        """
+        Adds an element at the back, stamped with `stamp`.
+
+        :raises IndexError: If the buffer is full.
+        """
+        items = self._items
+        if self._size == len(items):
+            items = self._reserve()
+        tail = (self._head + self._size) % len(items)
+        items[tail] = item
+        self._stamps[tail] = stamp
+        self._size += 1
+
+    def popleft_timed(self):
+        """
+        Removes the oldest element and returns it with its stamp, as (element, stamp).
+
+        :raises IndexError: If the buffer is empty.
+        """
+        stamp = self._stamps[self._head]
+        return self.popleft(), stamp
+
+    def extend(self, items):
+        """
+        Appends every element of `items`, growing the capacity if they do not fit. Elements of another
+        TimedRingBuffer keep their stamps, others are stamped 0.
+        """
+        if isinstance(items, TimedRingBuffer):
+            pairs = list(items.timed())
+        else:
+            pairs = [(item, 0) for item in items]
+        if self._size + len(pairs) > self._capacity:
+            self._grow(self._size + len(pairs))
+        for item, stamp in pairs:
+            self.append(item, stamp)
+
+    def _reallocate(self, length):
+        stamps = [stamp for _, stamp in self.timed()]
+        super()._reallocate(length)
+        self._stamps = stamps + [0] * (length - len(stamps))
+
+    def timed(self):
+        """
+        Iterates over (element, stamp) pairs, oldest first.
+        """
+        items, stamps, head, capacity = self._items, self._stamps, self._head, len(self._items)
+        for i in range(self._size):
+            yield items[(head + i) % capacity], stamps[(head + i) % capacity]
+
+    def take_matching(self, wanted, limit):
+        """
+        Removes up to `limit` of the oldest elements that are in `wanted` (a set), keeping the others in order.
+
+        :return: List of the removed (element, stamp) pairs, oldest first.
+        """
+        if not self._size or wanted.isdisjoint(self._items):  # Free slots hold None, so this scans in C
+            return []
+        taken = []
+        items, stamps, head, capacity = self._items, self._stamps, self._head, len(self._items)
+        kept = 0
+        for i in range(self._size):
+            position = (head + i) % capacity
+            item = items[position]
+            if len(taken) < limit and item in wanted:
+                taken.append((item, stamps[position]))
+                continue
+            if kept != i:  # Close the gap left by the removed elements
+                target = (head + kept) % capacity
+                items[target], stamps[target] = item, stamps[position]
+            kept += 1
+        for i in range(kept, self._size):
+            items[(head + i) % capacity] = None
+        self._size = kept
+        return taken
+
+
+class SegmentedQueue:
+    """
+    FIFO queue made of whole TimedRingBuffers (segments), for queues that take over another queue's
+    contents at once: push_segment appends a buffer in O(1) instead of copying its elements, and drained
+    segments are kept for reuse, so a long run allocates no new buffers. The number of elements is bounded
+    by `capacity`; elements that do not fit are dropped when their segment is pushed.
+    """
+
+    __slots__ = ("capacity", "_segments", "_spare", "_size")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._segments = []  # Oldest first; rarely more than a few, so popping the front is cheap
+        self._spare = []  # Drained segments, handed out again by take_spare
+        self._size = 0
+
+    def push_segment(self, segment):
+        """
+        Appends all elements of `segment` (which now belongs to this queue), dropping the newest ones
+        beyond the capacity.
+
+        :return: Number of dropped elements.
+        """
+        room = self.capacity - self._size
+        dropped = len(segment) - room if len(segment) > room else 0
+        if dropped:
+            segment.truncate(room)
+        if segment:
+            self._segments.append(segment)
+            self._size += len(segment)
+        else:
+            self._spare.append(segment)
+        return dropped
+
+    def take_spare(self, capacity):
+        """
+        Returns an empty TimedRingBuffer, reusing a drained segment when one is available.
+        """
+        while self._spare:
+            segment = self._spare.pop()
+            if segment.capacity >= capacity:
+                return segment
+        return TimedRingBuffer(capacity)
+
+    def popleft_timed(self):
+        """
+        Removes the oldest element and returns it with its stamp, as (element, stamp).
+
+        :raises IndexError: If the queue is empty.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty SegmentedQueue")
+        segment = self._segments[0]
+        pair = segment.popleft_timed()
+        if not segment:
+            del self._segments[0]
+            if len(self._spare) < 2:
+                self._spare.append(segment)
+        self._size -= 1
+        return pair
+
+    def popleft(self):
+        return self.popleft_timed()[0]
+
+    def take_matching(self, wanted, limit):
+        """
+        Removes up to `limit` of the oldest elements that are in `wanted` (a set), see TimedRingBuffer.take_matching.
+        """
+        taken = []
+        for segment in self._segments:
+            if len(taken) == limit:
+                break
+            taken += segment.take_matching(wanted, limit - len(taken))
+        if taken:
+            self._size -= len(taken)
+            drained = [segment for segment in self._segments if not segment]
+            self._segments = [segment for segment in self._segments if segment]
+            self._spare += drained[:max(0, 2 - len(self._spare))]
+        return taken
+
+    def clear(self):
+        for segment in self._segments:
+            segment.clear()
+            if len(self._spare) < 2:
+                self._spare.append(segment)
+        self._segments.clear()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for segment in self._segments:
+            yield from segment
+
+    def __repr__(self):
+        return repr(list(self))
@@ -1,19 +1,37 @@
+import itertools
 import random
 
+from ring_buffer import SegmentedQueue, TimedRingBuffer
+from streaming_metrics import LogHistogram
+
+# Equal DRR weights of Q, P, Q', P' (see CuckooServer)
+DEFAULT_WEIGHTS = (1, 1, 1, 1)
+
+
 class Server:
-    def __init__(self, processing_rate=3, max_queue_size=10, server_id=None):
+    # No per-instance __dict__: clusters hold hundreds of thousands of servers
+    __slots__ = ("processing_rate", "queue", "max_queue_size", "server_id", "chunks", "clock", "waits",
+                 "_pending", "coalesced")
+
+    def __init__(self, processing_rate=3, max_queue_size=10, server_id=None, coalesce=False):
         """
         Constructor for the Server class.
         
         :param processing_rate: Number of requests the server can process per time step (default is 3).
         :param max_queue_size: Maximum size of the request queue (default is 10).
         :param server_id: A unique identifier for the server (default is None).
+        :param coalesce: Attach a request for a chunk that is already queued to the queued request instead of
+                         queueing it again; the one processing slot then serves every attached request.
         """
         self.processing_rate = processing_rate  # Requests processed per time step (e.g., per second)
-        self.queue = []  # List to simulate the request queue
+        self.queue = TimedRingBuffer(max_queue_size)  # Fixed-size FIFO request queue, stamped with the enqueue time step
         self.max_queue_size = max_queue_size  # Maximum size of the queue
         self.server_id = server_id  # Unique identifier for this server
         self.chunks = []  # List of chunks assigned to this server
+        self.clock = 0  # Time steps processed so far
+        self.waits = LogHistogram()  # Time steps each processed request waited (0: processed in its own step)
+        self._pending = {} if coalesce else None  # Queued chunk -> enqueue stamps of the requests attached to it
+        self.coalesced = 0  # Requests attached to an already queued request of the same chunk
 
 
     def add_request(self, chunk_id):
@@ -21,13 +39,43 @@ class Server:
         Adds a request to the server's queue if there's space.
         
         :param chunk_id: The chunk ID to be added to the queue.
-        :return: True if added successfully, False if the queue is full.
+        :return: True if added (or attached to a queued request of the chunk) successfully, False if the queue is full.
         """
+        if self._pending is not None and chunk_id in self._pending:
+            return self._attach(chunk_id)
         if len(self.queue) < self.max_queue_size:
-            self.queue.append(chunk_id)
+            self.queue.append(chunk_id, self.clock)
+            if self._pending is not None:
+                self._pending[chunk_id] = None
             return True
         else:
             return False
+
+    def _attach(self, chunk_id):
+        """
+        Coalesces a request into the queued request for the same chunk.
+        """
+        waiters = self._pending[chunk_id]
+        if waiters is None:
+            self._pending[chunk_id] = [self.clock]
+        else:
+            waiters.append(self.clock)
+        self.coalesced += 1
+        return True
+
+    def _serve_waiters(self, chunk_id, clock):
+        """
+        Releases the requests attached to a queued request that was just served, recording their waits.
+
+        :return: Number of attached requests.
+        """
+        waiters = self._pending.pop(chunk_id)
+        if not waiters:
+            return 0
+        waits = self.waits
+        for stamp in waiters:
+            waits.add(clock - stamp)
+        return len(waiters)
         
     def evict_chunk(self):
         """
@@ -37,7 +85,9 @@ class Server:
         :return: The evicted chunk ID or None if no eviction is possible.
         """
         if self.queue:
-            evicted_chunk = self.queue.pop(0)  # Remove the first chunk (FIFO eviction)
+            evicted_chunk = self.queue.popleft()  # Remove the first chunk (FIFO eviction)
+            if self._pending is not None:
+                self._pending.pop(evicted_chunk, None)  # Attached requests go with it
             return evicted_chunk
         return None
     
@@ -52,16 +102,69 @@ class Server:
 
     def process_request(self):
         """
-        Processes the requests in the server's queue, removing up to `processing_rate` requests.
+        Processes the requests in the server's queue, removing up to `processing_rate` requests,
+        and records how long each of them waited.
         
         :return: List of processed requests (chunk IDs).
         """
         processed_requests = []
+        queue, clock, waits, pending = self.queue, self.clock, self.waits, self._pending
         for _ in range(self.processing_rate):
-            if self.queue:
-                processed_requests.append(self.queue.pop(0))  # Remove and process the first chunk
+            if queue:
+                chunk_id, stamp = queue.popleft_timed()  # Remove and process the first chunk
+                waits.add(clock - stamp)
+                if pending is not None:
+                    self._serve_waiters(chunk_id, clock)  # One slot serves every attached request
+                processed_requests.append(chunk_id)
+        self.clock += 1
         return processed_requests
 
+    def serve_next(self):
+        """
+        Processes the request at the head of the queue with one processing slot at the current clock, recording
+        its wait and serving the requests attached to it (for engines that serve requests one at a time).
+
+        :return: (chunk ID, number of requests served).
+        """
+        chunk_id, stamp = self.queue.popleft_timed()
+        self.waits.add(self.clock - stamp)
+        served = 1
+        if self._pending is not None:
+            served += self._serve_waiters(chunk_id, self.clock)
+        return chunk_id, served
+
+    def take_requests(self, wanted, limit):
+        """
+        Removes up to `limit` queued requests for chunks in `wanted` (a set), oldest first, for another server
+        to process (see work_stealing).
+
+        :return: List of (chunk ID, enqueue stamp) pairs.
+        """
+        return self._release_waiters(self.queue.take_matching(wanted, limit))
+
+    def _release_waiters(self, taken):
+        """
+        Serves the requests attached to requests taken by another server: the thief processes the queued
+        request in the time step just processed, which serves them too.
+        """
+        if self._pending is not None:
+            for chunk_id, _ in taken:
+                self._serve_waiters(chunk_id, self.clock - 1)
+        return taken
+
+    def process_stolen(self, taken):
+        """
+        Processes requests taken from a peer's queue with the slots left over in the time step just processed,
+        recording their queueing delay like that of the server's own requests.
+
+        :param taken: (chunk ID, enqueue stamp) pairs, as returned by take_requests.
+        :return: List of processed requests (chunk IDs).
+        """
+        clock, waits = self.clock - 1, self.waits  # process_request already advanced the clock
+        for _, stamp in taken:
+            waits.add(clock - stamp)
+        return [chunk_id for chunk_id, _ in taken]
+
     def get_queue_status(self):
         """
         Returns the current number of requests in the queue.
@@ -72,7 +175,11 @@ class Server:
         return f"Server-{self.server_id}(processing_rate={self.processing_rate}, queue_size={len(self.queue)}/{self.max_queue_size},queue elements= {self.queue} ,chunks={self.chunks}, )"
 
 class CuckooServer(Server):
-    def __init__(self, processing_rate=3, max_queue_size=10, server_id=None, J=5):
+    __slots__ = ("Q", "P", "Q_prime", "P_prime", "I", "J", "overflow", "_queued", "scheduler", "weights",
+                 "_deficits", "_turn", "_credited", "on_drop")
+
+    def __init__(self, processing_rate=3, max_queue_size=10, server_id=None, J=5, prime_capacity=None,
+                 scheduler="static", weights=None, coalesce=False):
         """
         Constructor for the CuckooServer class, inheriting from the base Server class.
         
@@ -80,14 +187,38 @@ class CuckooServer(Server):
         :param max_queue_size: Maximum size of the request queue (default is 10).
         :param server_id: A unique identifier for the server (default is None).
         :param J: The number of time steps in one phase.
+        :param prime_capacity: Maximum number of requests held in Q' and in P' each (default: max_queue_size);
+                               leftovers that do not fit at a phase change are dropped and counted in `overflow`
+                               (reported as `dropped` and in the loss rate, see MetricsCollector).
+        :param scheduler: "static" (the default: a fixed processing_rate // 4 requests per queue, nothing at
+                          all if g < 4) or "drr" (deficit round robin over Q, P, Q', P': work-conserving, every
+                          time step serves up to processing_rate requests from whichever queues have work).
+        :param weights: DRR weights of Q, P, Q', P' (default equal); a backlogged queue gets a share of the
+                        processing rate proportional to its weight.
+        :param coalesce: Attach a request for a chunk queued in any of the four queues to the queued request
+                         (see Server).
         """
-        super().__init__(processing_rate, max_queue_size, server_id)
+        super().__init__(processing_rate, max_queue_size, server_id, coalesce)
+        prime_capacity = max_queue_size if prime_capacity is None else prime_capacity
+        if scheduler not in ["drr", "static"]:
+            raise ValueError(f"Unknown scheduler {scheduler}")
+        weights = DEFAULT_WEIGHTS if weights is None else tuple(weights)
+        if len(weights) != 4 or min(weights) <= 0:
+            raise ValueError("DRR needs four positive weights (Q, P, Q', P')")
+        self.scheduler = scheduler
+        self.weights = weights
+        self._deficits = [0, 0, 0, 0]  # Service each queue may still get in its current DRR turn
+        self._turn = 0  # Queue whose DRR turn it is
+        self._credited = False  # Whether that queue already got its quantum for this turn
         
         # Maintain four queues for cuckoo routing
-        self.Q = []  # Queue for new requests in the current phase
-        self.P = []  # Queue for repeated requests in the current phase
-        self.Q_prime = []  # Queue for leftover requests from previous phases
-        self.P_prime = []  # Queue for repeated requests from previous phases
+        self.Q = TimedRingBuffer(max_queue_size)  # Queue for new requests in the current phase
+        self.P = TimedRingBuffer(max_queue_size)  # Queue for repeated requests in the current phase
+        self.Q_prime = SegmentedQueue(prime_capacity)  # Queue for leftover requests from previous phases (bounded)
+        self.P_prime = SegmentedQueue(prime_capacity)  # Queue for repeated requests from previous phases (bounded)
+        self.overflow = 0  # Leftover requests dropped because Q' or P' was full
+        self.on_drop = None  # Optional callback, called with every queued item dropped at a phase change
+        self._queued = 0  # Requests in all four queues
 
         # Phase management variables
         self.I = 0  # Time step within the current phase
@@ -98,10 +229,15 @@ class CuckooServer(Server):
         Adds a request to the Q queue (new requests in the current phase).
         
         :param chunk_id: The chunk ID to be added to Q.
-        :return: True if the request was successfully added, False if the queue is full.
+        :return: True if the request was successfully added (or attached), False if the queue is full.
         """
+        if self._pending is not None and chunk_id in self._pending:
+            return self._attach(chunk_id)
         if len(self.Q) < self.max_queue_size:
-            self.Q.append(chunk_id)
+            self.Q.append(chunk_id, self.clock)
+            self._queued += 1
+            if self._pending is not None:
+                self._pending[chunk_id] = None
             return True
         else:
             return False
@@ -111,30 +247,45 @@ class CuckooServer(Server):
         Adds a request to the P queue (repeated requests in the current phase).
         
         :param chunk_id: The chunk ID to be added to P.
-        :return: True if the request was successfully added, False if the queue is full.
+        :return: True if the request was successfully added (or attached), False if the queue is full.
         """
+        if self._pending is not None and chunk_id in self._pending:
+            return self._attach(chunk_id)
         if len(self.P) < self.max_queue_size:
-            self.P.append(chunk_id)
+            self.P.append(chunk_id, self.clock)
+            self._queued += 1
+            if self._pending is not None:
+                self._pending[chunk_id] = None
             return True
         else:
             return False
     
     def process_request(self):
         """
-        Processes requests from all four queues. Each queue is processed in g/4 time steps.
+        Processes up to processing_rate requests from the four queues, chosen by the scheduler.
         
         :return: List of processed requests from each queue.
         """
-        processed_requests = []
-        
-        # Process requests from the Q, P, Q', P' queues, each in g/4 time steps
-        for queue in [self.Q, self.P, self.Q_prime, self.P_prime]:
-            for _ in range(self.processing_rate // 4):  # Process g/4 requests
-                if queue:
-                    processed_requests.append(queue.pop(0))  # Process the first request from the queue
+        if self.scheduler == "drr":
+            processed_requests = self._process_drr()
+        else:
+            processed_requests = []
+            clock, waits, pending = self.clock, self.waits, self._pending
+
+            # Process requests from the Q, P, Q', P' queues, each in g/4 time steps
+            for queue in [self.Q, self.P, self.Q_prime, self.P_prime]:
+                for _ in range(self.processing_rate // 4):  # Process g/4 requests
+                    if queue:
+                        chunk_id, stamp = queue.popleft_timed()  # Process the first request from the queue
+                        waits.add(clock - stamp)
+                        if pending is not None:
+                            self._serve_waiters(chunk_id, clock)
+                        processed_requests.append(chunk_id)
+        self._queued -= len(processed_requests)
         
         # Increment the time step (I) for the current phase
         self.I += 1
+        self.clock += 1
 
         # If we've reached the end of the current phase (I == J), reset the phase
         if self.I >= self.J:
@@ -142,35 +293,103 @@ class CuckooServer(Server):
 
         return processed_requests
 
+    def _process_drr(self):
+        """
+        Deficit round robin: on its turn a queue with work is credited its weight and serves one request per
+        whole unit of credit, then the turn passes on. Empty queues are skipped and lose their credit, so no
+        slot is left idle while any queue has work. The turn carries over to the next time step.
+        """
+        processed_requests = []
+        queues = (self.Q, self.P, self.Q_prime, self.P_prime)
+        weights, deficits = self.weights, self._deficits
+        clock, waits, pending = self.clock, self.waits, self._pending
+        turn, credited = self._turn, self._credited
+        slots, remaining = self.processing_rate, self._queued
+        while slots and remaining:
+            queue = queues[turn]
+            if not queue:
+                deficits[turn] = 0
+            else:
+                if not credited:
+                    deficits[turn] += weights[turn]
+                    credited = True
+                if deficits[turn] >= 1:
+                    chunk_id, stamp = queue.popleft_timed()
+                    waits.add(clock - stamp)
+                    if pending is not None:
+                        self._serve_waiters(chunk_id, clock)
+                    processed_requests.append(chunk_id)
+                    deficits[turn] -= 1
+                    slots -= 1
+                    remaining -= 1
+                    continue
+            turn = (turn + 1) % 4
+            credited = False
+        self._turn, self._credited = turn, credited
+        return processed_requests
+
     def manage_phase_queues(self):
         """
-        Manages the phase transition by copying requests from Q and P to Q' and P' respectively,
-        and resetting Q and P for the next phase.
+        Manages the phase transition by moving the requests of Q and P behind those of Q' and P' respectively,
+        and starting the next phase with empty Q and P. Q and P are handed over as whole buffers, not copied.
         """
-        # Move requests from Q to Q_prime and from P to P_prime
-        self.Q_prime.extend(self.Q)
-        self.P_prime.extend(self.P)
+        if self._pending is not None or self.on_drop is not None:
+            self._forget_overflow(self.Q, self.Q_prime)
+            self._forget_overflow(self.P, self.P_prime)
 
-        # Empty the Q and P queues
-        self.Q.clear()
-        self.P.clear()
+        # Move requests from Q to Q_prime and from P to P_prime (they keep their enqueue stamps)
+        dropped = self.Q_prime.push_segment(self.Q) + self.P_prime.push_segment(self.P)
+        self.overflow += dropped
+        self._queued -= dropped
+
+        # Continue with empty Q and P queues (drained buffers are reused)
+        self.Q = self.Q_prime.take_spare(self.max_queue_size)
+        self.P = self.P_prime.take_spare(self.max_queue_size)
 
         # Reset I to 0 for the new phase
         self.I = 0
 
+    def _forget_overflow(self, segment, queue):
+        """
+        Handles the requests of `segment` that will not fit into `queue` at the phase change, before push_segment
+        drops them: their attached requests are dropped too (and counted in overflow), and on_drop is told.
+        """
+        pending, on_drop = self._pending, self.on_drop
+        for chunk_id in itertools.islice(segment, queue.capacity - len(queue), None):
+            if pending is not None:
+                self.overflow += len(pending.pop(chunk_id) or ())
+            if on_drop is not None:
+                on_drop(chunk_id)
+
+    def take_requests(self, wanted, limit):
+        """
+        Removes up to `limit` queued requests for chunks in `wanted` (a set), leftovers of earlier phases
+        (Q', P') first, then Q and P.
+
+        :return: List of (chunk ID, enqueue stamp) pairs.
+        """
+        taken = []
+        for queue in (self.Q_prime, self.P_prime, self.Q, self.P):
+            if len(taken) == limit:
+                break
+            if queue:
+                taken += queue.take_matching(wanted, limit - len(taken))
+        self._queued -= len(taken)
+        return self._release_waiters(taken)
+
     def get_queue_status(self):
         """
         Returns the current number of requests in all queues.
         """
-        return len(self.Q)+len(self.P)+len(self.Q_prime)+len(self.P_prime)
+        return self._queued
 
 
     def __str__(self):
-        return f"Server-{self.server_id}(Q: {len(self.Q)}/{self.max_queue_size}, P: {len(self.P)}/{self.max_queue_size}, Q': {len(self.Q_prime)}/{self.max_queue_size}, P': {len(self.P_prime)}/{self.max_queue_size})"
+        return f"Server-{self.server_id}(Q: {len(self.Q)}/{self.max_queue_size}, P: {len(self.P)}/{self.max_queue_size}, Q': {len(self.Q_prime)}/{self.Q_prime.capacity}, P': {len(self.P_prime)}/{self.P_prime.capacity}, overflow: {self.overflow})"
 
 # Example Usage:
 
-def Init_Cuckoo_Servers_with_random_chunks(n, m, g, d, q, J):
+def Init_Cuckoo_Servers_with_random_chunks(n, m, g, d, q, J, scheduler="static", weights=None, coalesce=False):
     """
     Initializes servers with cuckoo routing logic, assigning chunks to servers randomly.
     Ensures chunks are replicated to `d` servers using cuckoo routing.
@@ -181,9 +400,13 @@ def Init_Cuckoo_Servers_with_random_chunks(n, m, g, d, q, J):
     :param d: Number of servers a chunk should be assigned to (duplication factor).
     :param q: Queue length for each server.
     :param J: Number of time steps in one phase.
+    :param scheduler: Queue scheduler of the servers, "static" or "drr" (see CuckooServer).
+    :param weights: DRR weights of Q, P, Q', P'.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
     :return: List of servers, chunk-to-server mapping, and server-to-chunk mapping.
     """
-    servers = [CuckooServer(processing_rate=g, max_queue_size=q, server_id=i, J=J) for i in range(m)]
+    servers = [CuckooServer(processing_rate=g, max_queue_size=q, server_id=i, J=J, scheduler=scheduler,
+                            weights=weights, coalesce=coalesce) for i in range(m)]
     
     # Initialize chunk-to-server mapping
     chunk_to_servers = {i: [] for i in range(n)}
@@ -201,7 +424,8 @@ def Init_Cuckoo_Servers_with_random_chunks(n, m, g, d, q, J):
 
     return servers, chunk_to_servers, server_to_chunks
 
-def Init_Cuckoo_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping, J):
+def Init_Cuckoo_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping, J, scheduler="static", weights=None,
+                                           coalesce=False):
     """
     Utility function that assigns chunks to servers using a provided chunk-to-server mapping.
     Converts this mapping to a server-to-chunk mapping and initializes CuckooServer instances.
@@ -213,10 +437,14 @@ def Init_Cuckoo_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping, J):
     :param q: Queue length of each server.
     :param chunkmapping: Dictionary mapping each chunk to the servers it is assigned to.
     :param J: Number of time steps in one phase.
+    :param scheduler: Queue scheduler of the servers, "static" or "drr" (see CuckooServer).
+    :param weights: DRR weights of Q, P, Q', P'.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
     :return: List of servers with assigned chunks and server_to_chunks mapping.
     """
     # Initialize servers with CuckooServer class
-    servers = [CuckooServer(processing_rate=g, max_queue_size=q, server_id=i, J=J) for i in range(m)]
+    servers = [CuckooServer(processing_rate=g, max_queue_size=q, server_id=i, J=J, scheduler=scheduler,
+                            weights=weights, coalesce=coalesce) for i in range(m)]
     
     # Dictionary to track the chunk assignments for each server
     server_to_chunks = {i: [] for i in range(m)}  # Maps server_id to list of chunk_ids
@@ -226,13 +454,15 @@ def Init_Cuckoo_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping, J):
         for server_id in assigned_servers:
             # Add chunk to the server's list
             server_to_chunks[server_id].append(chunk_id)
-            # Assign the chunk to the server in the CuckooServer
-            servers[server_id].assign_chunk(chunk_id)
+
+    # Assign the chunks to the servers in one pass (assign_chunk per chunk is O(len(chunks)))
+    for server in servers:
+        server.chunks = list(dict.fromkeys(server_to_chunks[server.server_id]))
     
     return servers, server_to_chunks
 
 
-def Init_Servers_with_random_chunks(n, m, g, d, q):
+def Init_Servers_with_random_chunks(n, m, g, d, q, coalesce=False):
     """
     Utility function that assigns chunks to servers randomly with replication factor `d`.
     Ensures that a chunk is not assigned to the same server more than once and avoids unnecessary loops.
@@ -241,10 +471,11 @@ def Init_Servers_with_random_chunks(n, m, g, d, q):
     :param m: Number of servers.
     :param d: Number of servers a chunk should be assigned to (duplication factor).
     :param q: Queue length of each server.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
     :return: List of servers with assigned chunks, chunk_to_servers dictionary, and server_to_chunks dictionary.
     """
     # Initialize servers
-    servers = [Server(processing_rate=g, max_queue_size=q, server_id=i) for i in range(m)]
+    servers = [Server(processing_rate=g, max_queue_size=q, server_id=i, coalesce=coalesce) for i in range(m)]
     
     # Dictionary to track which servers have been assigned a specific chunk
     chunk_to_servers = {i: [] for i in range(n)}  # Maps chunk_id to list of server IDs
@@ -278,7 +509,7 @@ def Init_Servers_with_random_chunks(n, m, g, d, q):
     return servers, chunk_to_servers, server_to_chunks
 
 
-def Init_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping):
+def Init_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping, coalesce=False):
     """
     Utility function that assigns chunks to servers using a provided chunk-to-server mapping.
     Converts this mapping to a server-to-chunk mapping.
@@ -289,10 +520,11 @@ def Init_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping):
     :param d: Number of servers a chunk should be assigned to (duplication factor).
     :param q: Queue length of each server.
     :param chunkmapping: Dictionary mapping each chunk to the servers it is assigned to.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
     :return: List of servers with assigned chunks and server_to_chunks mapping.
     """
     # Initialize servers
-    servers = [Server(processing_rate=g, max_queue_size=q, server_id=i) for i in range(m)]
+    servers = [Server(processing_rate=g, max_queue_size=q, server_id=i, coalesce=coalesce) for i in range(m)]
     
     # Dictionary to track which servers have been assigned a specific chunk
     # This is now replaced by using chunkmapping directly
@@ -304,7 +536,44 @@ def Init_Servers_with_chunk_mapping(n, m, g, d, q, chunkmapping):
         for server_id in assigned_servers:
             # Add chunk to the server's list
             server_to_chunks[server_id].append(chunk_id)
-            # Assign the chunk to the server
-            servers[server_id].assign_chunk(chunk_id)
+
+    # Assign the chunks to the servers in one pass (assign_chunk per chunk is O(len(chunks)))
+    for server in servers:
+        server.chunks = list(dict.fromkeys(server_to_chunks[server.server_id]))
     
     return servers, server_to_chunks
+
+
+def Init_Servers_with_placement(placement, g, q, coalesce=False):
+    """
+    Initializes servers from a placement.Placement, taking each server's chunk list straight from the
+    placement's server-to-chunk arrays.
+
+    :param placement: Placement built by one of the placement builders.
+    :param g: Processing rate for each server.
+    :param q: Queue length of each server.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
+    :return: Cluster of the servers, indexed with the placement.
+    """
+    servers = [Server(processing_rate=g, max_queue_size=q, server_id=i, coalesce=coalesce)
+               for i in range(placement.num_servers)]
+    for server in servers:
+        server.chunks = placement.chunks_of(server.server_id).tolist()
+    return placement.cluster(servers)
+
+
+def Init_Cuckoo_Servers_with_placement(placement, g, q, J, scheduler="static", weights=None, coalesce=False):
+    """
+    CuckooServer counterpart of Init_Servers_with_placement.
+
+    :param J: Number of time steps in one phase.
+    :param scheduler: Queue scheduler of the servers, "static" or "drr" (see CuckooServer).
+    :param weights: DRR weights of Q, P, Q', P'.
+    :param coalesce: Coalesce requests for already queued chunks (see Server).
+    :return: Cluster of the servers, indexed with the placement.
+    """
+    servers = [CuckooServer(processing_rate=g, max_queue_size=q, server_id=i, J=J, scheduler=scheduler,
+                            weights=weights, coalesce=coalesce) for i in range(placement.num_servers)]
+    for server in servers:
+        server.chunks = placement.chunks_of(server.server_id).tolist()
+    return placement.cluster(servers)
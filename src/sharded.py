@@ -0,0 +1,341 @@
+"""
+Multi-process sharded simulation.
+
+The servers are split into contiguous shards, one per worker process, and every chunk has an owner worker
+(chunk_id % workers). Per-server queue lengths, the replica index and the requests of the current interval
+live in shared memory, so every worker reads the loads of any replica without pickling. An interval runs in
+two phases separated by barriers:
+
+    route   each worker decides the requests for the chunks it owns, reading the shared loads, and writes
+            the chosen server of every such request into a shared array
+    admit   each worker admits, in request order, the requests routed to its own servers (up to q queued),
+            then its servers process up to g requests each
+
+The parent partitions the requests by owner before the route phase, and the routed requests by target shard
+before the admit phase (stable counting sorts, so request order is kept), so each worker reads only its own
+slice instead of filtering the whole batch. Only the owner of a server writes its load, so no locks are needed.
+
+Every barrier wait inside an interval has a timeout. If a worker raises, it aborts the barrier; if it dies
+or hangs, the parent's wait times out. Either way the parent aborts the barrier (releasing the other workers,
+which then exit), stops the workers and step() raises RuntimeError. Like the vectorized engine, servers are
+represented by their queue lengths, not Server objects.
+
+Strategies:
+    Random            as in the object path.
+    Greedy            least loaded replica; a worker sees the loads at the start of the interval plus its own
+                      decisions of the interval (routed exactly as one at a time, see
+                      vectorized_engine.greedy_waves), but not the decisions other workers make in the same
+                      interval. Results therefore depend on the number of workers: with one worker this is the
+                      sequential Greedy of the vectorized engine, with more the routing sees less of the
+                      interval's load. Compare runs at the same worker count only.
+    CuckooSimplified  not the Cuckoo of the object path: the first request for a chunk in a phase goes to its
+                      least loaded replica (as Greedy) and repeated requests in the phase to the same server; a
+                      phase lasts J intervals. Since all requests of a chunk are routed by its owner, the history
+                      is local to each worker. Servers keep a single queue of size q (no separate Q, P, Q', P').
+                      Its first requests depend on the worker count like Greedy.
+"""
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from streaming_metrics import MetricsCollector
+from vectorized_engine import build_replica_index, greedy_waves, replica_table, _rank_within_groups
+
+# Control words
+COUNT, PROCESS, STOP = 0, 1, 2
+
+# Seconds a barrier wait inside an interval may take before the run is given up
+BARRIER_TIMEOUT = 60
+
+
+def _shared_array(shape, dtype, data=None):
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    if data is None:
+        array[...] = 0
+    else:
+        array[...] = data
+    return block, array
+
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _shard_bounds(num_servers, workers):
+    """
+    Servers of worker w are lo..hi-1 with lo, hi = bounds[w], bounds[w + 1].
+    """
+    return np.arange(workers + 1, dtype=np.int64) * num_servers // workers
+
+
+def _partition(keys, workers, order, offsets):
+    """
+    Writes the positions of `keys` grouped by key (0..workers-1, in position order within a group) into
+    `order`, and the group boundaries into `offsets`; keys outside that range are left out.
+    """
+    valid = (keys >= 0) & (keys < workers)
+    positions = np.flatnonzero(valid)
+    # A stable sort of small integers is a radix sort, linear in the number of requests
+    grouped = positions[np.argsort(keys[positions].astype(np.int16 if workers < 1 << 15 else np.int64),
+                                   kind="stable")]
+    order[:grouped.size] = grouped
+    offsets[0] = 0
+    np.cumsum(np.bincount(keys[positions], minlength=workers), out=offsets[1:])
+
+
+def _worker(worker, workers, names, shapes, num_servers, g, q, strategy, J, seed, barrier, timeout):
+    try:
+        _work(worker, workers, names, shapes, num_servers, g, q, strategy, J, seed, barrier, timeout)
+    except threading.BrokenBarrierError:
+        pass  # The parent gave the run up (a worker failed or timed out)
+    except BaseException:
+        barrier.abort()  # Fail the parent's wait now rather than at its timeout
+        raise
+
+
+def _work(worker, workers, names, shapes, num_servers, g, q, strategy, J, seed, barrier, timeout):
+    blocks, arrays = [], {}  # The blocks stay mapped until the process exits
+    for key in names:
+        block, arrays[key] = _attach(names[key], shapes[key], np.int64)
+        blocks.append(block)
+    indptr, indices, table, loads = arrays["indptr"], arrays["indices"], arrays["table"], arrays["loads"]
+    requests, choice, stats, control = arrays["requests"], arrays["choice"], arrays["stats"], arrays["control"]
+    route_order, route_offsets = arrays["route_order"], arrays["route_offsets"]
+    admit_order, admit_offsets = arrays["admit_order"], arrays["admit_offsets"]
+
+    num_chunks = indptr.size - 1
+    counts = np.diff(indptr)
+    lo, hi = (int(bound) for bound in _shard_bounds(num_servers, workers)[worker:worker + 2])
+    rng = np.random.default_rng([seed, worker])
+
+    # Cuckoo history of the chunks this worker owns, stamped with the phase it was written in
+    history = np.zeros(num_chunks, dtype=np.int64) if strategy == "CuckooSimplified" else None
+    stamps = np.zeros(num_chunks, dtype=np.int64) if strategy == "CuckooSimplified" else None
+    epoch, steps = 1, 0
+
+    while True:
+        barrier.wait()  # Requests posted (no timeout: the parent may take its time between intervals)
+        if control[STOP]:
+            break
+
+        # Route phase: requests for the chunks this worker owns, partitioned by the parent
+        positions = route_order[route_offsets[worker]:route_offsets[worker + 1]].copy()
+        chunks = requests[positions]
+        known = (chunks >= 0) & (chunks < num_chunks)
+        known[known] = counts[chunks[known]] > 0
+        choice[positions[~known]] = -1
+        positions, chunks = positions[known], chunks[known]
+        if strategy == "Random":
+            offsets = rng.integers(0, counts[chunks])
+            choice[positions] = indices[indptr[chunks] + offsets]
+        elif strategy == "Greedy":
+            # Decide on a snapshot of the loads that accumulates this worker's own requests
+            choice[positions], _ = greedy_waves(table[chunks], loads.copy(), q)
+        else:
+            # First requests of the phase are routed as Greedy, in order; the others follow the history
+            fresh = stamps[chunks] != epoch
+            _, first = np.unique(chunks[fresh], return_index=True)
+            first = np.flatnonzero(fresh)[np.sort(first)]
+            history[chunks[first]], _ = greedy_waves(table[chunks[first]], loads.copy(), q)
+            stamps[chunks[first]] = epoch
+            choice[positions] = history[chunks]
+        unroutable = int(np.count_nonzero(~known))
+
+        barrier.wait(timeout)  # Every request routed
+        barrier.wait(timeout)  # Routed requests partitioned by target shard
+
+        # Admission phase: requests routed to this worker's servers, in request order
+        targets = choice[admit_order[admit_offsets[worker]:admit_offsets[worker + 1]]]
+        rank, _, _ = _rank_within_groups(targets)
+        ok = loads[targets] + rank < q
+        loads[lo:hi] += np.bincount(targets[ok] - lo, minlength=hi - lo)
+        accepted = int(np.count_nonzero(ok))
+        stats[worker] = (accepted, targets.size - accepted + unroutable)
+
+        if control[PROCESS]:
+            loads[lo:hi] -= np.minimum(loads[lo:hi], g)
+            if history is not None:
+                steps += 1
+                if steps >= J:
+                    epoch, steps = epoch + 1, 0  # New phase, the history is forgotten in O(1)
+
+        barrier.wait(timeout)  # Interval slice done
+
+
+class ShardedSimulation:
+    """
+    Use as a context manager (or call close()) so the worker processes and shared memory are released.
+    """
+
+    def __init__(self, chunk_to_servers, num_servers, g, q, strategy="Random", workers=None, J=3, seed=0,
+                 max_batch=1 << 20, timeout=BARRIER_TIMEOUT):
+        """
+        :param chunk_to_servers: Dictionary mapping chunk IDs to lists of server IDs, a Cluster, or CSR
+                                 arrays (indptr, indices).
+        :param strategy: "Random", "Greedy" or "CuckooSimplified" (see the module notes).
+        :param workers: Number of worker processes (default: CPU count). Greedy and CuckooSimplified results
+                        depend on it, so pass it explicitly for results that carry across machines.
+        :param J: Cuckoo phase length, in intervals.
+        :param max_batch: Requests handed to the workers at once; larger intervals are split into slices
+                          and processing happens after the last one.
+        :param timeout: Seconds any barrier wait inside an interval may take; after that (or when a worker
+                        died) the run is given up and step() raises RuntimeError.
+        """
+        if strategy == "Cuckoo":
+            raise ValueError("The sharded engine has no four-queue Cuckoo, its single-queue variant is "
+                             "\"CuckooSimplified\"")
+        if strategy not in ["Random", "Greedy", "CuckooSimplified"]:
+            raise ValueError(f"Unknown strategy {strategy}")
+        indptr, indices = build_replica_index(chunk_to_servers)  # Existing int64 arrays are not copied
+        table, _ = replica_table(indptr, indices)
+
+        self.num_servers = num_servers
+        self.workers = min(workers or multiprocessing.cpu_count(), num_servers)
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._bounds = _shard_bounds(num_servers, self.workers)
+
+        # Shared int64 arrays: (shape, initial contents or None for zeros)
+        layout = {
+            "indptr": (indptr.shape, indptr),
+            "indices": (indices.shape, indices),
+            "table": (table.shape, table),
+            "loads": ((num_servers,), None),
+            "requests": ((max_batch,), None),
+            "choice": ((max_batch,), None),  # Server chosen for every request of the current slice
+            "route_order": ((max_batch,), None),  # Request positions grouped by owner worker
+            "route_offsets": ((self.workers + 1,), None),
+            "admit_order": ((max_batch,), None),  # Request positions grouped by the worker owning the target
+            "admit_offsets": ((self.workers + 1,), None),
+            "stats": ((self.workers, 2), None),  # Accepted and rejected requests of every worker
+            "control": ((3,), None),
+        }
+        shapes = {key: shape for key, (shape, data) in layout.items()}
+        self._blocks = {}
+        arrays = {}
+        for key, (shape, data) in layout.items():
+            self._blocks[key], arrays[key] = _shared_array(shape, np.int64, data)
+        self.loads = arrays["loads"]  # Queue length of every server (read between intervals)
+        self._requests, self._stats, self._control = arrays["requests"], arrays["stats"], arrays["control"]
+        self._choice = arrays["choice"]
+        self._route_order, self._route_offsets = arrays["route_order"], arrays["route_offsets"]
+        self._admit_order, self._admit_offsets = arrays["admit_order"], arrays["admit_offsets"]
+
+        names = {key: block.name for key, block in self._blocks.items()}
+        self._barrier = multiprocessing.Barrier(self.workers + 1)
+        self._processes = [
+            multiprocessing.Process(target=_worker, daemon=True,
+                                    args=(w, self.workers, names, shapes, num_servers, g, q, strategy, J, seed,
+                                          self._barrier, timeout))
+            for w in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def step(self, chunks):
+        """
+        Runs one interval: routes the requests, then every server processes up to g requests.
+
+        :param chunks: Requested chunk IDs of the interval, in order.
+        :return: Tuple (accepted, rejected).
+        """
+        chunks = np.asarray(chunks, dtype=np.int64).ravel()
+        accepted, rejected = 0, 0
+        start = 0
+        while True:
+            part = chunks[start:start + self.max_batch]
+            start += part.size
+            self._requests[:part.size] = part
+            self._control[COUNT] = part.size
+            self._control[PROCESS] = start >= chunks.size
+            _partition(part % self.workers, self.workers, self._route_order, self._route_offsets)
+
+            self._sync()  # Post the requests
+            self._sync()  # Routed
+            targets = self._choice[:part.size]
+            shards = np.searchsorted(self._bounds, targets, side="right") - 1  # -1 for unroutable requests
+            _partition(shards, self.workers, self._admit_order, self._admit_offsets)
+            self._sync()  # Partitioned by target shard
+            self._sync()  # Admitted (and processed)
+
+            accepted += int(self._stats[:, 0].sum())
+            rejected += int(self._stats[:, 1].sum())
+            if start >= chunks.size:
+                return accepted, rejected
+
+    def _sync(self):
+        """
+        Waits for every worker at the barrier; gives the run up if a worker died or the wait timed out.
+        """
+        try:
+            self._barrier.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            self._barrier.abort()  # Releases the workers still waiting, they exit
+            deadline = time.monotonic() + 1  # Grace period for the released workers to exit
+            for process in self._processes:
+                process.join(max(0.0, deadline - time.monotonic()))
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            codes = [process.exitcode for process in self._processes]
+            self._processes = []
+            raise RuntimeError(f"Sharded simulation failed (worker exit codes {codes}, barrier timeout "
+                               f"{self.timeout} s)") from None
+
+    def get_queue_status(self):
+        return self.loads
+
+    def close(self):
+        if self._processes:
+            self._control[STOP] = 1
+            self._barrier.wait()
+            for process in self._processes:
+                process.join()
+            self._processes = []
+        del self.loads, self._requests, self._stats, self._control, self._choice
+        del self._route_order, self._route_offsets, self._admit_order, self._admit_offsets
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # A caller still holds a view of the loads; the mapping goes away with it
+            block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_sharded_simulation(chunk_to_servers, num_servers, g, q, chunks_list, total_intervals, strategy="Random",
+                           workers=None, J=3, seed=0):
+    """
+    Runs the lock-step interval loop of run_simulation on a ShardedSimulation.
+
+    :param chunks_list: Chunk IDs requested every interval, a callable taking the interval index and returning
+                        that interval's requests, or a workload stream (see workloads).
+    :return: MetricsCollector of the run.
+    """
+    metrics = MetricsCollector()
+    with ShardedSimulation(chunk_to_servers, num_servers, g, q, strategy, workers, J, seed) as sim:
+        for interval in range(total_intervals):
+            if callable(chunks_list):
+                requests = chunks_list(interval)
+            elif hasattr(chunks_list, "__next__"):
+                requests = next(chunks_list, None)
+                if requests is None:
+                    break
+            else:
+                requests = chunks_list
+            accepted, rejected = sim.step(requests)
+            metrics.observe(interval, accepted, rejected, sim.loads)
+    return metrics
@@ -0,0 +1,212 @@
+import random
+
+import server as se
+import chunk_assignment as ca
+import vectorized_engine as ve
+import sharded
+import work_stealing
+from cluster import Cluster
+from placement import Placement
+from profiling import profiler, SETUP, WORKLOAD, ROUTE, PROCESS, METRICS, TRACE, FINISH
+from streaming_metrics import MetricsCollector
+from tracing import tracer, DEBUG, INFO, SERVER_PROCESSED, SERVER_STATUS, INTERVAL_END
+
+
+def simulate(Type="Random", chunk_to_servers=None, reappearance_chunks_list=None, num_servers=256, num_chunks=1000,
+             d=2, g=2, q=8, J=3, total_intervals=100, Engine="Object", collector=None, workload=None,
+             recorder=None, refresh_intervals=0, refresh_requests=0, retries=0, backoff=0,
+             scheduler="static", weights=None, steal=False, coalesce=False, workers=None):
+    """
+    Runs the lock-step interval loop: route one interval of requests, let every server process up to g
+    requests, record metrics. Randomness comes from the `random` module, so seed it for reproducible runs.
+
+    :param Type: Routing strategy, "Random", "Greedy" or "Cuckoo" ("CuckooSimplified" with the Sharded engine,
+                 which has no four-queue Cuckoo).
+    :param chunk_to_servers: Chunk-to-server mapping or placement.Placement (e.g. opened with placement_store,
+                             num_servers and num_chunks are then taken from it); a random mapping with replication factor d is
+                             generated if None.
+    :param reappearance_chunks_list: Chunks requested every interval; if None, num_servers uniformly random chunks
+                                     are requested per interval.
+    :param num_servers: Number of servers (m).
+    :param num_chunks: Total number of chunks (n).
+    :param d: Replication factor (only used to generate a mapping).
+    :param g: Server processing power.
+    :param q: Queue size of each server.
+    :param J: Cuckoo phase length, in time steps.
+    :param total_intervals: Number of intervals to run.
+    :param Engine: "Object" (Server objects), "Vectorized" (array engine, Random and Greedy only) or "Sharded"
+                   (worker processes over shared memory, Random, Greedy and CuckooSimplified, see sharded).
+    :param collector: MetricsCollector to record into (a default one is created if None). With the Object engine
+                      it also gets the queueing delay of every processed request (p50_wait, p99_wait, p999_wait
+                      in intervals); the array engines only track queue lengths.
+    :param workload: Iterator of per-interval request batches (see workloads); replaces reappearance_chunks_list,
+                     and the run ends early if it runs out.
+    :param recorder: Optional replay.TraceRecorder that records every routing decision (Object engine only).
+    :param refresh_intervals: If set, Greedy (and the first request of a chunk in a Cuckoo phase) decide on a
+                              chunk_assignment.LoadSnapshot refreshed every this many intervals instead of on
+                              live queue lengths (Object engine only).
+    :param refresh_requests: Also (or only) refresh the snapshot every this many routing decisions.
+    :param retries: Random only: when the chosen replica is full, try up to this many other replicas in random
+                    order (see chunk_assignment.RetryAdmission; Object engine only).
+    :param backoff: Random only: defer a request every tried replica refused to a later interval (1, 2, 4, ...
+                    intervals on), up to this many times, before rejecting it.
+    :param scheduler: Cuckoo only: how a CuckooServer splits its g slots among Q, P, Q', P', "static"
+                      (g // 4 each, the default) or "drr" (work-conserving deficit round robin).
+    :param weights: Cuckoo with the "drr" scheduler: DRR weights of Q, P, Q', P' (default equal, see
+                    server.CuckooServer).
+    :param steal: After every server processed its queue, let the servers that drained theirs process queued
+                  requests of replica peers for chunks they also hold (see work_stealing; Object engine only).
+    :param coalesce: Attach a request for a chunk already queued on the chosen server to the queued request, so
+                     one processing slot serves both (see server.Server; Object engine only).
+    :param workers: Sharded only: number of worker processes (default: CPU count). Greedy and CuckooSimplified
+                    results depend on it (see sharded).
+    :return: The MetricsCollector.
+
+    With profiling enabled (profiling.configure(True)) every phase of the loop is timed, see profiling.
+    """
+    if profiler.enabled:
+        profiler.mark()
+    if chunk_to_servers is None:
+        chunk_to_servers = ca.generate_chunk_to_servers_mapping(num_chunks, num_servers, d)
+    placement = chunk_to_servers if isinstance(chunk_to_servers, Placement) else None
+    if placement is not None:
+        num_servers, num_chunks = placement.num_servers, placement.num_chunks
+        chunk_to_servers = (placement.indptr, placement.indices)  # Array engines read the CSR arrays directly
+
+    array_engine = Engine in ["Vectorized", "Sharded"]
+    if Type == "CuckooSimplified" and Engine != "Sharded":
+        raise ValueError("CuckooSimplified only runs on the Sharded engine")
+    if recorder is not None and array_engine:
+        raise ValueError("Routing decisions can only be recorded with the Object engine")
+    stale = refresh_intervals > 0 or refresh_requests > 0
+    if stale and array_engine:
+        raise ValueError("Stale load snapshots are only supported by the Object engine")
+    if (retries or backoff) and array_engine:
+        raise ValueError("Retry admission is only supported by the Object engine")
+    if steal and array_engine:
+        raise ValueError("Work stealing is only supported by the Object engine")
+    if coalesce and array_engine:
+        raise ValueError("Request coalescing is only supported by the Object engine")
+
+    router = None
+    if(Engine == "Vectorized"):
+        sim = ve.VectorizedSimulation(chunk_to_servers, num_servers, g, q, Type, rng=random) # rng=random draws like the object path
+    elif(Engine == "Sharded"):
+        sim = sharded.ShardedSimulation(chunk_to_servers, num_servers, g, q, Type, workers, J=J,
+                                        seed=random.randrange(2**32))
+    elif(placement is not None):
+        if(Type in ["Greedy", "Random"]):
+            servers = se.Init_Servers_with_placement(placement, g, q, coalesce)
+        else:
+            servers = se.Init_Cuckoo_Servers_with_placement(placement, g, q, J, scheduler, weights, coalesce)
+            router = ca.CuckooRouter(J, num_chunks)
+    elif(Type in ["Greedy", "Random"]):
+        servers, servers_to_chunks = se.Init_Servers_with_chunk_mapping(num_chunks, num_servers, g, d, q, chunk_to_servers,
+                                                                         coalesce)
+        servers = Cluster(servers, chunk_to_servers) # Index servers and chunk replicas once, routing is then O(d) per request
+    else:
+        servers, servers_to_chunks = se.Init_Cuckoo_Servers_with_chunk_mapping(num_chunks, num_servers, g, d, q, chunk_to_servers, J,
+                                                                               scheduler, weights, coalesce)
+        servers = Cluster(servers, chunk_to_servers)
+        router = ca.CuckooRouter(J, num_chunks) # Per-run Cuckoo history, so simulations can run side by side
+
+    snapshot = None
+    if stale and Type in ["Greedy", "Cuckoo"]:
+        snapshot = ca.LoadSnapshot(servers, refresh_requests, refresh_intervals)
+        if router is not None:
+            router.snapshot = snapshot
+    stealer = work_stealing.WorkStealer(servers) if steal else None
+    admission = None
+    if (retries or backoff) and Type == "Random":
+        admission = ca.RetryAdmission(retries, backoff)
+
+    metrics = MetricsCollector() if collector is None else collector
+    if profiler.enabled:
+        profiler.lap(SETUP)
+    for interval in range(total_intervals):
+        # Generate the list of requested chunks for this interval
+        if workload is not None:
+            chunks_list = next(workload, None)
+            if chunks_list is None:
+                break
+            if not array_engine:
+                chunks_list = chunks_list.tolist()
+        elif reappearance_chunks_list is None:
+            chunks_list = [random.randrange(num_chunks) for _ in range(num_servers)]
+        else:
+            chunks_list = reappearance_chunks_list
+        if profiler.enabled:
+            profiler.lap(WORKLOAD)
+
+        if(Engine == "Vectorized"):
+            accepted, rejected = sim.route(chunks_list)
+            sim.process()  # Every server processes up to g requests
+            queue_lengths = sim.get_queue_status()
+        elif(Engine == "Sharded"):
+            accepted, rejected = sim.step(chunks_list)  # Route, then every server processes up to g requests
+            queue_lengths = sim.get_queue_status()
+        else:
+            if recorder is not None:
+                recorder.interval = interval
+            retried_accepted, retried_rejected = 0, 0
+            if admission is not None:
+                retried_accepted, retried_rejected = admission.retry_due(interval, servers, recorder)  # Deferred earlier
+            accepted, rejected = ca.adversary_assign_chunks_avgcase(num_servers, chunk_to_servers, servers, chunks_list, Type, J,
+                                                                    router, recorder, snapshot, admission)
+            accepted, rejected = accepted + retried_accepted, rejected + retried_rejected
+            if profiler.enabled:
+                profiler.lap(ROUTE)
+
+            idle, backlogged = [], []
+            for server in servers:
+                processed = server.process_request()  # Process up to g requests
+                if tracer.level <= DEBUG:
+                    tracer.emit(DEBUG, SERVER_PROCESSED, server.server_id, len(processed))
+                if stealer is not None:
+                    queued = server.get_queue_status()
+                    if not queued and len(processed) < server.processing_rate:
+                        idle.append((server, server.processing_rate - len(processed)))
+                    elif queued >= stealer.min_backlog:
+                        backlogged.append(server.server_id)
+            if stealer is not None:
+                stealer.steal(idle, backlogged)  # Spare slots of drained servers take work from their replica peers
+
+            queue_lengths = (server.get_queue_status() for server in servers)
+            if snapshot is not None:
+                snapshot.end_interval()
+        if profiler.enabled:
+            profiler.lap(PROCESS)  # The array engines route and process in one step, charged here
+
+        # Update metrics, queue lengths estimate latency (single pass over the servers)
+        metrics.observe(interval, accepted, rejected, queue_lengths)
+        if profiler.enabled:
+            profiler.lap(METRICS)
+
+        if tracer.level <= INFO:
+            tracer.emit(INFO, INTERVAL_END, interval, rejected)
+        if tracer.level <= DEBUG:
+            if array_engine:
+                for server_id, queue_length in enumerate(sim.get_queue_status().tolist()):
+                    tracer.emit(DEBUG, SERVER_STATUS, server_id, queue_length)
+            else:
+                for server in servers:
+                    tracer.emit(DEBUG, SERVER_STATUS, server.server_id, server.get_queue_status())
+        if profiler.enabled:
+            profiler.lap(TRACE)
+
+    if(Engine == "Sharded"):
+        sim.close()
+    if not array_engine:
+        metrics.observe_waits(server.waits for server in servers)  # Array engines keep queue lengths only
+        if Type == "Cuckoo":
+            metrics.observe_dropped(sum(server.overflow for server in servers))
+    if admission is not None:
+        metrics.observe_retries(admission.retried, admission.deferred)
+        metrics.observe_deferred_at_end(admission.flush(recorder))  # Due after the last interval: rejected
+    if stealer is not None:
+        metrics.observe_stolen(stealer.stolen)
+    if coalesce:
+        metrics.observe_coalesced(sum(server.coalesced for server in servers))
+    if profiler.enabled:
+        profiler.lap(FINISH)
+    return metrics
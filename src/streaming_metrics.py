@@ -0,0 +1,395 @@
+"""
+Constant-memory metrics for long simulations.
+
+MetricsCollector is updated once per interval with a single pass over the queue lengths. It keeps totals,
+fixed-size histograms (queue depth per server per interval, rejection rate per interval) for percentiles,
+and time series downsampled to a bounded number of points. Per-request queueing delays are kept by the
+servers in LogHistograms and merged in with observe_waits. Collectors of independent runs can be merged.
+"""
+from array import array
+
+import numpy as np
+
+
+class Histogram:
+    """
+    Counts of integer values 0..bins-2; the last bin collects everything larger.
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, bins):
+        self.counts = array('q', [0]) * bins
+        self.total = 0
+
+    def add(self, value, count=1):
+        last = len(self.counts) - 1
+        self.counts[value if value < last else last] += count
+        self.total += count
+
+    def add_counts(self, counts):
+        """
+        Adds a whole vector of counts (longer vectors spill into the overflow bin).
+        """
+        last = len(self.counts) - 1
+        counts = np.asarray(counts, dtype=np.int64)
+        for value in np.flatnonzero(counts[:last]):
+            self.counts[value] += int(counts[value])
+        self.counts[last] += int(counts[last:].sum())
+        self.total += int(counts.sum())
+
+    def percentile(self, p):
+        """
+        Returns the smallest bin holding at least p percent of the values (nearest rank), or 0 if empty.
+        """
+        if not self.total:
+            return 0
+        rank = max(1, -(-self.total * p // 100))
+        seen = 0
+        for value, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return value
+        return len(self.counts) - 1
+
+    def merge(self, other):
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different bin counts")
+        for value, count in enumerate(other.counts):
+            self.counts[value] += count
+        self.total += other.total
+
+
+class LogHistogram:
+    """
+    Counts of non-negative integers in log-spaced buckets (HDR histogram layout): values below
+    2 ** (precision + 1) have a bucket each, larger ones share buckets less than 2 ** -precision apart
+    relative to the value. Adding is O(1), and buckets are only allocated up to the largest value seen,
+    so every server can keep one.
+    """
+
+    __slots__ = ("precision", "buckets", "counts", "total")
+
+    def __init__(self, precision=3, max_bits=48):
+        """
+        :param precision: Sub-buckets per power of two, as a power of two (3: 8 sub-buckets, 12.5% resolution).
+        :param max_bits: Values of more bits share the last bucket.
+        """
+        self.precision = precision
+        self.buckets = (max_bits - precision + 1) << precision
+        self.counts = array('q')
+        self.total = 0
+
+    def add(self, value, count=1):
+        shift = value.bit_length() - self.precision - 1
+        bucket = value if shift < 0 else ((shift + 1) << self.precision) + (value >> shift) - (1 << self.precision)
+        counts = self.counts
+        if bucket >= len(counts):
+            bucket = min(bucket, self.buckets - 1)
+            counts.extend([0] * (bucket + 1 - len(counts)))
+        counts[bucket] += count
+        self.total += count
+
+    def lowest(self, bucket):
+        """
+        Smallest value counted in a bucket.
+        """
+        if bucket < 1 << (self.precision + 1):
+            return bucket
+        shift = (bucket >> self.precision) - 1
+        return ((bucket & ((1 << self.precision) - 1)) + (1 << self.precision)) << shift
+
+    def percentile(self, p):
+        """
+        Returns the largest value of the bucket holding the p-th percentile (nearest rank), or 0 if empty.
+        """
+        if not self.total:
+            return 0
+        rank = max(1, -(-self.total * p // 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        return self.lowest(bucket) if bucket == self.buckets - 1 else self.lowest(bucket + 1) - 1
+
+    def mean(self):
+        """
+        Mean of the bucket midpoints (exact for values below 2 ** (precision + 1)).
+        """
+        if not self.total:
+            return 0.0
+        total = 0
+        for bucket, count in enumerate(self.counts):
+            if count:
+                total += count * (self.lowest(bucket) + self.lowest(bucket + 1) - 1) / 2
+        return total / self.total
+
+    def merge(self, other):
+        if other.buckets != self.buckets or other.precision != self.precision:
+            raise ValueError("Cannot merge log histograms of different layouts")
+        counts = self.counts
+        if len(other.counts) > len(counts):
+            counts.extend([0] * (len(other.counts) - len(counts)))
+        for bucket, count in enumerate(other.counts):
+            if count:
+                counts[bucket] += count
+        self.total += other.total
+        return self
+
+
+class DownsampledSeries:
+    """
+    Per-interval series kept in at most `max_points` buckets. Each bucket covers `stride` consecutive
+    intervals and stores their sum, count and max; when the buckets run out, neighbours are merged
+    pairwise and the stride doubles.
+    """
+
+    __slots__ = ("max_points", "stride", "sums", "counts", "maxima")
+
+    def __init__(self, max_points=1024):
+        self.max_points = max_points
+        self.stride = 1
+        self.sums = []
+        self.counts = []
+        self.maxima = []
+
+    def append(self, interval, value):
+        bucket = interval // self.stride
+        while bucket >= self.max_points:
+            self._coarsen()
+            bucket = interval // self.stride
+
+        while len(self.sums) <= bucket:
+            self.sums.append(0)
+            self.counts.append(0)
+            self.maxima.append(value)
+        self.sums[bucket] += value
+        self.counts[bucket] += 1
+        if value > self.maxima[bucket]:
+            self.maxima[bucket] = value
+
+    def _coarsen(self):
+        self.sums = [sum(self.sums[i:i + 2]) for i in range(0, len(self.sums), 2)]
+        self.counts = [sum(self.counts[i:i + 2]) for i in range(0, len(self.counts), 2)]
+        self.maxima = [max(self.maxima[i:i + 2]) for i in range(0, len(self.maxima), 2)]
+        self.stride *= 2
+
+    def intervals(self):
+        """
+        First interval of every bucket.
+        """
+        return [bucket * self.stride for bucket in range(len(self.sums))]
+
+    def means(self):
+        return [total / count if count else 0 for total, count in zip(self.sums, self.counts)]
+
+    def merge(self, other):
+        """
+        Combines the series of an independent run bucket by bucket (sums and counts add, maxima max).
+        """
+        other_sums, other_counts, other_maxima = other.sums, other.counts, other.maxima
+        while self.stride < other.stride:
+            self._coarsen()
+        stride = other.stride
+        while stride < self.stride:
+            other_sums = [sum(other_sums[i:i + 2]) for i in range(0, len(other_sums), 2)]
+            other_counts = [sum(other_counts[i:i + 2]) for i in range(0, len(other_counts), 2)]
+            other_maxima = [max(other_maxima[i:i + 2]) for i in range(0, len(other_maxima), 2)]
+            stride *= 2
+
+        for bucket in range(len(other_sums)):
+            if bucket < len(self.sums):
+                self.sums[bucket] += other_sums[bucket]
+                self.counts[bucket] += other_counts[bucket]
+                self.maxima[bucket] = max(self.maxima[bucket], other_maxima[bucket])
+            else:
+                self.sums.append(other_sums[bucket])
+                self.counts.append(other_counts[bucket])
+                self.maxima.append(other_maxima[bucket])
+
+
+class MetricsCollector:
+    def __init__(self, queue_bins=1024, rate_bins=1000, max_points=1024):
+        """
+        :param queue_bins: Queue depth histogram size (depths >= queue_bins - 1 share the last bin).
+        :param rate_bins: Resolution of the rejection-rate histogram over [0, 1].
+        :param max_points: Maximum number of points kept per time series.
+        """
+        self.accepted = 0
+        self.rejected = 0
+        self.retried = 0  # Accepted requests that were queued on an alternate replica (see RetryAdmission)
+        self.deferred = 0  # Deferrals of requests into a later interval
+        self.deferred_at_end = 0  # Requests still deferred when the run ended (counted as rejected)
+        self.dropped = 0  # Accepted requests later dropped from a full queue (CuckooServer Q'/P' overflow)
+        self.stolen = 0  # Requests processed by a replica peer of the server they were queued on (work stealing)
+        self.coalesced = 0  # Accepted requests attached to a queued request for the same chunk (no queue slot)
+        self.intervals = 0
+        self.max_queue_length = 0
+
+        self.queue_depths = Histogram(queue_bins)  # One value per server per interval
+        self.rejection_rates = Histogram(rate_bins)  # One value per interval
+        self.waits = LogHistogram()  # Intervals every processed request waited in a queue
+
+        self.avg_queue_series = DownsampledSeries(max_points)
+        self.max_queue_series = DownsampledSeries(max_points)
+        self.rejection_series = DownsampledSeries(max_points)
+
+    def observe(self, interval, accepted, rejected, queue_lengths):
+        """
+        Records one interval.
+
+        :param queue_lengths: Queue length of every server (any iterable, or a NumPy array).
+        """
+        if isinstance(queue_lengths, np.ndarray):
+            num_servers = queue_lengths.size
+            total = int(queue_lengths.sum())
+            longest = int(queue_lengths.max()) if num_servers else 0
+            self.queue_depths.add_counts(np.bincount(queue_lengths))
+        else:
+            num_servers, total, longest = 0, 0, 0
+            counts, last = self.queue_depths.counts, len(self.queue_depths.counts) - 1
+            for length in queue_lengths:
+                num_servers += 1
+                total += length
+                if length > longest:
+                    longest = length
+                counts[length if length < last else last] += 1
+            self.queue_depths.total += num_servers
+
+        requests = accepted + rejected
+        rate = rejected / requests if requests else 0.0
+        rate_bins = len(self.rejection_rates.counts)
+        self.rejection_rates.add(min(int(rate * rate_bins), rate_bins - 1))
+
+        self.accepted += accepted
+        self.rejected += rejected
+        self.intervals += 1
+        if longest > self.max_queue_length:
+            self.max_queue_length = longest
+
+        self.avg_queue_series.append(interval, total / num_servers if num_servers else 0)
+        self.max_queue_series.append(interval, longest)
+        self.rejection_series.append(interval, rejected)
+
+    def observe_retries(self, retried, deferred):
+        """
+        Adds the retry counts of an admission layer (see chunk_assignment.RetryAdmission).
+        """
+        self.retried += retried
+        self.deferred += deferred
+
+    def observe_deferred_at_end(self, deferred_at_end):
+        """
+        Adds requests an admission layer still held deferred when the run ended; they count as rejected.
+        """
+        self.deferred_at_end += deferred_at_end
+        self.rejected += deferred_at_end
+
+    def observe_dropped(self, dropped):
+        """
+        Adds accepted requests that were dropped afterwards (see CuckooServer.overflow).
+        """
+        self.dropped += dropped
+
+    def observe_stolen(self, stolen):
+        """
+        Adds requests processed by a peer of the server they were queued on (see work_stealing).
+        """
+        self.stolen += stolen
+
+    def observe_coalesced(self, coalesced):
+        """
+        Adds accepted requests that were coalesced into a queued request (see server.Server).
+        """
+        self.coalesced += coalesced
+
+    def observe_waits(self, waits):
+        """
+        Adds the queueing delays of some servers (a LogHistogram, or an iterable of per-server ones).
+        """
+        for histogram in [waits] if isinstance(waits, LogHistogram) else waits:
+            self.waits.merge(histogram)
+
+    def queue_depth_percentile(self, p):
+        return self.queue_depths.percentile(p)
+
+    def rejection_rate_percentile(self, p):
+        return self.rejection_rates.percentile(p) / len(self.rejection_rates.counts)
+
+    def summary(self):
+        """
+        Returns the run totals and percentiles as a flat dictionary.
+        """
+        total = self.accepted + self.rejected
+        queued = self.accepted - self.coalesced  # Requests that took a queue slot
+        return {
+            "intervals": self.intervals,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "retried": self.retried,
+            "deferred": self.deferred,
+            "deferred_at_end": self.deferred_at_end,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.accepted / queued if queued else 1.0,  # Accepted requests per slot spent
+            "rejection_rate": self.rejected / total if total else 0.0,
+            # Requests not served: rejected on arrival or accepted and dropped later (Cuckoo's bounded Q'/P')
+            "loss_rate": (self.rejected + self.dropped) / total if total else 0.0,
+            "avg_queue_length": sum(self.avg_queue_series.sums) / self.intervals if self.intervals else 0.0,
+            "max_queue_length": self.max_queue_length,
+            "p50_queue_length": self.queue_depth_percentile(50),
+            "p95_queue_length": self.queue_depth_percentile(95),
+            "p99_queue_length": self.queue_depth_percentile(99),
+            "p50_rejection_rate": self.rejection_rate_percentile(50),
+            "p95_rejection_rate": self.rejection_rate_percentile(95),
+            "p99_rejection_rate": self.rejection_rate_percentile(99),
+            "p50_wait": self.waits.percentile(50),
+            "p99_wait": self.waits.percentile(99),
+            "p999_wait": self.waits.percentile(99.9),
+        }
+
+    def as_metrics(self):
+        """
+        Returns the downsampled series in the layout of the old main.metrics dictionary (for plotting).
+        """
+        return {
+            'intervals': self.avg_queue_series.intervals(),
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'rejections_by_interval': self.rejection_series.means(),
+            'queue_lengths_by_interval': self.avg_queue_series.means(),
+            'max_queue_length_by_interval': self.max_queue_series.maxima
+        }
+
+    def __getitem__(self, key):
+        """
+        Read-only access with the keys of the old main.metrics dictionary (see as_metrics), e.g.
+        metrics['accepted'], for code written against it.
+        """
+        return self.as_metrics()[key]
+
+    def merge(self, other):
+        """
+        Adds the metrics of an independent run into this collector.
+
+        :return: self
+        """
+        self.accepted += other.accepted
+        self.rejected += other.rejected
+        self.retried += other.retried
+        self.deferred += other.deferred
+        self.deferred_at_end += other.deferred_at_end
+        self.dropped += other.dropped
+        self.stolen += other.stolen
+        self.coalesced += other.coalesced
+        self.intervals += other.intervals
+        self.max_queue_length = max(self.max_queue_length, other.max_queue_length)
+        self.queue_depths.merge(other.queue_depths)
+        self.rejection_rates.merge(other.rejection_rates)
+        self.waits.merge(other.waits)
+        self.avg_queue_series.merge(other.avg_queue_series)
+        self.max_queue_series.merge(other.max_queue_series)
+        self.rejection_series.merge(other.rejection_series)
+        return self
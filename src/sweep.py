@@ -0,0 +1,277 @@
+"""
+Parameter sweeps over the simulation design space.
+
+A grid maps parameter names to lists of values; every combination (cell) is simulated in a process pool
+and its summary is appended to a CSV results file as soon as it finishes. Cells already present in the
+results file with the seed they would run with now (same base seed) are skipped, so an interrupted sweep
+resumes where it stopped.
+A results file written before some parameters existed is upgraded in place: its rows are recorded with the
+value each new parameter had before it existed (see LEGACY), and a file whose rows ran a model that has
+since changed is refused.
+
+Example grid (JSON), run with `python sweep.py grid.json results.csv`:
+
+    {"Type": ["Random", "Greedy", "Cuckoo"], "d": [2, 3], "g": [2, 4], "q": [8, 16], "J": [3], "repeat": [0, 1, 2]}
+
+"mapping" and "workload" name registered scenarios (TestCases/scenarios.py, e.g. "CTMmap5" and
+"reap_dep_CTMmap5_SEVERE"); a "mapping" ending in ".placement" is a file written by
+placement_store.save_placement, memory-mapped so all workers share one copy; "random" generates a placement with replication factor d and "uniform"
+requests num_servers random chunks per interval.
+
+To see how stale load information degrades Greedy and Cuckoo, sweep "refresh_intervals" (or
+"refresh_requests") and compare rejection_rate and max_queue_length across the rows; a refresh costs one
+load query per server, live Greedy d queries per request:
+
+    {"Type": ["Greedy"], "refresh_intervals": [0, 1, 2, 4, 8, 16], "repeat": [0, 1, 2]}
+
+Cuckoo splits its g slots evenly among its four queues unless "scheduler" is "drr"; the DRR weights of
+Q, P, Q', P' are written as one "wQ:wP:wQ':wP'" value per cell, e.g. to favour the current phase's queues
+over the leftovers of earlier phases:
+
+    {"Type": ["Cuckoo"], "scheduler": ["static", "drr"], "weights": ["1:1:1:1", "2:2:1:1", "4:4:1:1"]}
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import placement_store
+import simulation
+from TestCases import scenarios
+
+# Defaults match main.run_simulation
+DEFAULTS = {
+    "Type": "Random",
+    "num_servers": 256,
+    "num_chunks": 1000,
+    "d": 2,
+    "g": 2,
+    "q": 8,
+    "J": 3,
+    "mapping": "random",
+    "workload": "uniform",
+    "total_intervals": 100,
+    "Engine": "Object",
+    "refresh_intervals": 0,  # Stale Greedy/Cuckoo: load snapshot refreshed every k intervals (0: live loads)
+    "refresh_requests": 0,  # ... and/or every k routing decisions
+    "retries": 0,  # Random: alternate replicas tried when the chosen one is full
+    "backoff": 0,  # Random: deferrals into later intervals before a request is rejected
+    "scheduler": "static",  # Cuckoo: slot split among the four queues, "static" (g // 4 each) or "drr"
+    "weights": "1:1:1:1",  # Cuckoo with "drr": weights of Q, P, Q', P'
+    "steal": False,  # Drained servers process queued requests of their replica peers
+    "coalesce": False,  # Requests for a chunk already queued on the server share its processing slot
+    "repeat": 0,  # Replicate index: same parameters, different seed
+}
+PARAMETERS = tuple(DEFAULTS)
+# Parameters a cell seed is derived from: those of the first sweeps, so that adding a parameter keeps the seeds
+# of existing cells. Cells that only differ in later parameters share their seed (and so their workload).
+SEED_PARAMETERS = ("Type", "num_servers", "num_chunks", "d", "g", "q", "J", "mapping", "workload", "total_intervals",
+                   "Engine", "repeat")
+# Behaviour of rows written before a parameter existed, kept even if the parameter's default changes
+LEGACY = {
+    "scheduler": "static",  # Cuckoo split its slots evenly among the four queues
+}
+# Rows a file without the given column holds ran a model that has changed since, and cannot be upgraded
+CHANGED = [
+    ("dropped", lambda row: row["Type"] == "Cuckoo", "Cuckoo ran with unbounded Q'/P' queues"),
+    ("deferred_at_end", lambda row: row.get("backoff", "0") != "0",
+     "requests still deferred at the end were not counted as rejected"),
+]
+SUMMARY = ("seed", "accepted", "rejected", "retried", "deferred", "deferred_at_end", "dropped", "stolen", "coalesced",
+           "coalescing_ratio", "rejection_rate", "loss_rate", "avg_queue_length", "max_queue_length",
+           "p99_queue_length", "seconds")
+COLUMNS = PARAMETERS + ("base_seed",) + SUMMARY
+
+
+def expand_grid(grid):
+    """
+    Returns every cell of a parameter grid, in a deterministic order.
+
+    :param grid: Dictionary mapping parameter names to a value or a list of values; missing ones use DEFAULTS.
+    :return: List of dictionaries holding a value for every parameter.
+    """
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    axes = []
+    for name in PARAMETERS:
+        values = grid.get(name, DEFAULTS[name])
+        axes.append(values if isinstance(values, list) else [values])
+    return [dict(zip(PARAMETERS, values)) for values in itertools.product(*axes)]
+
+
+def parse_parameter(name, text):
+    """
+    Parses a parameter value as read from the results file back to the type of its default.
+    """
+    default = DEFAULTS[name]
+    if isinstance(default, bool):
+        return text in (True, "True")
+    return type(default)(text)
+
+
+def run_key(cell, seed):
+    """
+    Identifies a finished cell in the results file: the seed it ran with and its parameter values.
+    """
+    return (int(seed),) + tuple(parse_parameter(name, cell[name]) for name in PARAMETERS)
+
+
+def cell_seed(cell, base_seed):
+    """
+    Derives a cell's seed from its SEED_PARAMETERS, so it does not depend on scheduling or grid order.
+    """
+    key = "|".join(f"{name}={cell[name]}" for name in SEED_PARAMETERS)
+    return (zlib.crc32(key.encode()) ^ base_seed) & 0xFFFFFFFF
+
+
+def parse_weights(weights):
+    """
+    Parses the DRR weights of a cell, written "wQ:wP:wQ':wP'" so that one grid value is one cell.
+    """
+    return tuple(int(weight) for weight in str(weights).split(":"))
+
+
+def run_cell(cell, base_seed=0):
+    """
+    Simulates one cell and returns its summary row.
+    Pool workers run one cell at a time, so seeding the `random` module here gives every cell its own
+    reproducible stream.
+    """
+    seed = cell_seed(cell, base_seed)
+    random.seed(seed)
+
+    num_servers, num_chunks = cell["num_servers"], cell["num_chunks"]
+    chunk_to_servers = None
+    if cell["mapping"].endswith(".placement"):
+        chunk_to_servers = placement_store.open_placement(cell["mapping"])  # Mapped, shared by all workers
+        num_chunks = chunk_to_servers.num_chunks
+        if chunk_to_servers.num_servers != num_servers:
+            raise ValueError(f"{cell['mapping']} places chunks on {chunk_to_servers.num_servers} servers, not {num_servers}")
+    elif cell["mapping"] != "random":
+        chunk_to_servers = scenarios.load_placement(cell["mapping"])
+        num_chunks = len(chunk_to_servers)
+        if max(max(assigned) for assigned in chunk_to_servers.values()) >= num_servers:
+            raise ValueError(f"{cell['mapping']} places chunks on more than {num_servers} servers")
+
+    reappearance_chunks_list = None
+    if cell["workload"] != "uniform":
+        reappearance_chunks_list = scenarios.load_workload(cell["workload"])
+
+    start = time.perf_counter()
+    summary = simulation.simulate(cell["Type"], chunk_to_servers, reappearance_chunks_list, num_servers, num_chunks,
+                                  cell["d"], cell["g"], cell["q"], cell["J"], cell["total_intervals"], cell["Engine"],
+                                  refresh_intervals=cell["refresh_intervals"],
+                                  refresh_requests=cell["refresh_requests"], retries=cell["retries"],
+                                  backoff=cell["backoff"], scheduler=cell["scheduler"],
+                                  weights=parse_weights(cell["weights"]),
+                                  steal=cell["steal"], coalesce=cell["coalesce"]).summary()
+    seconds = time.perf_counter() - start
+
+    row = dict(cell)
+    row["base_seed"] = base_seed
+    row["seed"] = seed
+    row.update((column, summary[column]) for column in SUMMARY if column in summary)
+    row["seconds"] = round(seconds, 4)
+    return row
+
+
+def completed_keys(path):
+    """
+    Returns the run keys (see run_key) of the cells already in a results file, made from their stored seeds.
+    A row cut short by an interrupted write is truncated away so that appending can resume cleanly, and a
+    file with older columns is upgraded (see upgrade_results).
+    """
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        rows = [row for row in reader if None not in row.values()]  # Skip incomplete rows
+        fieldnames = reader.fieldnames
+    if fieldnames and fieldnames != list(COLUMNS):
+        rows = upgrade_results(path, fieldnames, rows)
+    return {run_key(row, row["seed"]) for row in rows}
+
+
+def upgrade_results(path, fieldnames, rows):
+    """
+    Rewrites a results file written with older columns under the current ones. A missing parameter is
+    filled with the value those cells ran with (LEGACY, else DEFAULTS), a missing base_seed with 0 (the
+    command-line default), and missing summary values are left empty.
+
+    :return: The upgraded rows.
+    :raises ValueError: If the file has columns this version does not know, or rows of a changed model
+        (see CHANGED).
+    """
+    unknown = set(fieldnames) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"{path} has unknown columns {sorted(unknown)}, use a new results file")
+    for column, affected, reason in CHANGED:
+        if column not in fieldnames and any(affected(row) for row in rows):
+            raise ValueError(f"{path} predates the {column} column: {reason}, use a new results file")
+    for row in rows:
+        for name in COLUMNS:
+            if name not in row:
+                row[name] = LEGACY.get(name, DEFAULTS.get(name, 0 if name == "base_seed" else ""))
+
+    temporary = path + ".tmp"
+    with open(temporary, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temporary, path)
+    return rows
+
+
+def run_sweep(grid, out_path, workers=None, base_seed=0):
+    """
+    Runs every cell of `grid` that is not yet in `out_path`, streaming one CSV row per finished cell.
+
+    :param grid: Parameter grid (see expand_grid).
+    :param out_path: CSV results file, created or appended to.
+    :param workers: Number of worker processes (default: one per CPU core).
+    :param base_seed: Seed mixed into every cell seed.
+    :return: Number of cells run.
+    """
+    done = completed_keys(out_path)
+    cells = [cell for cell in expand_grid(grid) if run_key(cell, cell_seed(cell, base_seed)) not in done]
+
+    new_file = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+    with open(out_path, "a", newline="") as f, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+
+        futures = [pool.submit(run_cell, cell, base_seed) for cell in cells]
+        for future in as_completed(futures):
+            writer.writerow(future.result())
+            f.flush()
+
+    return len(cells)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a parameter sweep in a process pool.")
+    parser.add_argument("grid", help="JSON file mapping parameter names to lists of values")
+    parser.add_argument("out", help="CSV results file (appended to, existing cells are skipped)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    args = parser.parse_args()
+
+    with open(args.grid) as f:
+        grid = json.load(f)
+    ran = run_sweep(grid, args.out, args.workers, args.seed)
+    print(f"Ran {ran} cells, results in {args.out}")
@@ -0,0 +1,160 @@
+"""
+Structured event tracing for the routing and simulation hot paths.
+
+Events are small integer records (time, level, event, a, b) rather than formatted strings. Call sites
+guard on the level before building anything:
+
+    if tracer.level <= DEBUG:
+        tracer.emit(DEBUG, ASSIGN, chunk_id, server_id)
+
+With the default level OFF that guard is the only cost. To see the old console output again:
+
+    tracing.configure(DEBUG, [tracing.PrintSink()])
+
+or, to keep a sample of every 100th event in memory:
+
+    tracing.configure(DEBUG, [tracing.RingBufferSink(100000)], sample_every=100)
+"""
+import collections
+import struct
+import time
+
+# Levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+# Events and the meaning of their (a, b) arguments
+ASSIGN = 1  # (chunk_id, server_id) request routed to a server
+ADVERSARY_SEND = 2  # (chunk_id, server_id) adversary targets a server
+FLUSH_HISTORY = 3  # (-, -) cuckoo history flushed at the end of a phase
+UNASSIGNED_CHUNK = 4  # (chunk_id, -) requested chunk has no replica
+OVERLOADED_CHUNKS = 5  # (count, -) single-replica chunks found by the g1d1 adversary
+SERVER_PROCESSED = 6  # (server_id, count) requests processed in an interval
+SERVER_STATUS = 7  # (server_id, queue length) at the end of an interval
+INTERVAL_END = 8  # (interval, rejected)
+
+EVENT_NAMES = {
+    ASSIGN: "assign",
+    ADVERSARY_SEND: "adversary_send",
+    FLUSH_HISTORY: "flush_history",
+    UNASSIGNED_CHUNK: "unassigned_chunk",
+    OVERLOADED_CHUNKS: "overloaded_chunks",
+    SERVER_PROCESSED: "server_processed",
+    SERVER_STATUS: "server_status",
+    INTERVAL_END: "interval_end",
+}
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING"}
+
+
+def format_record(record):
+    """
+    Returns a one-line, human-readable form of a trace record.
+    """
+    t_ns, level, event, a, b = record
+    return f"{t_ns} {LEVEL_NAMES.get(level, level)} {EVENT_NAMES.get(event, event)} {a} {b}"
+
+
+class RingBufferSink:
+    """
+    Keeps the last `capacity` records in memory.
+    """
+
+    def __init__(self, capacity=65536):
+        self.records = collections.deque(maxlen=capacity)
+
+    def write(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+class BinaryFileSink:
+    """
+    Appends fixed-size little-endian records to a file; read them back with read_trace.
+    """
+
+    RECORD = struct.Struct("<qHHqq")  # time_ns, level, event, a, b
+
+    def __init__(self, path):
+        self.file = open(path, "ab")
+        self._pack = self.RECORD.pack
+
+    def write(self, record):
+        self.file.write(self._pack(*record))
+
+    def close(self):
+        self.file.close()
+
+
+class PrintSink:
+    """
+    Prints every record, for debugging small runs.
+    """
+
+    def write(self, record):
+        print(format_record(record))
+
+    def close(self):
+        pass
+
+
+def read_trace(path):
+    """
+    Yields the records of a file written by BinaryFileSink.
+    """
+    with open(path, "rb") as f:
+        yield from BinaryFileSink.RECORD.iter_unpack(f.read())
+
+
+class Tracer:
+    __slots__ = ("level", "sample_every", "_countdown", "sinks")
+
+    def __init__(self, level=OFF, sinks=(), sample_every=1):
+        """
+        :param level: Minimum level that is recorded (OFF disables tracing).
+        :param sinks: Objects with write(record) and close().
+        :param sample_every: Keep one of every `sample_every` events that pass the level.
+        """
+        self.level = level
+        self.sinks = list(sinks)
+        self.sample_every = sample_every
+        self._countdown = sample_every
+
+    def emit(self, level, event, a=0, b=0):
+        """
+        Records an event if its level is enabled and it survives sampling.
+        """
+        if level < self.level:
+            return
+        if self.sample_every > 1:
+            self._countdown -= 1
+            if self._countdown:
+                return
+            self._countdown = self.sample_every
+
+        record = (time.perf_counter_ns(), level, event, a, b)
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+# Process-wide tracer used by the routing and simulation code; configure() changes it in place
+tracer = Tracer()
+
+
+def configure(level=OFF, sinks=(), sample_every=1):
+    """
+    Reconfigures the process-wide tracer, closing its previous sinks.
+
+    :return: The tracer.
+    """
+    tracer.close()
+    tracer.__init__(level, sinks, sample_every)
+    return tracer
@@ -0,0 +1,252 @@
+import numpy as np
+
+from cluster import Cluster
+from placement import Placement
+from streaming_metrics import MetricsCollector
+
+
+def build_replica_index(chunk_to_servers):
+    """
+    Converts a chunk-to-server mapping into CSR-style arrays.
+    Replicas of chunk c are indices[indptr[c]:indptr[c + 1]], in the order given by the mapping.
+
+    :param chunk_to_servers: Dictionary mapping chunk IDs (0..n-1) to lists of server IDs, or an existing index:
+                             a Cluster, a placement.Placement or an (indptr, indices) tuple, whose int64 arrays
+                             (e.g. memory-mapped ones) are returned as they are, without a copy.
+    :return: Tuple (indptr, indices) of int64 NumPy arrays.
+    """
+    if isinstance(chunk_to_servers, (Cluster, Placement)):
+        chunk_to_servers = (chunk_to_servers.indptr, chunk_to_servers.indices)
+    if isinstance(chunk_to_servers, tuple):
+        return tuple(np.asarray(array).astype(np.int64, copy=False) for array in chunk_to_servers)
+
+    n = max(chunk_to_servers) + 1 if chunk_to_servers else 0
+    counts = np.zeros(n, dtype=np.int64)
+    for chunk_id, assigned_servers in chunk_to_servers.items():
+        counts[chunk_id] = len(assigned_servers)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    for chunk_id, assigned_servers in chunk_to_servers.items():
+        indices[indptr[chunk_id]:indptr[chunk_id + 1]] = assigned_servers
+
+    return indptr, indices
+
+
+def replica_table(indptr, indices):
+    """
+    Expands CSR replica arrays into a dense (n, d_max) table padded with -1.
+    """
+    counts = np.diff(indptr)
+    n = counts.size
+    d_max = int(counts.max()) if n else 0
+
+    table = np.full((n, d_max), -1, dtype=np.int64)
+    rows = np.repeat(np.arange(n), counts)
+    cols = np.arange(indices.size) - indptr[rows]
+    table[rows, cols] = indices
+    return table, counts
+
+
+def _rank_within_groups(keys):
+    """
+    For each position i, returns how many earlier positions hold the same key.
+    """
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    positions = np.arange(keys.size)
+    is_start = np.ones(keys.size, dtype=bool)
+    is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    group_start = np.maximum.accumulate(np.where(is_start, positions, 0))
+
+    rank = np.empty(keys.size, dtype=np.int64)
+    rank[order] = positions - group_start
+    return rank, order, is_start
+
+
+def greedy_waves(reps, loads, q):
+    """
+    Greedy routing of a sequence of requests, each sent to the first least loaded of its replicas,
+    with the result of routing them one at a time.
+
+    Decides the requests in waves. A request joins a wave once it is the earliest undecided request
+    on every one of its replica servers, so requests in a wave share no server and each sees exactly
+    the queue lengths it would have seen when routed one at a time.
+
+    :param reps: (requests, d_max) replica table rows of the requests, padded with -1.
+    :param loads: Queue length of every server, updated in place with the accepted requests.
+    :param q: Queue size of every server.
+    :return: Tuple (targets, ok): chosen server of every request and whether it fit in that queue.
+    """
+    width = reps.shape[1]
+    targets = np.full(reps.shape[0], -1, dtype=np.int64)
+    ok = np.zeros(reps.shape[0], dtype=bool)
+
+    # A server listed twice for one chunk only needs to be waited on once
+    pair_server = reps.copy()
+    for k in range(1, width):
+        repeated = (pair_server[:, k:k + 1] == reps[:, :k]).any(axis=1)
+        pair_server[repeated, k] = -1
+    pair_server = pair_server.ravel()
+
+    # Chain of every server: its pairs (request, replica slot) in request order
+    live = np.flatnonzero(pair_server >= 0)
+    _, order, is_start = _rank_within_groups(pair_server[live])
+    chain = live[order]  # Pair ids grouped by server, earliest request first
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], chain.size)
+
+    position = np.zeros(pair_server.size, dtype=np.int64)
+    position[chain] = np.arange(chain.size)
+    head = starts.copy()  # Position of every server's earliest undecided pair
+    chain_of = np.zeros(pair_server.size, dtype=np.int64)
+    chain_of[chain] = np.repeat(np.arange(starts.size), ends - starts)
+
+    full = np.iinfo(np.int64).max
+    active = np.arange(starts.size)
+    while active.size:
+        # Slot 0 is never a repeat, so asking its chain alone lists every candidate once
+        heads = chain[head[active]]
+        candidates = heads[heads % width == 0] // width
+
+        pairs = candidates[:, None] * width + np.arange(width)
+        at_head = (pair_server[pairs] < 0) | (position[pairs] == head[chain_of[pairs]])
+        ready = candidates[at_head.all(axis=1)]
+
+        options = reps[ready]
+        options_load = np.where(options >= 0, loads[options], full)
+        best = options[np.arange(ready.size), np.argmin(options_load, axis=1)]  # First least loaded, like min()
+        targets[ready] = best
+
+        fits = loads[best] < q
+        ok[ready[fits]] = True
+        loads[best[fits]] += 1
+
+        done = (ready[:, None] * width + np.arange(width)).ravel()
+        done = done[pair_server[done] >= 0]
+        head[chain_of[done]] += 1
+        active = active[head[active] < ends[active]]
+
+    return targets, ok
+
+
+class VectorizedSimulation:
+    """
+    Array-based counterpart of a list of Server objects driven by the Random or Greedy strategy.
+    Queue contents are not kept, only per-server queue lengths, which is all the statistics need.
+    """
+
+    def __init__(self, chunk_to_servers, num_servers, g, q, strategy="Random", rng=None):
+        """
+        :param chunk_to_servers: Dictionary mapping chunk IDs to lists of server IDs, a Cluster whose
+                                 replica index is then shared without copying, or CSR arrays (indptr, indices).
+        :param num_servers: Number of servers (m).
+        :param g: Processing rate of every server (requests per interval).
+        :param q: Queue size of every server.
+        :param strategy: "Random" or "Greedy".
+        :param rng: numpy.random.Generator for fast batched draws (default), or the `random` module /
+                    a random.Random instance to draw replicas in exactly the same order as
+                    assign_chunk_to_random_server does, which reproduces the object path for a fixed seed.
+        """
+        if strategy not in ["Random", "Greedy"]:
+            raise ValueError(f"Vectorized engine supports Random and Greedy, not {strategy}")
+
+        self.num_servers = num_servers
+        self.g = g
+        self.q = q
+        self.strategy = strategy
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        self.indptr, self.indices = build_replica_index(chunk_to_servers)  # Existing int64 arrays are not copied
+        self.table, self.counts = replica_table(self.indptr, self.indices)
+        self.loads = np.zeros(num_servers, dtype=np.int64)  # Queue length of every server
+
+    def _valid_requests(self, chunks):
+        chunks = np.asarray(chunks, dtype=np.int64).ravel()
+        known = (chunks >= 0) & (chunks < self.counts.size)
+        valid = known.copy()
+        valid[known] = self.counts[chunks[known]] > 0
+        return chunks, valid
+
+    def _pick_offsets(self, counts):
+        if isinstance(self.rng, np.random.Generator):
+            return self.rng.integers(0, counts)
+        # random.choice(seq) draws seq[randrange(len(seq))], so this consumes the stream identically
+        randrange = self.rng.randrange
+        return np.fromiter((randrange(k) for k in counts.tolist()), dtype=np.int64, count=counts.size)
+
+    def route(self, chunks):
+        """
+        Routes one interval's worth of chunk requests, in order, into the server queues.
+
+        :param chunks: Sequence or array of requested chunk IDs.
+        :return: Tuple (accepted, rejected).
+        """
+        chunks, valid = self._valid_requests(chunks)
+        chunks = chunks[valid]
+        if chunks.size == 0:
+            return 0, int(valid.size)
+
+        if self.strategy == "Random":
+            accepted = self._route_random(chunks)
+        else:
+            accepted = self._route_greedy(chunks)
+
+        accepted = int(accepted)
+        return accepted, int(valid.size) - accepted
+
+    def _route_random(self, chunks):
+        offsets = self._pick_offsets(self.counts[chunks])
+        targets = self.table[chunks, offsets]
+
+        # With no processing during routing, request i fits iff the earlier requests for its server still left room
+        rank, _, _ = _rank_within_groups(targets)
+        ok = self.loads[targets] + rank < self.q
+
+        self.loads += np.bincount(targets[ok], minlength=self.num_servers)
+        return np.count_nonzero(ok)
+
+    def _route_greedy(self, chunks):
+        _, ok = greedy_waves(self.table[chunks], self.loads, self.q)
+        return np.count_nonzero(ok)
+
+    def process(self):
+        """
+        Every server processes up to g requests from its queue.
+
+        :return: Total number of processed requests.
+        """
+        processed = np.minimum(self.loads, self.g)
+        self.loads -= processed
+        return int(processed.sum())
+
+    def get_queue_status(self):
+        """
+        Returns the current queue length of every server.
+        """
+        return self.loads
+
+
+def run_vectorized_simulation(chunk_to_servers, num_servers, g, q, chunks_list, total_intervals,
+                              strategy="Random", rng=None):
+    """
+    Runs the lock-step interval loop of run_simulation on a VectorizedSimulation.
+
+    :param chunks_list: Chunk IDs requested every interval, or a callable taking the interval index
+                        and returning that interval's requests.
+    :return: MetricsCollector of the run.
+    """
+    sim = VectorizedSimulation(chunk_to_servers, num_servers, g, q, strategy, rng)
+    metrics = MetricsCollector()
+
+    for interval in range(total_intervals):
+        requests = chunks_list(interval) if callable(chunks_list) else chunks_list
+        accepted, rejected = sim.route(requests)
+        sim.process()
+
+        metrics.observe(interval, accepted, rejected, sim.loads)
+
+    return metrics
@@ -0,0 +1,127 @@
+"""
+Work stealing between replica peers.
+
+Routing only ever queues a request on a replica of its chunk, so after a time step one server may sit idle
+while a peer holding some of the same chunks still has a backlog. In the stealing phase every server that
+drained its queue and has slots left pulls queued requests for chunks it holds from its most loaded peers
+and processes them in those slots. Only idle servers next to a backlogged one look at their peers, so a
+phase with little backlog (the common case) is as cheap as a phase with few idle servers.
+
+Peers come from a replica-neighbour index built once per run: servers s and t are neighbours if some chunk
+has replicas on both. It is kept as CSR arrays (neighbours of s are indices[indptr[s]:indptr[s + 1]], those
+sharing the most chunks first), so a thief reads only its own neighbours and the phase costs nothing for
+busy servers, whatever the cluster size.
+
+    stealer = WorkStealer(cluster)
+    for server in cluster:
+        processed = server.process_request()
+        ...  # Collect the idle servers (with their spare slots) and the backlogged ones
+    stealer.steal(idle, backlogged)
+"""
+from array import array
+from operator import itemgetter
+
+import numpy as np
+
+
+def replica_neighbours(indptr, indices, num_servers):
+    """
+    Builds the replica-neighbour index of a chunk-to-replica CSR placement.
+
+    :param indptr: n + 1 offsets into indices.
+    :param indices: Server ID of every replica, grouped by chunk.
+    :param num_servers: Number of servers (m).
+    :return: (indptr, indices, shared) CSR arrays: the neighbours of server s are indices[indptr[s]:indptr[s + 1]],
+             ordered by the number of chunks they share with s (shared), most first.
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    counts = np.diff(indptr)
+    chunk_of = np.repeat(np.arange(counts.size), counts)
+    position = np.arange(indices.size) - indptr[chunk_of]  # Position of every replica within its chunk
+    per_replica = counts[chunk_of]
+
+    # Pair every replica with every other replica of its chunk, one rotation of the chunk's replicas at a time
+    keys = []
+    for shift in range(1, int(counts.max(initial=0))):
+        has = per_replica > shift
+        partner = indptr[chunk_of[has]] + (position[has] + shift) % per_replica[has]
+        keys.append(indices[has] * num_servers + indices[partner])
+    keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+    keys, shared = np.unique(keys, return_counts=True)
+    servers, neighbours = keys // num_servers, keys % num_servers
+    keep = servers != neighbours  # A chunk listing a server twice does not make it its own neighbour
+    servers, neighbours, shared = servers[keep], neighbours[keep], shared[keep]
+
+    order = np.lexsort((neighbours, -shared, servers))
+    neighbour_indptr = np.zeros(num_servers + 1, dtype=np.int64)
+    np.cumsum(np.bincount(servers, minlength=num_servers), out=neighbour_indptr[1:])
+    return neighbour_indptr, neighbours[order], shared[order]
+
+
+class WorkStealer:
+    def __init__(self, cluster, max_peers=None, min_backlog=1):
+        """
+        :param cluster: Cluster (or Placement.cluster) of the servers; its replica index gives the neighbours.
+        :param max_peers: Only consider this many neighbours of a thief, those sharing the most chunks with it
+                          (default: all).
+        :param min_backlog: Only steal from peers with at least this many queued requests.
+        """
+        self.cluster = cluster
+        self._by_id = [cluster.server(server_id) for server_id in range(len(cluster))]  # Peers are read by ID
+        self.max_peers = max_peers
+        self.min_backlog = min_backlog
+        indptr, indices, _ = replica_neighbours(cluster.indptr, cluster.indices, len(cluster))
+        self.indptr = array('q', indptr.tobytes())
+        self.indices = array('q', indices.tobytes())
+        self._chunk_sets = {}  # Server ID -> set of its chunks, built the first time the server steals
+        self.stolen = 0  # Requests processed by a server other than the one they were queued on
+
+    def neighbours(self, server_id):
+        """
+        Returns the IDs of the servers sharing a chunk with a server, those sharing the most chunks first.
+        """
+        start, end = self.indptr[server_id], self.indptr[server_id + 1]
+        if self.max_peers is not None:
+            end = min(end, start + self.max_peers)
+        return self.indices[start:end]
+
+    def steal(self, idle, backlogged):
+        """
+        Lets idle servers process queued requests of their peers, most loaded peer first.
+
+        :param idle: (server, spare slots) pairs of the servers that drained their queues this time step.
+        :param backlogged: IDs of the servers with at least min_backlog queued requests.
+        :return: Number of stolen requests processed.
+        """
+        if not idle or not backlogged:
+            return 0
+        indptr, indices = self.indptr, self.indices
+        if len(backlogged) < len(idle):
+            # Only idle servers next to a backlogged one can steal (the index is symmetric)
+            near = set()
+            for server_id in backlogged:
+                near.update(indices[indptr[server_id]:indptr[server_id + 1]])
+            idle = [(thief, spare) for thief, spare in idle if thief.server_id in near]
+
+        server_by_id, chunk_sets, min_backlog = self._by_id.__getitem__, self._chunk_sets, self.min_backlog
+        stolen = 0
+        for thief, spare in idle:
+            loads = [(peer.get_queue_status(), peer) for peer in map(server_by_id, self.neighbours(thief.server_id))]
+            peers = [(load, peer) for load, peer in loads if load >= min_backlog]
+            if not peers:
+                continue
+            peers.sort(key=itemgetter(0), reverse=True)
+            wanted = chunk_sets.get(thief.server_id)
+            if wanted is None:
+                wanted = chunk_sets[thief.server_id] = set(thief.chunks)
+            for _, peer in peers:
+                taken = peer.take_requests(wanted, spare)
+                if taken:
+                    thief.process_stolen(taken)
+                    stolen += len(taken)
+                    spare -= len(taken)
+                    if not spare:
+                        break
+        self.stolen += stolen
+        return stolen
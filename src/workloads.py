@@ -0,0 +1,167 @@
+"""
+Lazy request streams.
+
+A stream is an iterator of batches: one NumPy int64 array of requested chunk IDs per interval. Batches are
+generated on demand, so a run of any length keeps only the current batch in memory. Every generator takes
+a `seed` (an int, None, or a numpy.random.Generator) and is reproducible for a fixed seed.
+
+    stream = workloads.mix([workloads.uniform(1000, 256, seed=1), workloads.zipf(1000, 256, s=1.2, seed=2)],
+                           [0.7, 0.3], seed=3)
+    simulation.simulate("Greedy", workload=workloads.take(stream, 100))
+"""
+import itertools
+
+import numpy as np
+
+from TestCases import scenarios
+
+
+def _rng(seed):
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def uniform(num_chunks, batch_size, seed=None):
+    """
+    Every request is a uniformly random chunk of 0..num_chunks-1.
+    """
+    rng = _rng(seed)
+    while True:
+        yield rng.integers(0, num_chunks, batch_size)
+
+
+def zipf(num_chunks, batch_size, s=1.0, seed=None, shuffle=True):
+    """
+    Bounded Zipf: the chunk of popularity rank k (1..num_chunks) is requested with probability proportional
+    to 1 / k**s. Ranks are drawn by inverting the cumulative distribution (one binary search per request).
+
+    :param shuffle: Assign ranks to random chunk IDs; otherwise chunk 0 is the most popular.
+    """
+    rng = _rng(seed)
+    cdf = np.cumsum(1.0 / np.arange(1, num_chunks + 1) ** s)
+    cdf /= cdf[-1]
+    chunk_of_rank = rng.permutation(num_chunks) if shuffle else np.arange(num_chunks)
+    while True:
+        ranks = np.searchsorted(cdf, rng.random(batch_size), side="right")
+        yield chunk_of_rank[np.minimum(ranks, num_chunks - 1)]
+
+
+def hotspot(num_chunks, batch_size, hot_chunks, hot_fraction=0.9, period=10, step=None, seed=None):
+    """
+    A window of `hot_chunks` consecutive chunk IDs receives `hot_fraction` of the requests, the rest are
+    uniform. Every `period` batches the window moves by `step` chunks (default: a whole window), wrapping around.
+    """
+    rng = _rng(seed)
+    step = hot_chunks if step is None else step
+    start = 0
+    for batch in itertools.count():
+        if batch and batch % period == 0:
+            start = (start + step) % num_chunks
+        requests = rng.integers(0, num_chunks, batch_size)
+        hot = rng.random(batch_size) < hot_fraction
+        requests[hot] = (start + rng.integers(0, hot_chunks, int(hot.sum()))) % num_chunks
+        yield requests
+
+
+def reappearance(chunks, batch_size=None, seed=None):
+    """
+    Adversarial reappearance: the same chunks are requested again every interval.
+
+    :param chunks: Chunk IDs, or the name of a registered workload scenario (e.g. "reap_dep_CTMmap5_SEVERE").
+    :param batch_size: If None every batch is the whole list in order (like run_simulation); otherwise each
+                       batch holds batch_size chunks drawn uniformly from it (like assign_m_chunks_randomly).
+    """
+    if isinstance(chunks, str):
+        chunks = scenarios.load_workload(chunks)
+    chunks = np.asarray(chunks, dtype=np.int64)
+    if batch_size is None:
+        while True:
+            yield chunks
+    rng = _rng(seed)
+    while True:
+        yield chunks[rng.integers(0, len(chunks), batch_size)]
+
+
+def replay(path, batch_size):
+    """
+    Replays the chunk IDs stored in a file, batch_size per batch, until the file ends. The file is memory
+    mapped, so only the pages of the current batch are read.
+
+    :param path: A .npy file or a raw little-endian int32 file (see record).
+    """
+    if path.endswith(".npy"):
+        requests = np.load(path, mmap_mode="r")
+    else:
+        requests = np.memmap(path, dtype="<i4", mode="r")
+
+    for start in range(0, len(requests), batch_size):
+        yield np.asarray(requests[start:start + batch_size], dtype=np.int64)
+
+
+def record(stream, path, batches):
+    """
+    Writes `batches` batches of a stream to a raw int32 file that replay() reads back.
+
+    :return: Number of requests written.
+    """
+    written = 0
+    with open(path, "wb") as f:
+        for batch in itertools.islice(stream, batches):
+            f.write(np.asarray(batch, dtype="<i4").tobytes())
+            written += len(batch)
+    return written
+
+
+# --- Composition ---
+
+def take(stream, batches):
+    """
+    The first `batches` batches of a stream.
+    """
+    return itertools.islice(stream, batches)
+
+
+def limit(stream, requests):
+    """
+    Stops a stream after `requests` requests in total (the last batch is cut short).
+    """
+    remaining = requests
+    if remaining <= 0:
+        return
+    for batch in stream:
+        if len(batch) > remaining:
+            batch = batch[:remaining]
+        remaining -= len(batch)
+        yield batch
+        if remaining <= 0:
+            return
+
+
+def phases(*parts):
+    """
+    Chains streams one after the other: phases((uniform(...), 50), (hotspot(...), 20), ...) yields 50
+    batches of the first stream, then 20 of the second, and so on.
+    """
+    for stream, batches in parts:
+        yield from itertools.islice(stream, batches)
+
+
+def concat(*streams):
+    """
+    Each batch is the concatenation of one batch from every stream (e.g. background load plus an attack).
+    """
+    for batches in zip(*streams):
+        yield np.concatenate(batches)
+
+
+def mix(streams, weights, seed=None):
+    """
+    Each request comes from one of the streams, picked with the given weights. The streams must yield
+    batches of the same size; one batch is drawn from every stream per mixed batch.
+    """
+    rng = _rng(seed)
+    weights = np.asarray(weights, dtype=float)
+    weights = weights / weights.sum()
+    for batches in zip(*streams):
+        stacked = np.stack(batches)
+        source = rng.choice(len(batches), size=stacked.shape[1], p=weights)
+        yield stacked[source, np.arange(stacked.shape[1])]